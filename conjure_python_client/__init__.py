@@ -18,7 +18,12 @@ from ._lib import *
 from ._version import __version__
 
 __all__ = [
+    "AsyncConnectionPool",
+    "AsyncRequestsClient",
+    "AsyncService",
+    "AsyncSession",
     "BinaryType",
+    "CircuitBreakerConfiguration",
     "ConjureBeanType",
     "ConjureDecoder",
     "ConjureEncoder",
@@ -26,13 +31,21 @@ __all__ = [
     "ConjureFieldDefinition",
     "ConjureType",
     "ConjureUnionType",
+    "ConnectionPoolStats",
     "DecodableType",
     "DictType",
+    "EncodedCache",
+    "JsonBackend",
     "ListType",
+    "NodeStats",
     "OptionalType",
     "OptionalTypeWrapper",
     "RequestsClient",
     "Service",
     "ServiceConfiguration",
     "SslConfiguration",
+    "decode_projection",
+    "enable_hashing",
+    "get_json_backend",
+    "set_json_backend",
 ]
@@ -13,9 +13,41 @@
 # limitations under the License.
 
 from .configuration import SslConfiguration, ServiceConfiguration
+from .nodes import (
+    CircuitBreaker,
+    CircuitBreakerConfiguration,
+    EwmaNodeSelector,
+    Node,
+    NodeSelector,
+    NodeStats,
+    PowerOfTwoChoicesNodeSelector,
+    RandomNodeSelector,
+    RoundRobinNodeSelector,
+)
+from .pools import ConnectionPoolStats
 from .requests_client import RequestsClient, Service, ConjureHTTPError
+from .async_client import (
+    AsyncConnectionPool,
+    AsyncRequestsClient,
+    AsyncService,
+    AsyncSession,
+)
 
 __all__ = [
+    "AsyncConnectionPool",
+    "AsyncRequestsClient",
+    "AsyncService",
+    "AsyncSession",
+    "CircuitBreaker",
+    "CircuitBreakerConfiguration",
+    "ConnectionPoolStats",
+    "EwmaNodeSelector",
+    "Node",
+    "NodeSelector",
+    "NodeStats",
+    "PowerOfTwoChoicesNodeSelector",
+    "RandomNodeSelector",
+    "RoundRobinNodeSelector",
     "SslConfiguration",
     "ServiceConfiguration",
     "RequestsClient",
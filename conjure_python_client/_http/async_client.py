@@ -0,0 +1,1071 @@
+# (c) Copyright 2026 Palantir Technologies Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from base64 import b64encode
+from itertools import chain
+from requests.adapters import Response, CaseInsensitiveDict
+from requests.models import DEFAULT_REDIRECT_LIMIT, PreparedRequest
+from requests.sessions import merge_setting
+from requests.utils import (
+    DEFAULT_CA_BUNDLE_PATH,
+    get_auth_from_url,
+    get_encoding_from_headers,
+    get_environ_proxies,
+    prepend_scheme_if_needed,
+    requote_uri,
+    select_proxy,
+)
+from requests.packages.urllib3.exceptions import (
+    ConnectTimeoutError,
+    EmptyPoolError,
+    MaxRetryError,
+    NewConnectionError,
+    ProxyError,
+    SSLError,
+)
+from requests.packages.urllib3.response import HTTPResponse
+from requests.packages.urllib3.util import Retry
+from requests.packages.urllib3.util.ssl_ import create_urllib3_context
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional
+from typing import Tuple, Type, TypeVar, Union
+from urllib.parse import urljoin, urlsplit
+from .configuration import ServiceConfiguration
+from .nodes import Node, NodeStats, resolve_node_selector
+from .pools import ConnectionPoolStats, _PoolCounters
+from .requests_client import (
+    CIPHERS,
+    _ServiceBase,
+    _check_response,
+    _create_retry,
+    _is_node_failure,
+    _or_default,
+    _split_target,
+)
+from .._serde.json_backend import JsonBackend, resolve_json_backend
+
+import asyncio
+import io
+import os
+import requests
+import ssl
+import sys
+import time
+import zlib
+
+
+T = TypeVar("T")
+# the number of connections an AsyncConnectionPool opens to each host at
+# most; further requests wait for a connection to be released
+DEFAULT_POOL_MAXSIZE = 100
+_CHUNK_SIZE = 64 * 1024
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+class _ProtocolError(Exception):
+    """A response which is not valid HTTP/1.1."""
+
+
+class _ConnectionClosed(_ProtocolError):
+    """The connection was closed before any of the response was read."""
+
+
+class _ConnectFailed(Exception):
+    """Wraps the error to raise if connecting fails on every retry."""
+
+    def __init__(
+        self,
+        error_class: Type[requests.exceptions.RequestException],
+        url: str,
+        reason: Exception,
+        request: PreparedRequest,
+    ) -> None:
+        super(_ConnectFailed, self).__init__(str(reason))
+        self.reason = reason
+        # shaped as the errors of requests, which wrap the urllib3 error
+        self.error = error_class(
+            MaxRetryError(None, url, reason), request=request  # type: ignore
+        )
+
+
+class _TimedReader(object):
+    """Reads a response from a stream, raising asyncio.TimeoutError when a
+    single read waits longer than the timeout: as with requests, the read
+    timeout bounds the wait for data rather than the whole response."""
+
+    def __init__(
+        self, reader: asyncio.StreamReader, timeout: Optional[float]
+    ) -> None:
+        self._reader = reader
+        self._timeout = timeout
+
+    async def readline(self) -> bytes:
+        try:
+            return await asyncio.wait_for(
+                self._reader.readline(), self._timeout
+            )
+        except ValueError as e:
+            # raised by StreamReader for lines longer than its limit
+            raise _ProtocolError("line too long") from e
+
+    async def readexactly(self, n: int) -> bytes:
+        chunks: List[bytes] = []
+        remaining = n
+        while remaining:
+            chunk = await self._read(min(remaining, _CHUNK_SIZE))
+            if not chunk:
+                raise asyncio.IncompleteReadError(b"".join(chunks), n)
+            chunks.append(chunk)
+            remaining -= len(chunk)
+        return b"".join(chunks)
+
+    async def read(self) -> bytes:
+        """Reads until the end of the stream."""
+        chunks: List[bytes] = []
+        while True:
+            chunk = await self._read(_CHUNK_SIZE)
+            if not chunk:
+                return b"".join(chunks)
+            chunks.append(chunk)
+
+    async def _read(self, n: int) -> bytes:
+        return await asyncio.wait_for(self._reader.read(n), self._timeout)
+
+
+class _Connection(object):
+    def __init__(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.reused = False
+        # opened beyond the maxsize of a pool which does not block
+        self.overflow = False
+
+    def is_dropped(self) -> bool:
+        return self.reader.at_eof() or self.writer.is_closing()
+
+    def close(self) -> None:
+        self.writer.close()
+
+
+class _HostPool(object):
+    """The connections to one host: at most maxsize are kept open, and
+    released connections are kept for reuse until the server closes them.
+    When every connection is in use, new requests wait for one if the pool
+    blocks, and otherwise open a connection which is closed on release."""
+
+    def __init__(
+        self, maxsize: int, block: bool, timeout: Optional[float]
+    ) -> None:
+        self._idle: List[_Connection] = []
+        self._slots = asyncio.Semaphore(maxsize)
+        self._block = block
+        self._timeout = timeout
+        self._closed = False
+        self.counters = _PoolCounters(maxsize)
+
+    async def acquire(
+        self, connect: Callable[[], Awaitable[_Connection]], reuse: bool
+    ) -> _Connection:
+        counters = self.counters
+        waits = self._slots.locked()
+        if waits and not self._block:
+            connection = await self._connect(connect)
+            connection.overflow = True
+            counters.acquired(None)
+            return connection
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self._timeout)
+        except asyncio.TimeoutError:
+            counters.timed_out(time.monotonic() - started)
+            raise EmptyPoolError(
+                None, "Pool is empty and a new connection can't be opened"
+            ) from None
+        try:
+            while reuse and self._idle:
+                # the most recently used connection is the least likely to
+                # have been closed by the server
+                connection = self._idle.pop()
+                if not connection.is_dropped():
+                    connection.reused = True
+                    break
+                connection.close()
+            else:
+                connection = await self._connect(connect)
+        except BaseException:
+            self._slots.release()
+            raise
+        counters.acquired(time.monotonic() - started if waits else None)
+        return connection
+
+    async def _connect(
+        self, connect: Callable[[], Awaitable[_Connection]]
+    ) -> _Connection:
+        connection = await connect()
+        with self.counters.lock:
+            self.counters.connections_created += 1
+        return connection
+
+    def release(self, connection: _Connection, reusable: bool) -> None:
+        self.counters.released(connection.overflow)
+        if connection.overflow:
+            connection.close()
+            return
+        if reusable and not self._closed:
+            self._idle.append(connection)
+        else:
+            connection.close()
+        self._slots.release()
+
+    def close(self) -> List[_Connection]:
+        self._closed = True
+        idle, self._idle = self._idle, []
+        for connection in idle:
+            connection.close()
+        return idle
+
+    def stats(self, host: str) -> ConnectionPoolStats:
+        return self.counters.stats(host, len(self._idle))
+
+
+class AsyncConnectionPool(object):
+    """The keep-alive HTTP/1.1 connections of asynchronous services, per
+    host. A pool belongs to the event loop it is first used on, and may be
+    shared by any number of services and concurrent requests on that loop.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = DEFAULT_POOL_MAXSIZE,
+        block: bool = True,
+        timeout: Optional[float] = None,
+    ) -> None:
+        """
+        Args:
+            maxsize: the number of connections kept open to each host
+            block: whether requests wait for a connection when all of them
+                are in use, rather than opening a connection which is
+                closed once the request completes
+            timeout: when blocking, the seconds to wait for a connection
+                before raising EmptyPoolError. Defaults to waiting
+                indefinitely.
+        """
+        self._maxsize = maxsize
+        self._block = block
+        self._timeout = timeout
+        self._hosts: Dict[
+            Tuple[str, str, int, Any, Optional[str]], _HostPool
+        ] = {}
+        self._ssl_contexts: Dict[Any, ssl.SSLContext] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _host_pool(
+        self,
+        scheme: str,
+        host: str,
+        port: int,
+        verify: Any,
+        proxy: Optional[str],
+    ) -> _HostPool:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # connections cannot move between event loops
+            self._hosts = {}
+            self._loop = loop
+        key = (
+            scheme,
+            host,
+            port,
+            verify if scheme == "https" else None,
+            proxy,
+        )
+        try:
+            return self._hosts[key]
+        except KeyError:
+            pool = self._hosts[key] = _HostPool(
+                self._maxsize, self._block, self._timeout
+            )
+            return pool
+
+    def _ssl_context(self, verify: Any) -> ssl.SSLContext:
+        try:
+            return self._ssl_contexts[verify]
+        except KeyError:
+            pass
+        context = create_urllib3_context(ciphers=CIPHERS)
+        if verify is False:
+            context.check_hostname = False
+            context.verify_mode = ssl.CERT_NONE
+        else:
+            context.verify_mode = ssl.CERT_REQUIRED
+            context.check_hostname = True
+            path = verify
+            if verify is None or verify is True:
+                path = DEFAULT_CA_BUNDLE_PATH
+            if os.path.isdir(path):
+                context.load_verify_locations(capath=path)
+            else:
+                context.load_verify_locations(cafile=path)
+        self._ssl_contexts[verify] = context
+        return context
+
+    def pool_stats(self) -> List[ConnectionPoolStats]:
+        """Returns the utilisation of the connection pool to each host."""
+        return [
+            pool.stats("{}://{}:{}".format(scheme, host, port))
+            for (scheme, host, port, _, _), pool in self._hosts.items()
+        ]
+
+    async def close(self) -> None:
+        """Closes the idle connections. Connections in use are closed once
+        their request completes."""
+        hosts, self._hosts = self._hosts, {}
+        closed = [
+            connection
+            for pool in hosts.values()
+            for connection in pool.close()
+        ]
+        for connection in closed:
+            try:
+                await connection.writer.wait_closed()
+            except (OSError, ssl.SSLError):
+                pass
+
+
+class AsyncSession(object):
+    """Sends requests over an AsyncConnectionPool, with the arguments,
+    retries and responses of requests.Session.request.
+
+    As requests.Session, the session follows redirects, other than the 308
+    responses services retry on another node (see _Session), and sends
+    requests through the configured proxies. When trust_env is set, the
+    proxies and CA bundle of the environment are used as well. Proxies must
+    be http proxies, which https requests tunnel through. Unlike
+    requests.Session, response bodies are always read into memory, and
+    cookies, auth and netrc credentials are not supported.
+    """
+
+    headers: CaseInsensitiveDict
+    max_retries: Retry
+    connection_pool: AsyncConnectionPool
+    proxies: Dict[str, str]
+    trust_env: bool
+    max_redirects: int
+
+    def __init__(
+        self,
+        headers: Optional[Dict[str, str]] = None,
+        max_retries: Optional[Retry] = None,
+        connection_pool: Optional[AsyncConnectionPool] = None,
+        proxies: Optional[Dict[str, str]] = None,
+        trust_env: bool = True,
+    ) -> None:
+        """
+        Args:
+            headers: the headers sent with every request
+            max_retries: the retry policy, as for requests' HTTPAdapter
+            connection_pool: the pool to send requests over. Defaults to a
+                new pool.
+            proxies: the proxy url for each scheme, or scheme and host, as
+                for requests.Session
+            trust_env: whether to use the proxies and CA bundle of the
+                environment, as requests.Session does
+        """
+        self.headers = CaseInsensitiveDict(headers or {})
+        self.max_retries = (
+            max_retries if max_retries is not None else Retry(0, read=False)
+        )
+        self.connection_pool = (
+            connection_pool
+            if connection_pool is not None
+            else AsyncConnectionPool()
+        )
+        self.proxies = dict(proxies or {})
+        self.trust_env = trust_env
+        self.max_redirects = DEFAULT_REDIRECT_LIMIT
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        params: Any = None,
+        data: Any = None,
+        headers: Optional[Dict[str, Any]] = None,
+        json: Any = None,
+        timeout: Union[None, float, Tuple[float, float]] = None,
+        verify: Any = None,
+        stream: bool = False,
+        allow_redirects: bool = True,
+        proxies: Optional[Dict[str, str]] = None,
+    ) -> Response:
+        """Sends a request and reads the whole response, following redirects
+        unless allow_redirects is unset. The request to each url is retried
+        following max_retries: connect errors and retryable statuses are
+        retried after a backoff, read errors are not.
+
+        The response body is read before returning, also when stream is set,
+        and response.raw reads from the read body.
+        """
+        request = requests.Request(
+            method=method.upper(),
+            url=url,
+            headers=merge_setting(
+                headers, self.headers, dict_class=CaseInsensitiveDict
+            ),
+            params=params,
+            data=data,
+            json=json,
+        ).prepare()
+        connect_timeout: Optional[float]
+        read_timeout: Optional[float]
+        if isinstance(timeout, tuple):
+            connect_timeout, read_timeout = timeout
+        else:
+            connect_timeout = read_timeout = timeout
+        if self.trust_env and (verify is None or verify is True):
+            verify = (
+                os.environ.get("REQUESTS_CA_BUNDLE")
+                or os.environ.get("CURL_CA_BUNDLE")
+                or verify
+            )
+        history: List[Response] = []
+        while True:
+            response = await self._send_with_retries(
+                request,
+                connect_timeout,
+                read_timeout,
+                verify,
+                self._proxy_for(str(request.url), proxies),
+            )
+            if (
+                not allow_redirects
+                or not response.is_redirect
+                or response.status_code == requests.codes.permanent_redirect
+            ):
+                response.history = history
+                return response
+            if len(history) >= self.max_redirects:
+                raise requests.exceptions.TooManyRedirects(
+                    "Exceeded {} redirects.".format(self.max_redirects),
+                    response=response,
+                )
+            history.append(response)
+            request = _redirected(request, response)
+
+    def _proxy_for(
+        self, url: str, proxies: Optional[Dict[str, str]]
+    ) -> Optional[str]:
+        # as requests.Session merges the proxies of a request with those of
+        # the environment and the session
+        proxies = dict(proxies or {})
+        if self.trust_env:
+            environ_proxies = get_environ_proxies(
+                url, no_proxy=proxies.get("no_proxy")
+            )
+            for scheme, proxy in environ_proxies.items():
+                proxies.setdefault(scheme, proxy)
+        return select_proxy(url, merge_setting(proxies, self.proxies))
+
+    async def _send_with_retries(
+        self,
+        request: PreparedRequest,
+        connect_timeout: Optional[float],
+        read_timeout: Optional[float],
+        verify: Any,
+        proxy: Optional[str],
+    ) -> Response:
+        retries = self.max_retries
+        while True:
+            try:
+                response = await self._send(
+                    request, connect_timeout, read_timeout, verify, proxy
+                )
+            except _ConnectFailed as e:
+                try:
+                    retries = retries.increment(
+                        request.method, request.url, error=e.reason
+                    )
+                except MaxRetryError:
+                    raise e.error from e.__cause__
+                await asyncio.sleep(retries.get_backoff_time())
+                continue
+            has_retry_after = bool(response.headers.get("Retry-After"))
+            if not retries.is_retry(
+                request.method, response.status_code, has_retry_after
+            ):
+                return response
+            retried = HTTPResponse(
+                headers=dict(response.headers),
+                status=response.status_code,
+                preload_content=False,
+            )
+            try:
+                retries = retries.increment(
+                    request.method, request.url, response=retried
+                )
+            except MaxRetryError as e:
+                if retries.raise_on_status:
+                    raise requests.exceptions.RetryError(e, request=request)
+                return response
+            delay = None
+            if retries.respect_retry_after_header:
+                delay = retries.get_retry_after(retried)
+            await asyncio.sleep(delay or retries.get_backoff_time())
+
+    async def _send(
+        self,
+        request: PreparedRequest,
+        connect_timeout: Optional[float],
+        read_timeout: Optional[float],
+        verify: Any,
+        proxy: Optional[str],
+    ) -> Response:
+        method, url = str(request.method), str(request.url)
+        parts = urlsplit(url)
+        if parts.scheme not in _DEFAULT_PORTS:
+            raise requests.exceptions.InvalidSchema(
+                "No connection adapters were found for {!r}".format(url)
+            )
+        if not parts.hostname:
+            raise requests.exceptions.InvalidURL(
+                "Invalid URL {!r}: No host supplied".format(url)
+            )
+        host = parts.hostname
+        port = parts.port or _DEFAULT_PORTS[parts.scheme]
+        proxy_parts = None
+        proxy_headers: Dict[str, str] = {}
+        if proxy is not None:
+            proxy = prepend_scheme_if_needed(proxy, "http")
+            proxy_parts = urlsplit(proxy)
+            if proxy_parts.scheme != "http" or not proxy_parts.hostname:
+                raise requests.exceptions.InvalidProxyURL(
+                    "Invalid proxy {!r}: only http proxies are supported"
+                    .format(proxy)
+                )
+            username, password = get_auth_from_url(proxy)
+            if username:
+                credentials = "{}:{}".format(username, password)
+                proxy_headers["Proxy-Authorization"] = "Basic " + (
+                    b64encode(credentials.encode("latin-1")).decode("ascii")
+                )
+        pool = self.connection_pool._host_pool(
+            parts.scheme, host, port, verify, proxy
+        )
+
+        async def open_connection() -> Tuple[
+            asyncio.StreamReader, asyncio.StreamWriter
+        ]:
+            ssl_context = None
+            if parts.scheme == "https":
+                # built once per verify setting, for new connections only
+                ssl_context = self.connection_pool._ssl_context(verify)
+            if proxy_parts is None:
+                return await asyncio.open_connection(
+                    host,
+                    port,
+                    ssl=ssl_context,
+                    server_hostname=host if ssl_context else None,
+                )
+            reader, writer = await asyncio.open_connection(
+                proxy_parts.hostname,
+                proxy_parts.port or _DEFAULT_PORTS["http"],
+            )
+            if ssl_context is None:
+                return reader, writer
+            return await _open_tunnel(
+                reader, writer, host, port, proxy_headers, ssl_context
+            )
+
+        async def connect() -> _Connection:
+            try:
+                reader, writer = await asyncio.wait_for(
+                    open_connection(), connect_timeout
+                )
+            except asyncio.TimeoutError as e:
+                raise _ConnectFailed(
+                    requests.exceptions.ConnectTimeout,
+                    url,
+                    ConnectTimeoutError(
+                        "Connection to {} timed out. (connect timeout={})"
+                        .format(host, connect_timeout)
+                    ),
+                    request,
+                ) from e
+            except ssl.SSLError as e:
+                raise _ConnectFailed(
+                    requests.exceptions.SSLError, url, SSLError(e), request
+                ) from e
+            except (OSError, _ProtocolError) as e:
+                if proxy_parts is not None:
+                    raise _ConnectFailed(
+                        requests.exceptions.ProxyError,
+                        url,
+                        ProxyError("Unable to connect to proxy", e),
+                        request,
+                    ) from e
+                raise _ConnectFailed(
+                    requests.exceptions.ConnectionError,
+                    url,
+                    NewConnectionError(
+                        None,  # type: ignore
+                        "Failed to establish a new connection: {}".format(e),
+                    ),
+                    request,
+                ) from e
+            return _Connection(reader, writer)
+
+        netloc = parts.netloc.rpartition("@")[2]
+        target = parts.path or "/"
+        if parts.query:
+            target += "?" + parts.query
+        if proxy_parts is not None and parts.scheme == "http":
+            # requests to http proxies name the whole url, and carry the
+            # credentials of the proxy
+            target = "http://" + netloc + target
+            head = _request_head(
+                request, method, target, netloc, proxy_headers
+            )
+        else:
+            head = _request_head(request, method, target, netloc, {})
+        # requests on reused connections are resent on a new connection if
+        # the server closed it before responding, unless the body has been
+        # consumed
+        resendable = isinstance(request.body, (bytes, str, type(None)))
+        reuse = True
+        while True:
+            connection = await pool.acquire(connect, reuse)
+            reusable = False
+            try:
+                reader = _TimedReader(connection.reader, read_timeout)
+                try:
+                    await _write_request(connection.writer, head, request)
+                    version, status, reason, headers = await _read_head(
+                        reader
+                    )
+                except (_ConnectionClosed, ConnectionError):
+                    if connection.reused and resendable:
+                        reuse = False
+                        continue
+                    raise
+                content, framed = await _read_body(
+                    reader, method, status, headers
+                )
+                reusable = (
+                    framed
+                    and version == "HTTP/1.1"
+                    and "close" not in headers.get("Connection", "").lower()
+                )
+            except asyncio.TimeoutError as e:
+                raise requests.exceptions.ReadTimeout(
+                    "Read timed out. (read timeout={})".format(read_timeout),
+                    request=request,
+                ) from e
+            except (
+                OSError,
+                asyncio.IncompleteReadError,
+                asyncio.LimitOverrunError,
+                _ProtocolError,
+            ) as e:
+                raise requests.exceptions.ConnectionError(
+                    e, request=request
+                ) from e
+            finally:
+                pool.release(connection, reusable)
+            return _build_response(
+                request, url, status, reason, headers, content
+            )
+
+
+async def _open_tunnel(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    host: str,
+    port: int,
+    proxy_headers: Dict[str, str],
+    ssl_context: ssl.SSLContext,
+) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    # asks an http proxy for a tunnel to the host, and starts tls over it
+    authority = host.encode("idna").decode("ascii")
+    if ":" in authority:
+        authority = "[{}]".format(authority)
+    authority = "{}:{}".format(authority, port)
+    lines = ["CONNECT {0} HTTP/1.1\r\nHost: {0}\r\n".format(authority)]
+    for name, value in proxy_headers.items():
+        lines.append("{}: {}\r\n".format(name, value))
+    lines.append("\r\n")
+    try:
+        writer.write("".join(lines).encode("latin-1"))
+        await writer.drain()
+        _, status, reason, _ = await _read_head(_TimedReader(reader, None))
+        if status != 200:
+            raise OSError(
+                "Tunnel connection failed: {} {}".format(status, reason)
+            )
+        if sys.version_info >= (3, 11):
+            await writer.start_tls(ssl_context, server_hostname=host)
+            return reader, writer
+        loop = asyncio.get_running_loop()
+        protocol = writer.transport.get_protocol()
+        transport = await loop.start_tls(
+            writer.transport, protocol, ssl_context, server_hostname=host
+        )
+    except BaseException:
+        writer.close()
+        raise
+    return reader, asyncio.StreamWriter(
+        transport, protocol, reader, loop  # type: ignore
+    )
+
+
+def _redirected(
+    request: PreparedRequest, response: Response
+) -> PreparedRequest:
+    # the request to send for a redirect response, as requests.Session
+    # rebuilds it
+    redirected = request.copy()
+    redirected.url = requote_uri(
+        urljoin(str(request.url), response.headers["Location"])
+    )
+    method = str(request.method)
+    status = response.status_code
+    if (
+        status in (requests.codes.see_other, requests.codes.found)
+        and method != "HEAD"
+    ) or (status == requests.codes.moved and method == "POST"):
+        method = "GET"
+    redirected.method = method
+    if status != requests.codes.temporary_redirect:
+        for name in ("Content-Length", "Content-Type", "Transfer-Encoding"):
+            redirected.headers.pop(name, None)
+        redirected.body = None
+    elif not isinstance(request.body, (bytes, str, type(None))):
+        raise requests.exceptions.UnrewindableBodyError(
+            "Unable to rewind request body for redirect."
+        )
+    if _strips_auth(str(request.url), str(redirected.url)):
+        redirected.headers.pop("Authorization", None)
+    return redirected
+
+
+def _strips_auth(old_url: str, new_url: str) -> bool:
+    # credentials are only sent on to the same host and port, or when
+    # upgrading to https on the default ports
+    old, new = urlsplit(old_url), urlsplit(new_url)
+    if old.hostname != new.hostname:
+        return True
+    if (
+        old.scheme == "http"
+        and old.port in (80, None)
+        and new.scheme == "https"
+        and new.port in (443, None)
+    ):
+        return False
+    return (old.scheme, old.port) != (new.scheme, new.port)
+
+
+def _request_head(
+    request: PreparedRequest,
+    method: str,
+    target: str,
+    host: str,
+    proxy_headers: Dict[str, str],
+) -> bytes:
+    lines = ["{} {} HTTP/1.1\r\n".format(method, target).encode("latin-1")]
+    if "Host" not in request.headers:
+        lines.append(b"Host: " + host.encode("idna") + b"\r\n")
+    for name, value in chain(request.headers.items(), proxy_headers.items()):
+        if not isinstance(value, bytes):
+            value = str(value).encode("latin-1")
+        lines.append(name.encode("latin-1") + b": " + value + b"\r\n")
+    lines.append(b"\r\n")
+    return b"".join(lines)
+
+
+def _read_chunks(body: Any) -> Iterator[bytes]:
+    if hasattr(body, "read"):
+        chunks = iter(lambda: body.read(_CHUNK_SIZE), b"")
+    else:
+        chunks = iter(body)
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode("utf-8")
+        if not chunk:
+            if hasattr(body, "read"):
+                # text files read "" at the end
+                return
+            continue
+        yield chunk
+
+
+async def _write_request(
+    writer: asyncio.StreamWriter, head: bytes, request: PreparedRequest
+) -> None:
+    body = request.body
+    if isinstance(body, str):
+        # as http.client encodes string bodies
+        body = body.encode("iso-8859-1")
+    if body is None or isinstance(body, bytes):
+        writer.write(head + body if body else head)
+    else:
+        writer.write(head)
+        chunked = request.headers.get("Transfer-Encoding") == "chunked"
+        for chunk in _read_chunks(body):
+            if chunked:
+                writer.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+            else:
+                writer.write(chunk)
+            await writer.drain()
+        if chunked:
+            writer.write(b"0\r\n\r\n")
+    await writer.drain()
+
+
+async def _read_head(
+    reader: _TimedReader,
+) -> Tuple[str, int, str, CaseInsensitiveDict]:
+    first = True
+    while True:
+        line = await reader.readline()
+        if not line:
+            if first:
+                raise _ConnectionClosed("connection closed by the server")
+            raise _ProtocolError("connection closed in the response head")
+        first = False
+        version, _, rest = line.decode("latin-1").rstrip().partition(" ")
+        status_code, _, reason = rest.partition(" ")
+        if not version.startswith("HTTP/") or not status_code.isdigit():
+            raise _ProtocolError("bad status line {!r}".format(line))
+        status = int(status_code)
+        headers: CaseInsensitiveDict = CaseInsensitiveDict()
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n"):
+                break
+            name, separator, value = line.decode("latin-1").partition(":")
+            if not separator:
+                raise _ProtocolError("bad header line {!r}".format(line))
+            name, value = name.strip(), value.strip()
+            if name in headers:
+                # as urllib3 joins repeated headers
+                value = headers[name] + ", " + value
+            headers[name] = value
+        # interim responses, e.g. 100 Continue, precede the response
+        if not 100 <= status < 200 or status == 101:
+            return version, status, reason, headers
+
+
+async def _read_body(
+    reader: _TimedReader,
+    method: str,
+    status: int,
+    headers: CaseInsensitiveDict,
+) -> Tuple[bytes, bool]:
+    # returns the decoded body, and whether it had a known length so that
+    # the connection can be reused
+    if method == "HEAD" or status in (101, 204, 304):
+        return b"", True
+    if "chunked" in headers.get("Transfer-Encoding", "").lower():
+        chunks = []
+        while True:
+            line = await reader.readline()
+            try:
+                size = int(line.split(b";", 1)[0], 16)
+            except ValueError:
+                raise _ProtocolError("bad chunk size {!r}".format(line))
+            if not size:
+                break
+            chunks.append((await reader.readexactly(size + 2))[:-2])
+        # trailers
+        while (await reader.readline()).strip():
+            pass
+        content, framed = b"".join(chunks), True
+    elif "Content-Length" in headers:
+        try:
+            length = int(headers["Content-Length"])
+        except ValueError:
+            raise _ProtocolError("bad content length")
+        content, framed = await reader.readexactly(length), True
+    else:
+        content, framed = await reader.read(), False
+    return _decode_content(content, headers.get("Content-Encoding")), framed
+
+
+def _decode_content(content: bytes, encoding: Optional[str]) -> bytes:
+    if not content or not encoding:
+        return content
+    encoding = encoding.strip().lower()
+    try:
+        if encoding == "gzip":
+            return zlib.decompress(content, 16 + zlib.MAX_WBITS)
+        if encoding == "deflate":
+            try:
+                return zlib.decompress(content)
+            except zlib.error:
+                # raw deflate streams without a zlib header
+                return zlib.decompress(content, -zlib.MAX_WBITS)
+    except zlib.error as e:
+        raise requests.exceptions.ContentDecodingError(
+            "Failed to decode response content", e
+        )
+    return content
+
+
+def _build_response(
+    request: PreparedRequest,
+    url: str,
+    status: int,
+    reason: str,
+    headers: CaseInsensitiveDict,
+    content: bytes,
+) -> Response:
+    response = Response()
+    response.status_code = status
+    response.reason = reason
+    response.headers = headers
+    response.url = url
+    response.request = request
+    response.encoding = get_encoding_from_headers(headers)
+    response._content = content
+    response._content_consumed = True
+    response.raw = io.BytesIO(content)
+    return response
+
+
+class AsyncService(_ServiceBase):
+    """The base of services whose endpoints are coroutines: endpoints await
+    _request, which has the semantics of Service._request."""
+
+    _requests_session: AsyncSession
+    _session_repr = "AsyncSession(...)"
+
+    async def _request(self, *args, **kwargs) -> Response:
+        """Make requests using the configured :class:`AsyncSession`.
+        Any error details will be extracted to an :class:`HTTPError`
+        which will contain relevant error details when printed.
+        Failed requests are retried on another node, see _retry."""
+        json_backend = self._prepare_request_kwargs(kwargs)
+        method, url, args = _split_target(args, kwargs)
+        node = self._node_of(url)
+        retries = self._max_retries
+        while True:
+            try:
+                _response = await self._send(
+                    node, method, url, *args, **kwargs
+                )
+            except requests.exceptions.RequestException as e:
+                retry = self._retry(retries, node, method, url, error=e)
+                if retry is None:
+                    raise
+            else:
+                retry = self._retry(
+                    retries, node, method, url, response=_response
+                )
+                if retry is None:
+                    break
+            retries, delay, node, url = retry
+            await asyncio.sleep(delay)
+        _check_response(_response, json_backend)
+        return _response
+
+    async def _send(
+        self, node: Optional[Node], method: str, url: str, *args, **kwargs
+    ) -> Response:
+        started = node.started() if node is not None else 0.0
+        failed = True
+        try:
+            _response = await self._requests_session.request(
+                method, url, *args, **kwargs
+            )
+            failed = _is_node_failure(_response)
+        finally:
+            if node is not None:
+                node.finished(started, failed)
+        return _response
+
+
+class AsyncRequestsClient(object):
+    @classmethod
+    def create(
+        cls,
+        service_class: Type[T],
+        user_agent: str,
+        service_config: ServiceConfiguration,
+        return_none_for_unknown_union_types: bool = False,
+        json_backend: Union[str, JsonBackend, None] = None,
+        connection_pool: Optional[AsyncConnectionPool] = None,
+    ) -> T:
+        """Creates an asynchronous service client.
+
+        Args:
+            service_class: the AsyncService subclass to instantiate
+            user_agent: the User-Agent sent with every request
+            service_config: the uris, security, timeouts and retries
+            return_none_for_unknown_union_types: if set to True, unknown
+                union types decode to None instead of raising an exception
+            json_backend: the json backend used for request and response
+                bodies, see resolve_json_backend. Defaults to the global
+                backend at the time of each request.
+            connection_pool: the connections to send requests over, which
+                may be shared between services. Defaults to a new pool
+                sized by the pool_maxsize, pool_block and pool_timeout of
+                service_config; pools block by default.
+        """
+        if connection_pool is None:
+            connection_pool = AsyncConnectionPool(
+                maxsize=_or_default(
+                    service_config.pool_maxsize, DEFAULT_POOL_MAXSIZE
+                ),
+                block=_or_default(service_config.pool_block, True),
+                timeout=service_config.pool_timeout,
+            )
+        # requests are retried by the service, which fails over to other
+        # uris, rather than by the session
+        session = AsyncSession(
+            headers={"User-Agent": user_agent},
+            connection_pool=connection_pool,
+        )
+        if service_config.security is not None:
+            verify = service_config.security.trust_store_path
+        else:
+            verify = None
+        if json_backend is not None:
+            json_backend = resolve_json_backend(json_backend)
+        return service_class(  # type: ignore
+            session,
+            service_config.uris,
+            service_config.connect_timeout,
+            service_config.read_timeout,
+            verify,
+            return_none_for_unknown_union_types,
+            json_backend,
+            resolve_node_selector(
+                service_config.node_selection,
+                service_config.uris,
+                service_config.circuit_breaker,
+            ),
+            _create_retry(service_config),
+        )
+
+    @classmethod
+    def pool_stats(cls, service: AsyncService) -> List[ConnectionPoolStats]:
+        """Returns the utilisation of the connection pool to each host the
+        service's connection pool has sent requests to."""
+        return service._requests_session.connection_pool.pool_stats()
+
+    @classmethod
+    def node_stats(cls, service: AsyncService) -> List[NodeStats]:
+        """Returns the requests to, and the circuit breaker state of, each
+        uri of the service."""
+        return [node.stats() for node in service._node_selector.nodes]
@@ -12,7 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import List, Optional, Type, Union
+from .nodes import CircuitBreakerConfiguration, NodeSelector
 
 
 @dataclass
@@ -29,3 +30,16 @@ class ServiceConfiguration:
     read_timeout: float = 300
     max_num_retries: int = 4
     backoff_slot_size: int = 250
+    # connection pooling; None keeps the default of the client, see
+    # RequestsClient and AsyncRequestsClient
+    pool_connections: Optional[int] = None
+    pool_maxsize: Optional[int] = None
+    pool_block: Optional[bool] = None
+    pool_timeout: Optional[float] = None
+    # how each request chooses a uri: "random", "round_robin",
+    # "power_of_two_choices", "ewma" or a NodeSelector subclass, see
+    # resolve_node_selector
+    node_selection: Union[str, Type[NodeSelector]] = "random"
+    # drops failing uris from node selection until probes to them succeed;
+    # disabled by default
+    circuit_breaker: Optional[CircuitBreakerConfiguration] = None
@@ -0,0 +1,412 @@
+# (c) Copyright 2026 Palantir Technologies Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional, Type, Union
+
+import itertools
+import math
+import random
+import threading
+import time
+
+# the decay time of the latency average of nodes, in seconds
+EWMA_DECAY_SECONDS = 10.0
+# the latency recorded for failed requests, so that nodes which fail fast
+# do not attract traffic
+FAILURE_LATENCY_SECONDS = 1.0
+# how long a half open circuit breaker holds the probe it admitted for the
+# request to start, as selectors also check nodes they then do not choose
+PROBE_CLAIM_SECONDS = 1.0
+
+# the states of circuit breakers
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+@dataclass
+class CircuitBreakerConfiguration:
+    """When the circuit breaker of a node opens, and how it closes again."""
+
+    # opens the breaker after this many consecutive failures
+    failures: Optional[int] = 5
+    # opens the breaker once this share of the last window requests failed
+    error_rate: Optional[float] = None
+    window: int = 20
+    # the seconds the node is dropped from selection for, before it is
+    # re-admitted to one probe request at a time
+    open_seconds: float = 30.0
+    # the successful probes which close the breaker
+    probes: int = 1
+
+
+class CircuitBreaker(object):
+    """Drops a failing node from selection. Once open_seconds have passed,
+    an open breaker turns half open: the node admits a single probe request
+    at a time, and the breaker closes once enough probes succeed or opens
+    again if one fails. Breakers are used under the lock of their node."""
+
+    def __init__(self, configuration: CircuitBreakerConfiguration) -> None:
+        self.configuration = configuration
+        self.opens = 0
+        self._state = CLOSED
+        self._opened = 0.0
+        self._consecutive_failures = 0
+        self._results: Deque[bool] = deque()
+        self._window_failures = 0
+        self._probe_successes = 0
+        # when the pending probe was admitted, if one was
+        self._probe_claimed: Optional[float] = None
+
+    def state(self, now: float) -> str:
+        """Returns "closed", "open" or "half_open"."""
+        if (
+            self._state == OPEN
+            and now - self._opened >= self.configuration.open_seconds
+        ):
+            self._state = HALF_OPEN
+            self._probe_successes = 0
+            self._probe_claimed = None
+        return self._state
+
+    def admits(self, now: float, in_flight: int) -> bool:
+        """Returns whether a request may be sent to the node. A half open
+        breaker admits a probe when no request is in flight and no other
+        probe was admitted within PROBE_CLAIM_SECONDS, claiming it for the
+        caller."""
+        state = self.state(now)
+        if state != HALF_OPEN:
+            return state == CLOSED
+        if in_flight or (
+            self._probe_claimed is not None
+            and now - self._probe_claimed < PROBE_CLAIM_SECONDS
+        ):
+            return False
+        self._probe_claimed = now
+        return True
+
+    def record(self, failed: bool, now: float) -> None:
+        """Records the result of a request to the node."""
+        configuration = self.configuration
+        state = self.state(now)
+        if state == OPEN:
+            # requests sent before the breaker opened
+            return
+        if state == HALF_OPEN:
+            self._probe_claimed = None
+            if failed:
+                self._open(now)
+                return
+            self._probe_successes += 1
+            if self._probe_successes >= configuration.probes:
+                self._close()
+            return
+        self._consecutive_failures = (
+            self._consecutive_failures + 1 if failed else 0
+        )
+        self._results.append(failed)
+        self._window_failures += failed
+        if len(self._results) > configuration.window:
+            self._window_failures -= self._results.popleft()
+        if (
+            configuration.failures is not None
+            and self._consecutive_failures >= configuration.failures
+        ) or (
+            configuration.error_rate is not None
+            and len(self._results) == configuration.window
+            and self._window_failures
+            >= configuration.error_rate * configuration.window
+        ):
+            self._open(now)
+
+    def _open(self, now: float) -> None:
+        self._state = OPEN
+        self._opened = now
+        self.opens += 1
+
+    def _close(self) -> None:
+        self._state = CLOSED
+        self._consecutive_failures = 0
+        self._results.clear()
+        self._window_failures = 0
+
+
+@dataclass
+class NodeStats:
+    """The requests to one node of a service, since the service was
+    created."""
+
+    uri: str
+    in_flight: int
+    # the peak EWMA latency, in seconds
+    latency: float
+    requests: int
+    failures: int
+    # "closed", "open" or "half_open"; always "closed" without a breaker
+    circuit_state: str
+    # the times the circuit breaker opened
+    circuit_opens: int
+
+
+class Node(object):
+    """A uri of a service, with the request statistics node selectors choose
+    by. Nodes are shared by all the threads and tasks using a service."""
+
+    uri: str
+    circuit_breaker: Optional[CircuitBreaker]
+
+    def __init__(
+        self, uri: str, circuit_breaker: Optional[CircuitBreaker] = None
+    ) -> None:
+        self.uri = uri
+        self.circuit_breaker = circuit_breaker
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._latency = 0.0
+        self._updated: Optional[float] = None
+        self._requests = 0
+        self._failures = 0
+
+    @property
+    def in_flight(self) -> int:
+        """The number of requests to the node which have not completed."""
+        return self._in_flight
+
+    @property
+    def latency(self) -> float:
+        """The peak exponentially weighted moving average of the latency of
+        requests to the node, in seconds; 0 until a request completes."""
+        return self._latency
+
+    @property
+    def circuit_state(self) -> str:
+        """The state of the circuit breaker of the node: "closed", "open" or
+        "half_open"."""
+        breaker = self.circuit_breaker
+        if breaker is None:
+            return CLOSED
+        with self._lock:
+            return breaker.state(time.monotonic())
+
+    def available(self) -> bool:
+        """Whether the circuit breaker of the node admits a request. The
+        probe of a half open breaker is claimed by the caller, so that
+        concurrent callers never both send one."""
+        breaker = self.circuit_breaker
+        if breaker is None:
+            return True
+        with self._lock:
+            return breaker.admits(time.monotonic(), self._in_flight)
+
+    def started(self) -> float:
+        """Records the start of a request, returning its start time."""
+        with self._lock:
+            self._in_flight += 1
+        return time.monotonic()
+
+    def finished(self, started: float, failed: bool) -> None:
+        """Records the end of a request.
+
+        Args:
+            started: the start time returned by started
+            failed: whether the node failed the request, e.g. with a
+                connection error or a 5xx or 429 status
+        """
+        now = time.monotonic()
+        latency = now - started
+        if failed:
+            latency = max(latency, FAILURE_LATENCY_SECONDS)
+        with self._lock:
+            self._in_flight -= 1
+            self._requests += 1
+            self._failures += failed
+            if self.circuit_breaker is not None:
+                self.circuit_breaker.record(failed, now)
+            if self._updated is None or latency > self._latency:
+                # peaks are followed at once, and decay over time
+                self._latency = latency
+            else:
+                weight = math.exp((self._updated - now) / EWMA_DECAY_SECONDS)
+                self._latency = self._latency * weight + latency * (1 - weight)
+            self._updated = now
+
+    def stats(self) -> NodeStats:
+        """Returns the requests to the node and its circuit state."""
+        breaker = self.circuit_breaker
+        with self._lock:
+            return NodeStats(
+                uri=self.uri,
+                in_flight=self._in_flight,
+                latency=self._latency,
+                requests=self._requests,
+                failures=self._failures,
+                circuit_state=(
+                    CLOSED
+                    if breaker is None
+                    else breaker.state(time.monotonic())
+                ),
+                circuit_opens=0 if breaker is None else breaker.opens,
+            )
+
+    def __repr__(self) -> str:
+        return "Node({!r})".format(self.uri)
+
+
+class NodeSelector(object):
+    """Chooses the node each request of a service is sent to, out of the
+    available nodes."""
+
+    name: str = ""
+    nodes: List[Node]
+
+    def __init__(self, nodes: List[Node]) -> None:
+        self.nodes = nodes
+
+    def select(self) -> Node:
+        """Returns the node to send a request to."""
+        raise NotImplementedError()
+
+    def available_nodes(self) -> List[Node]:
+        """Returns the nodes whose circuit breakers admit a request, or all
+        nodes if none do so that requests are still attempted."""
+        return [node for node in self.nodes if node.available()] or self.nodes
+
+    def failover(self, failed: Node) -> Node:
+        """Returns the node to retry a request on after it failed on a node:
+        the selected node, or the next available node if that is the failed
+        one."""
+        node = self.select()
+        if node is failed and len(self.nodes) > 1:
+            index = self.nodes.index(failed)
+            others = self.nodes[index + 1:] + self.nodes[:index]
+            available = [other for other in others if other.available()]
+            node = (available or others)[0]
+        return node
+
+    def node_for(self, url: str) -> Optional[Node]:
+        """Returns the node a url was built from, if any."""
+        matches = [node for node in self.nodes if url.startswith(node.uri)]
+        return max(matches, key=lambda node: len(node.uri), default=None)
+
+    def __repr__(self) -> str:
+        return "{}({!r})".format(self.__class__.__name__, self.nodes)
+
+
+class RandomNodeSelector(NodeSelector):
+    """Chooses nodes uniformly at random."""
+
+    name = "random"
+
+    def select(self) -> Node:
+        return random.choice(self.available_nodes())
+
+
+class RoundRobinNodeSelector(NodeSelector):
+    """Chooses each node in turn, starting from a random node so that
+    clients do not all start with the first."""
+
+    name = "round_robin"
+
+    def __init__(self, nodes: List[Node]) -> None:
+        super().__init__(nodes)
+        # next() on a count is atomic, so threads never share a turn
+        self._turns = itertools.count(random.randrange(max(len(nodes), 1)))
+
+    def select(self) -> Node:
+        nodes = self.available_nodes()
+        return nodes[next(self._turns) % len(nodes)]
+
+
+class PowerOfTwoChoicesNodeSelector(NodeSelector):
+    """Chooses the node with fewer requests in flight out of two random
+    nodes, which avoids loaded nodes without herding onto a single one."""
+
+    name = "power_of_two_choices"
+
+    def select(self) -> Node:
+        nodes = self.available_nodes()
+        if len(nodes) < 2:
+            return nodes[0]
+        first, second = random.sample(nodes, 2)
+        return first if first.in_flight <= second.in_flight else second
+
+
+class EwmaNodeSelector(NodeSelector):
+    """Chooses the node with the least expected wait: the average latency
+    of the node times the requests in flight, including the new one. Nodes
+    without completed requests are tried first."""
+
+    name = "ewma"
+
+    def select(self) -> Node:
+        # ties are broken from a random node
+        nodes = self.available_nodes()
+        start = random.randrange(len(nodes))
+        nodes = nodes[start:] + nodes[:start]
+        return min(
+            nodes, key=lambda node: node.latency * (node.in_flight + 1)
+        )
+
+
+_SELECTORS: Dict[str, Type[NodeSelector]] = {
+    selector.name: selector
+    for selector in (
+        RandomNodeSelector,
+        RoundRobinNodeSelector,
+        PowerOfTwoChoicesNodeSelector,
+        EwmaNodeSelector,
+    )
+}
+
+# the node chosen by the last Service._uri of the current thread or task
+_selected_node: ContextVar[Optional[Node]] = ContextVar(
+    "conjure_selected_node", default=None
+)
+
+
+def resolve_node_selector(
+    strategy: Union[str, Type[NodeSelector]],
+    uris: List[str],
+    circuit_breaker: Optional[CircuitBreakerConfiguration] = None,
+) -> NodeSelector:
+    """Returns a node selector over a node for each uri.
+
+    Args:
+        strategy: one of "random", "round_robin", "power_of_two_choices",
+            "ewma", or a NodeSelector subclass
+        uris: the uris of the service
+        circuit_breaker: the configuration of a circuit breaker for each
+            node. Defaults to nodes without circuit breakers.
+    """
+    if isinstance(strategy, str):
+        if strategy not in _SELECTORS:
+            raise ValueError(
+                "unknown node selection strategy {}, expected one of {}"
+                .format(strategy, ", ".join(sorted(_SELECTORS)))
+            )
+        strategy = _SELECTORS[strategy]
+    return strategy(
+        [
+            Node(
+                uri,
+                None
+                if circuit_breaker is None
+                else CircuitBreaker(circuit_breaker),
+            )
+            for uri in uris
+        ]
+    )
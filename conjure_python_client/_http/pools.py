@@ -0,0 +1,186 @@
+# (c) Copyright 2026 Palantir Technologies Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from dataclasses import dataclass
+from requests.packages.urllib3.connectionpool import (
+    HTTPConnectionPool,
+    HTTPSConnectionPool,
+)
+from requests.packages.urllib3.exceptions import EmptyPoolError
+from requests.packages.urllib3.poolmanager import PoolManager
+from typing import Any, List, Optional
+
+import queue
+import threading
+import time
+
+
+@dataclass
+class ConnectionPoolStats:
+    """The utilisation of the connection pool to one host, since the pool
+    was created. Pools with discarded connections or waits are too small;
+    pools whose max_in_use stays below maxsize are larger than needed."""
+
+    # the pooled origin, e.g. https://host:443
+    host: str
+    maxsize: int
+    # connections open and available for reuse
+    idle: int
+    in_use: int
+    max_in_use: int
+    connections_created: int
+    requests: int
+    # connections closed on release as the pool was full, when not blocking
+    discarded: int
+    # acquisitions which found every connection in use, when blocking
+    waits: int
+    wait_time: float
+    # acquisitions which waited for longer than the pool timeout
+    timeouts: int
+
+
+class _PoolCounters(object):
+    """The counters behind ConnectionPoolStats, updated as connections are
+    acquired and released."""
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self.lock = threading.Lock()
+        self.in_use = 0
+        self.max_in_use = 0
+        self.connections_created = 0
+        self.requests = 0
+        self.discarded = 0
+        self.waits = 0
+        self.wait_time = 0.0
+        self.timeouts = 0
+
+    def acquired(self, wait_time: Optional[float]) -> None:
+        with self.lock:
+            self.in_use += 1
+            self.requests += 1
+            self.max_in_use = max(self.max_in_use, self.in_use)
+            if wait_time is not None:
+                self.waits += 1
+                self.wait_time += wait_time
+
+    def timed_out(self, wait_time: float) -> None:
+        with self.lock:
+            self.waits += 1
+            self.wait_time += wait_time
+            self.timeouts += 1
+
+    def released(self, discarded: bool) -> None:
+        with self.lock:
+            self.in_use -= 1
+            if discarded:
+                self.discarded += 1
+
+    def stats(self, host: str, idle: int) -> ConnectionPoolStats:
+        with self.lock:
+            return ConnectionPoolStats(
+                host=host,
+                maxsize=self.maxsize,
+                idle=idle,
+                in_use=self.in_use,
+                max_in_use=self.max_in_use,
+                connections_created=self.connections_created,
+                requests=self.requests,
+                discarded=self.discarded,
+                waits=self.waits,
+                wait_time=self.wait_time,
+                timeouts=self.timeouts,
+            )
+
+
+class _CountedHTTPConnectionPool(HTTPConnectionPool):
+    """Counts the use of its connections, and waits for at most
+    pool_timeout for a connection when blocking."""
+
+    pool_timeout: Optional[float] = None
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.counters = _PoolCounters(self.pool.maxsize)
+
+    def _get_conn(self, timeout: Optional[float] = None) -> Any:
+        if timeout is None:
+            timeout = self.pool_timeout
+        waits = self.block and self.pool is not None and self.pool.empty()
+        started = time.monotonic()
+        try:
+            conn = super()._get_conn(timeout)
+        except EmptyPoolError:
+            self.counters.timed_out(time.monotonic() - started)
+            raise
+        self.counters.acquired(time.monotonic() - started if waits else None)
+        return conn
+
+    def _put_conn(self, conn: Any) -> None:
+        if conn is not None and self.pool is not None:
+            try:
+                self.pool.put(conn, block=False)
+                self.counters.released(False)
+                return
+            except queue.Full:
+                pass
+        # closes connections which do not fit in the pool
+        self.counters.released(conn is not None)
+        super()._put_conn(conn)
+
+    def _new_conn(self) -> Any:
+        conn = super()._new_conn()
+        with self.counters.lock:
+            self.counters.connections_created += 1
+        return conn
+
+    def stats(self) -> ConnectionPoolStats:
+        pool = self.pool
+        idle = 0 if pool is None else sum(1 for conn in pool.queue if conn)
+        return self.counters.stats(
+            "{}://{}:{}".format(self.scheme, self.host, self.port), idle
+        )
+
+
+class _CountedHTTPSConnectionPool(
+    _CountedHTTPConnectionPool, HTTPSConnectionPool
+):
+    pass
+
+
+class _CountedPoolManager(PoolManager):
+    """A PoolManager whose pools count the use of their connections."""
+
+    def __init__(
+        self, pool_timeout: Optional[float] = None, **kwargs: Any
+    ) -> None:
+        super().__init__(**kwargs)
+        self.pool_timeout = pool_timeout
+        self.pool_classes_by_scheme = {
+            "http": _CountedHTTPConnectionPool,
+            "https": _CountedHTTPSConnectionPool,
+        }
+
+    def _new_pool(self, *args: Any, **kwargs: Any) -> Any:
+        pool = super()._new_pool(*args, **kwargs)
+        pool.pool_timeout = self.pool_timeout
+        return pool
+
+    def pool_stats(self) -> List[ConnectionPoolStats]:
+        stats = []
+        for key in self.pools.keys():
+            pool = self.pools.get(key)
+            if pool is not None:
+                stats.append(pool.stats())
+        return stats
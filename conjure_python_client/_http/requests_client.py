@@ -13,17 +13,42 @@
 # limitations under the License.
 
 from requests.adapters import HTTPAdapter, Response, CaseInsensitiveDict
+from requests.adapters import DEFAULT_POOLBLOCK, DEFAULT_POOLSIZE
 from typing import TypeVar, Type, List, Optional, Dict, Any, Union
-from requests.exceptions import HTTPError
-from requests.packages.urllib3.poolmanager import PoolManager
+from typing import Iterator, Tuple
+from requests.exceptions import HTTPError, RequestException, RetryError
+from requests.packages.urllib3.exceptions import (
+    MaxRetryError,
+    ProtocolError,
+    ReadTimeoutError,
+    ResponseError,
+)
+from requests.packages.urllib3.response import HTTPResponse
 from requests.packages.urllib3.util.ssl_ import create_urllib3_context
 from requests.packages.urllib3.util import Retry
 from .configuration import ServiceConfiguration
+from .nodes import (
+    Node,
+    NodeSelector,
+    NodeStats,
+    RandomNodeSelector,
+    _selected_node,
+    resolve_node_selector,
+)
+from .pools import ConnectionPoolStats, _CountedPoolManager
+from .._lib import ConjureBeanType, ConjureEnumType, ConjureUnionType
+from .._serde.encoder import ConjureEncoder
+from .._serde.json_backend import (
+    JsonBackend,
+    StdlibJsonBackend,
+    resolve_json_backend,
+)
 
 import binascii
 import os
 import random
 import requests
+import time
 
 
 T = TypeVar("T")
@@ -57,22 +82,38 @@ def fresh_trace_id() -> bytes:
     return binascii.hexlify(os.urandom(TRACE_ID_RANDOM_BYTES))
 
 
-class Service(object):
-    _requests_session: requests.Session
+class _ServiceBase(object):
+    """The configuration and request preparation shared by synchronous and
+    asynchronous services.
+
+    A json body that is, or contains, conjure objects is written straight
+    to utf-8 bytes by ConjureEncoder.write_to_buffer, which also splices in
+    the encodings of ConjureEncoder.cache_encoded. An iterator body is
+    streamed as a json list. Callers opt in by passing the conjure objects
+    themselves as the json argument of _request. Bodies already encoded
+    into json trees, which generated services pass, are serialised as
+    usual.
+    """
+
     _uris: List[str]
     _connect_timeout: float
     _read_timeout: float
     _verify: str
     _return_none_for_unknown_union_types: bool
+    _json_backend: Optional[JsonBackend]
+    _session_repr: str = ""
 
     def __init__(
         self,
-        requests_session: requests.Session,
+        requests_session: Any,
         uris: List[str],
         _connect_timeout: float,
         _read_timeout: float,
         _verify: str,
         _return_none_for_unknown_union_types: bool = False,
+        _json_backend: Optional[JsonBackend] = None,
+        _node_selector: Optional[NodeSelector] = None,
+        _max_retries: Optional[Retry] = None,
     ) -> None:
         self._requests_session = requests_session
         self._uris = uris
@@ -82,31 +123,109 @@ class Service(object):
         self._return_none_for_unknown_union_types = (
             _return_none_for_unknown_union_types
         )
+        self._json_backend = _json_backend
+        if _node_selector is None:
+            _node_selector = RandomNodeSelector([Node(uri) for uri in uris])
+        self._node_selector = _node_selector
+        if _max_retries is None:
+            _max_retries = Retry(0, read=False)
+        self._max_retries = _max_retries
 
     @property
     def _uri(self) -> str:
-        """returns a random uri"""
-        return random.SystemRandom().choice(self._uris)
-
-    def _request(self, *args, **kwargs) -> Response:
-        """Make requests using configured :class:`requests.Session`.
-        Any error details will be extracted to an :class:`HTTPError`
-        which will contain relevant error details when printed."""
-        self._amend_request_kwargs(kwargs)
-        _response = self._requests_session.request(*args, **kwargs)
-        try:
-            _response.raise_for_status()
-        except HTTPError as e:
-            if e.response is not None:
-                raise ConjureHTTPError(e) from e
-            raise e
-        return _response
+        """returns the uri of the node chosen by the node selector"""
+        node = self._node_selector.select()
+        _selected_node.set(node)
+        return node.uri
+
+    def _node_of(self, url: str) -> Optional[Node]:
+        # the node whose uri the request url was built from, normally the
+        # node chosen by the last _uri of this thread or task
+        node = _selected_node.get()
+        _selected_node.set(None)
+        if (
+            node is None
+            or not url.startswith(node.uri)
+            or node not in self._node_selector.nodes
+        ):
+            node = self._node_selector.node_for(url)
+        return node
+
+    def _retry(
+        self,
+        retries: Retry,
+        node: Optional[Node],
+        method: str,
+        url: str,
+        response: Optional[Response] = None,
+        error: Optional[RequestException] = None,
+    ) -> Optional[Tuple[Retry, float, Optional[Node], str]]:
+        """Returns the retries left, the seconds to back off for, and the
+        node and url to retry a request on after it failed with a response
+        or error, or None if the request is not retried. Retries fail over
+        to another node, replacing the uri of the failed node in the url.
+
+        As urllib3 would: errors before the request was sent, such as
+        connect, TLS handshake and proxy errors, and the statuses of
+        retries are retried until retries is exhausted, which raises
+        RetryError for statuses. Read errors are never retried, as the
+        server may have received the request.
+        """
+        if error is not None:
+            reason = _unsent_request_reason(error)
+            if reason is None:
+                return None
+            try:
+                retries = retries.increment(method, url, error=reason)
+            except MaxRetryError:
+                return None
+            delay = retries.get_backoff_time()
+        else:
+            assert response is not None
+            has_retry_after = bool(response.headers.get("Retry-After"))
+            if not retries.is_retry(
+                method, response.status_code, has_retry_after
+            ):
+                return None
+            retried = HTTPResponse(
+                headers=dict(response.headers),
+                status=response.status_code,
+                preload_content=False,
+            )
+            try:
+                retries = retries.increment(method, url, response=retried)
+            except MaxRetryError as e:
+                if retries.raise_on_status:
+                    response.close()
+                    raise RetryError(e, request=response.request)
+                return None
+            # releases the connection of streamed responses to the pool,
+            # as urllib3 drains responses it retries
+            response.close()
+            delay = None
+            if retries.respect_retry_after_header:
+                delay = retries.get_retry_after(retried)
+            if delay is None:
+                delay = retries.get_backoff_time()
+        if node is not None:
+            failed, node = node, self._node_selector.failover(node)
+            url = node.uri + url[len(failed.uri):]
+        return retries, delay, node, url
 
     def __repr__(self) -> str:
         return "{}(requests_session={}, uris={})".format(
-            self.__class__.__name__, "requests.Session(...)", repr(self._uris)
+            self.__class__.__name__, self._session_repr, repr(self._uris)
         )
 
+    def _prepare_request_kwargs(self, kwargs: Dict[str, Any]) -> JsonBackend:
+        # returns the json backend to parse the response with
+        self._amend_request_kwargs(kwargs)
+        _write_conjure_body(kwargs)
+        json_backend = resolve_json_backend(self._json_backend)
+        if not isinstance(json_backend, StdlibJsonBackend):
+            _serialize_json_body(kwargs, json_backend)
+        return json_backend
+
     def _amend_request_kwargs(self, kwargs) -> None:
         for param_kind in ["headers", "params"]:
             if param_kind in kwargs:
@@ -116,6 +235,109 @@ class Service(object):
         _add_trace_id(kwargs)
 
 
+class Service(_ServiceBase):
+    _requests_session: requests.Session
+    _session_repr = "requests.Session(...)"
+
+    def _request(self, *args, **kwargs) -> Response:
+        """Make requests using configured :class:`requests.Session`.
+        Any error details will be extracted to an :class:`HTTPError`
+        which will contain relevant error details when printed.
+        Failed requests are retried on another node, see _retry."""
+        json_backend = self._prepare_request_kwargs(kwargs)
+        method, url, args = _split_target(args, kwargs)
+        node = self._node_of(url)
+        retries = self._max_retries
+        while True:
+            try:
+                _response = self._send(node, method, url, *args, **kwargs)
+            except RequestException as e:
+                retry = self._retry(retries, node, method, url, error=e)
+                if retry is None:
+                    raise
+            else:
+                retry = self._retry(
+                    retries, node, method, url, response=_response
+                )
+                if retry is None:
+                    break
+            retries, delay, node, url = retry
+            time.sleep(delay)
+        _check_response(_response, json_backend)
+        return _response
+
+    def _send(
+        self, node: Optional[Node], method: str, url: str, *args, **kwargs
+    ) -> Response:
+        started = node.started() if node is not None else 0.0
+        failed = True
+        try:
+            _response = self._requests_session.request(
+                method, url, *args, **kwargs
+            )
+            failed = _is_node_failure(_response)
+        finally:
+            if node is not None:
+                node.finished(started, failed)
+        return _response
+
+
+class _Session(requests.Session):
+    """A session which leaves 308 responses, with which conjure servers ask
+    clients to retry another node, to the retries of services instead of
+    following them as redirects."""
+
+    def get_redirect_target(self, resp):
+        if resp.status_code == requests.codes.permanent_redirect:
+            return None
+        return super().get_redirect_target(resp)
+
+
+def _split_target(
+    args: Tuple[Any, ...], kwargs: Dict[str, Any]
+) -> Tuple[str, str, Tuple[Any, ...]]:
+    # returns the method, url and remaining positional arguments of a
+    # request
+    if "method" in kwargs:
+        return kwargs.pop("method"), kwargs.pop("url"), args
+    if "url" in kwargs:
+        return args[0], kwargs.pop("url"), args[1:]
+    return args[0], args[1], args[2:]
+
+
+def _unsent_request_reason(
+    error: RequestException,
+) -> Optional[Exception]:
+    # the urllib3 error of a request which failed while connecting to the
+    # server or proxy, or during the TLS handshake, and so was never sent
+    cause = error.args[0] if error.args else None
+    if not isinstance(cause, MaxRetryError):
+        return None
+    reason = cause.reason
+    if reason is None or isinstance(
+        reason, (ReadTimeoutError, ProtocolError, ResponseError)
+    ):
+        return None
+    return reason
+
+
+def _is_node_failure(response: Response) -> bool:
+    # throttling and server errors count against a node, client errors do
+    # not
+    return response.status_code >= 500 or response.status_code == 429
+
+
+def _check_response(response: Response, json_backend: JsonBackend) -> None:
+    try:
+        response.raise_for_status()
+    except HTTPError as e:
+        if e.response is not None:
+            raise ConjureHTTPError(e) from e
+        raise e
+    if not isinstance(json_backend, StdlibJsonBackend):
+        _parse_json_with(response, json_backend)
+
+
 def _clean_params(params: Dict[str, Any]) -> Dict[str, Any]:
     cleaned_params = {}
     for key, value in params.items():
@@ -133,6 +355,85 @@ def _clean_param_value(value: Any) -> Any:
     return str(value)
 
 
+def _serialize_json_body(
+    kwargs: Dict[str, Any], json_backend: JsonBackend
+) -> None:
+    # serialises the json argument the same way requests would, but with
+    # the configured backend
+    if kwargs.get("json") is None or kwargs.get("data"):
+        return
+    kwargs["data"] = json_backend.dumps(kwargs.pop("json"))
+    headers = kwargs.setdefault("headers", {})
+    if not any(key.lower() == "content-type" for key in headers):
+        headers["Content-Type"] = "application/json"
+
+
+_CONJURE_TYPES = (ConjureBeanType, ConjureUnionType, ConjureEnumType)
+
+
+def _write_conjure_body(kwargs: Dict[str, Any]) -> None:
+    # conjure objects given as the json argument, rather than json trees
+    # encoded by ConjureEncoder, are written straight to a bytes buffer.
+    # Iterators, e.g. generators of beans, are streamed as a json list
+    # with chunked transfer encoding.
+    body = kwargs.get("json")
+    if kwargs.get("data"):
+        return
+    if isinstance(body, Iterator):
+        kwargs.pop("json")
+        kwargs["data"] = _StreamedBody(ConjureEncoder.iter_encode_list(body))
+        headers = kwargs.setdefault("headers", {})
+    elif _contains_conjure_value(body):
+        kwargs.pop("json")
+        kwargs["data"] = buffer = ConjureEncoder.write_to_buffer(body)
+        headers = kwargs.setdefault("headers", {})
+        headers["Content-Length"] = str(len(buffer))
+    else:
+        return
+    if not any(key.lower() == "content-type" for key in headers):
+        headers["Content-Type"] = "application/json"
+
+
+class _StreamedBody(object):
+    """A request body streamed from an iterator of chunks. It can only be
+    sent once: a retry fails rather than silently sending an empty body."""
+
+    def __init__(self, chunks: Iterator[bytes]) -> None:
+        self._chunks: Optional[Iterator[bytes]] = chunks
+
+    def __iter__(self) -> Iterator[bytes]:
+        chunks, self._chunks = self._chunks, None
+        if chunks is None:
+            raise ValueError(
+                "streamed request bodies cannot be sent again, e.g. when "
+                "the request is retried"
+            )
+        return chunks
+
+
+def _contains_conjure_value(value: Any) -> bool:
+    # walks the whole value, as lists and maps may mix conjure objects with
+    # values which are already json
+    pending = [value]
+    while pending:
+        value = pending.pop()
+        if isinstance(value, _CONJURE_TYPES):
+            return True
+        if isinstance(value, (list, tuple)):
+            pending.extend(value)
+        elif isinstance(value, dict):
+            pending.extend(value.items())
+    return False
+
+
+def _parse_json_with(response: Response, json_backend: JsonBackend) -> None:
+    # generated services parse responses with response.json()
+    def parse_json(**kwargs: Any) -> Any:
+        return json_backend.loads(response.content)
+
+    response.json = parse_json  # type: ignore
+
+
 def _add_trace_id(kwargs: Dict[str, Any]) -> None:
     # Adds the trace ID to the arguments
     if "headers" not in kwargs:
@@ -156,6 +457,17 @@ class RetryWithJitter(Retry):
         return jitter * super().get_backoff_time()
 
 
+def _create_retry(service_config: ServiceConfiguration) -> RetryWithJitter:
+    # setup retry to match java remoting
+    # https://github.com/palantir/http-remoting/tree/3.12.0#quality-of-service-retry-failover-throttling
+    return RetryWithJitter(
+        total=service_config.max_num_retries,
+        read=0,  # do not retry read errors
+        status_forcelist=[308, 429, 503],
+        backoff_factor=float(service_config.backoff_slot_size) / 1000,
+    )
+
+
 class RequestsClient(object):
     @classmethod
     def create(
@@ -164,18 +476,36 @@ class RequestsClient(object):
         user_agent: str,
         service_config: ServiceConfiguration,
         return_none_for_unknown_union_types: bool = False,
+        json_backend: Union[str, JsonBackend, None] = None,
     ) -> T:
-        # setup retry to match java remoting
-        # https://github.com/palantir/http-remoting/tree/3.12.0#quality-of-service-retry-failover-throttling
-        retry = RetryWithJitter(
-            total=service_config.max_num_retries,
-            read=0,  # do not retry read errors
-            status_forcelist=[308, 429, 503],
-            backoff_factor=float(service_config.backoff_slot_size) / 1000,
+        """Creates a service client.
+
+        Args:
+            service_class: the generated service class to instantiate
+            user_agent: the User-Agent sent with every request
+            service_config: the uris, security, timeouts and retries
+            return_none_for_unknown_union_types: if set to True, unknown
+                union types decode to None instead of raising an exception
+            json_backend: the json backend used for request and response
+                bodies, see resolve_json_backend. Defaults to the global
+                backend at the time of each request.
+        """
+        # requests are retried by the service, which fails over to other
+        # uris, rather than by the transport adapter
+        transport_adapter = TransportAdapter(
+            pool_connections=_or_default(
+                service_config.pool_connections, DEFAULT_POOLSIZE
+            ),
+            pool_maxsize=_or_default(
+                service_config.pool_maxsize, DEFAULT_POOLSIZE
+            ),
+            pool_block=_or_default(
+                service_config.pool_block, DEFAULT_POOLBLOCK
+            ),
+            pool_timeout=service_config.pool_timeout,
         )
-        transport_adapter = TransportAdapter(max_retries=retry)
         # create a session, for shared connection polling, user agent, etc
-        session = requests.Session()
+        session = _Session()
         session.headers = CaseInsensitiveDict({"User-Agent": user_agent})
         if service_config.security is not None:
             verify = service_config.security.trust_store_path
@@ -183,6 +513,8 @@ class RequestsClient(object):
             verify = None
         for uri in service_config.uris:
             session.mount(uri, transport_adapter)
+        if json_backend is not None:
+            json_backend = resolve_json_backend(json_backend)
         return service_class(  # type: ignore
             session,
             service_config.uris,
@@ -190,11 +522,55 @@ class RequestsClient(object):
             service_config.read_timeout,
             verify,
             return_none_for_unknown_union_types,
+            json_backend,
+            resolve_node_selector(
+                service_config.node_selection,
+                service_config.uris,
+                service_config.circuit_breaker,
+            ),
+            _create_retry(service_config),
         )
 
+    @classmethod
+    def pool_stats(cls, service: Service) -> List[ConnectionPoolStats]:
+        """Returns the utilisation of the connection pool to each host the
+        service has sent requests to."""
+        adapters = {
+            id(adapter): adapter
+            for adapter in service._requests_session.adapters.values()
+            if isinstance(adapter, TransportAdapter)
+        }
+        return [
+            stats
+            for adapter in adapters.values()
+            for stats in adapter.pool_stats()
+        ]
+
+    @classmethod
+    def node_stats(cls, service: Service) -> List[NodeStats]:
+        """Returns the requests to, and the circuit breaker state of, each
+        uri of the service."""
+        return [node.stats() for node in service._node_selector.nodes]
+
 
 class TransportAdapter(HTTPAdapter):
-    """Transport adapter that allows customising ssl things"""
+    """Transport adapter that allows customising ssl things, and counts the
+    use of its connection pools"""
+
+    __attrs__ = HTTPAdapter.__attrs__ + ["_pool_timeout"]
+    poolmanager: _CountedPoolManager
+
+    def __init__(
+        self, *args: Any, pool_timeout: Optional[float] = None, **kwargs: Any
+    ) -> None:
+        """
+        Args:
+            pool_timeout: when the pools block, the seconds to wait for a
+                connection before raising EmptyPoolError. Defaults to
+                waiting indefinitely.
+        """
+        self._pool_timeout = pool_timeout
+        super().__init__(*args, **kwargs)
 
     def init_poolmanager(
         self, connections, maxsize, block=False, **pool_kwargs
@@ -203,7 +579,8 @@ class TransportAdapter(HTTPAdapter):
         self._pool_maxsize = maxsize
         self._pool_block = block
         ssl_context = create_urllib3_context(ciphers=CIPHERS)
-        self.poolmanager = PoolManager(
+        self.poolmanager = _CountedPoolManager(
+            pool_timeout=self._pool_timeout,
             num_pools=connections,
             maxsize=maxsize,
             block=block,
@@ -212,6 +589,14 @@ class TransportAdapter(HTTPAdapter):
             **pool_kwargs
         )
 
+    def pool_stats(self) -> List[ConnectionPoolStats]:
+        """Returns the utilisation of the connection pool to each host."""
+        return self.poolmanager.pool_stats()
+
+
+def _or_default(value: Optional[T], default: T) -> T:
+    return default if value is None else value
+
 
 class ConjureHTTPError(HTTPError):
     """An HTTPError from a Conjure Service with ``SerializableError``
@@ -13,6 +13,7 @@
 # limitations under the License.
 
 from .types import *
+from .hashing import enable_hashing
 
 __all__ = [
     "BinaryType",
@@ -26,4 +27,5 @@ __all__ = [
     "ListType",
     "OptionalType",
     "OptionalTypeWrapper",
+    "enable_hashing",
 ]
@@ -0,0 +1,205 @@
+# (c) Copyright 2026 Palantir Technologies Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from .metadata import bean_metadata, bean_values_getter, union_metadata
+from .sanitize import sanitize_identifier
+from .case import to_snake_case
+from .types import (
+    ConjureBeanType,
+    ConjureUnionType,
+    DictType,
+    ListType,
+    OptionalType,
+)
+from array import array
+from typing import Any, Callable, Iterator, List, Set, Tuple, get_args
+import inspect
+import threading
+
+# instance attribute caching the hash of a bean or union, named so that it
+# cannot collide with the field attributes of generated types
+HASH_ATTRIBUTE = "__conjure_hash__"
+
+_HASHABLE_TYPES: Set[type] = set()
+_HASHABLE_TYPES_LOCK = threading.Lock()
+
+
+def enable_hashing(conjure_type: type, recursive: bool = True) -> None:
+    """Makes instances of a bean or union type hashable, with equality and
+    hashing based on their field values.
+
+    Equality compares the tuples of field values of two beans in a single
+    comparison, and the hash of each instance is computed once, from its
+    field values with lists, sets and maps frozen, and cached on the
+    instance. Beans can then be deduplicated in sets or used as dict keys.
+
+    Beans are immutable, but lists and maps held by a bean are not: a
+    hashed bean must not have its collections mutated.
+
+    Args:
+        conjure_type: a ConjureBeanType or ConjureUnionType class
+        recursive: if set to True, also enables hashing for the bean and
+            union types of its fields, transitively
+    """
+    with _HASHABLE_TYPES_LOCK:
+        for hashable_type in _reachable_types(conjure_type, recursive):
+            if hashable_type in _HASHABLE_TYPES:
+                continue
+            if issubclass(hashable_type, ConjureBeanType):
+                get_values = bean_values_getter(hashable_type)
+            else:
+                get_values = _union_values(hashable_type)
+            _install(hashable_type, get_values)
+            _HASHABLE_TYPES.add(hashable_type)
+
+
+def _reachable_types(conjure_type: type, recursive: bool) -> Iterator[type]:
+    if not (
+        inspect.isclass(conjure_type)
+        and issubclass(conjure_type, (ConjureBeanType, ConjureUnionType))
+    ):
+        raise ValueError(
+            "expected a bean or union type but got {}".format(conjure_type)
+        )
+    pending = [conjure_type]
+    seen = {conjure_type}
+    while pending:
+        current = pending.pop()
+        yield current
+        if not recursive:
+            continue
+        if issubclass(current, ConjureBeanType):
+            definitions = bean_metadata(current).fields.values()
+        else:
+            definitions = union_metadata(current).options.values()
+        for field_definition in definitions:
+            field_type = field_definition.field_type
+            for nested in nested_conjure_types(field_type):
+                if nested not in seen:
+                    seen.add(nested)
+                    pending.append(nested)
+
+
+def nested_conjure_types(field_type: Any) -> Iterator[type]:
+    """Yields the bean and union types directly referenced by a field type,
+    looking through lists, maps and optionals."""
+    if isinstance(field_type, (ListType, OptionalType)):
+        yield from nested_conjure_types(field_type.item_type)
+    elif isinstance(field_type, DictType):
+        yield from nested_conjure_types(field_type.key_type)
+        yield from nested_conjure_types(field_type.value_type)
+    elif inspect.isclass(field_type) and issubclass(
+        field_type, (ConjureBeanType, ConjureUnionType)
+    ):
+        yield field_type
+    else:
+        for argument in get_args(field_type):
+            yield from nested_conjure_types(argument)
+
+
+def _union_values(union_type: type) -> Callable[[Any], Tuple[Any, ...]]:
+    attribute_by_identifier = union_metadata(
+        union_type
+    ).attribute_by_identifier
+
+    def get_values(union):
+        attribute = attribute_by_identifier.get(union.type)
+        if attribute is None:
+            attribute = sanitize_identifier(to_snake_case(union.type))
+        return (union.type, getattr(union, attribute))
+
+    return get_values
+
+
+def _install(
+    conjure_type: type, get_values: Callable[[Any], Tuple[Any, ...]]
+) -> None:
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if not isinstance(other, conjure_type):
+            return False
+        return get_values(self) == get_values(other)
+
+    def __hash__(self):
+        value_hash = getattr(self, HASH_ATTRIBUTE)
+        if value_hash is not None:
+            return value_hash
+        values = get_values(self)
+        try:
+            value_hash = hash(values)
+        except TypeError:
+            value_hash = hash(_freeze(values))
+        setattr(self, HASH_ATTRIBUTE, value_hash)
+        return value_hash
+
+    def __getstate__(self):
+        # the default state, without the cached hash as string hashes
+        # differ between processes
+        state = dict(getattr(self, "__dict__", {}))
+        state.pop(HASH_ATTRIBUTE, None)
+        slots = {
+            name: getattr(self, name)
+            for name in _slot_names(type(self))
+            if name != HASH_ATTRIBUTE and hasattr(self, name)
+        }
+        if slots:
+            return state or None, slots
+        return state
+
+    def __setstate__(self, state):
+        slots = None
+        if isinstance(state, tuple):
+            state, slots = state
+        if state:
+            self.__dict__.update(state)
+        for name, value in (slots or {}).items():
+            setattr(self, name, value)
+
+    # instances without a cached hash see the class attribute
+    setattr(conjure_type, HASH_ATTRIBUTE, None)
+    conjure_type.__eq__ = __eq__  # type: ignore
+    conjure_type.__hash__ = __hash__  # type: ignore
+    conjure_type.__getstate__ = __getstate__  # type: ignore
+    conjure_type.__setstate__ = __setstate__  # type: ignore
+
+
+def _slot_names(cls: type) -> List[str]:
+    # the slots declared by a class and its bases, mangled as copyreg does
+    names = []
+    for base in cls.__mro__:
+        slots = base.__dict__.get("__slots__", ())
+        if isinstance(slots, str):
+            slots = (slots,)
+        for name in slots:
+            if name in ("__dict__", "__weakref__"):
+                continue
+            if name.startswith("__") and not name.endswith("__"):
+                name = "_{}{}".format(base.__name__.lstrip("_"), name)
+            names.append(name)
+    return names
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, (list, tuple)):
+        return tuple(map(_freeze, value))
+    elif isinstance(value, dict):
+        return frozenset(
+            (key, _freeze(item)) for key, item in value.items()
+        )
+    elif isinstance(value, (set, frozenset)):
+        return frozenset(value)
+    elif isinstance(value, array):
+        return tuple(value)
+    return value
@@ -0,0 +1,117 @@
+# (c) Copyright 2026 Palantir Technologies Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from operator import attrgetter
+from typing import Any, Callable, Dict, Tuple
+import inspect
+
+
+class BeanMetadata(object):
+    """Field metadata of a ConjureBeanType class, derived once from the
+    generated ``_fields()``.
+
+    Instances are shared between all callers and must not be mutated.
+    """
+
+    fields: Dict[str, Any]
+    attributes: Tuple[str, ...]
+    attribute_by_identifier: Dict[str, str]
+
+    def __init__(self, fields: Dict[str, Any]) -> None:
+        self.fields = fields
+        self.attributes = tuple(fields)
+        self.attribute_by_identifier = {
+            field_definition.identifier: attribute
+            for attribute, field_definition in fields.items()
+        }
+
+
+class UnionMetadata(object):
+    """Option metadata of a ConjureUnionType class, derived once from the
+    generated ``_options()``.
+
+    Instances are shared between all callers and must not be mutated.
+    """
+
+    options: Dict[str, Any]
+    attributes: Tuple[str, ...]
+    attribute_by_identifier: Dict[str, str]
+    option_by_identifier: Dict[str, Tuple[str, Any]]
+    accepts_type_of_union: bool
+
+    def __init__(
+        self, options: Dict[str, Any], accepts_type_of_union: bool
+    ) -> None:
+        self.options = options
+        self.attributes = tuple(options)
+        self.attribute_by_identifier = {
+            field_definition.identifier: attribute
+            for attribute, field_definition in options.items()
+        }
+        self.option_by_identifier = {
+            field_definition.identifier: (attribute, field_definition)
+            for attribute, field_definition in options.items()
+        }
+        # for backwards compatibility with conjure-python, the constructor
+        # only takes type_of_union in newer generated code
+        self.accepts_type_of_union = accepts_type_of_union
+
+
+# metadata is keyed by class rather than stored on it, so that it can never
+# collide with the private attributes of generated types. Building it is
+# idempotent, so concurrent first use at worst builds it twice.
+_BEAN_METADATA: Dict[type, BeanMetadata] = {}
+_UNION_METADATA: Dict[type, UnionMetadata] = {}
+
+
+def bean_metadata(bean_type: type) -> BeanMetadata:
+    """Returns the cached metadata of the given ConjureBeanType class."""
+    metadata = _BEAN_METADATA.get(bean_type)
+    if metadata is None:
+        metadata = BeanMetadata(bean_type._fields())  # type: ignore
+        _BEAN_METADATA[bean_type] = metadata
+    return metadata
+
+
+def union_metadata(union_type: type) -> UnionMetadata:
+    """Returns the cached metadata of the given ConjureUnionType class."""
+    metadata = _UNION_METADATA.get(union_type)
+    if metadata is None:
+        parameters = inspect.signature(union_type).parameters
+        metadata = UnionMetadata(
+            union_type._options(),  # type: ignore
+            "type_of_union" in parameters,
+        )
+        _UNION_METADATA[union_type] = metadata
+    return metadata
+
+
+def bean_values_getter(bean_type: type) -> Callable[[Any], Tuple[Any, ...]]:
+    """Returns a function which returns the field values of a bean of the
+    given ConjureBeanType class, in the order of its attributes."""
+    attributes = bean_metadata(bean_type).attributes
+    if all(hasattr(bean_type, "_" + attribute) for attribute in attributes):
+        # generated beans keep field values in "_" + attribute, which never
+        # ends in "__" and is cheaper to read than the property
+        attributes = tuple("_" + attribute for attribute in attributes)
+    if not attributes:
+        return lambda bean: ()
+    if len(attributes) == 1:
+        (attribute,) = attributes
+
+        def get_value(bean):
+            return (getattr(bean, attribute),)
+
+        return get_value
+    return attrgetter(*attributes)
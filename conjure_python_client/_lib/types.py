@@ -16,6 +16,7 @@ from enum import Enum
 from typing import List, Dict, Type, Any, Union, Optional, TypeVar, Generic
 
 from .case import to_snake_case
+from .metadata import bean_metadata, union_metadata
 from .sanitize import sanitize_identifier
 
 
@@ -59,6 +60,14 @@ class ListType(ConjureType):
     def __init__(self, item_type: Type[DecodableType]) -> None:
         self.item_type = item_type
 
+    def __eq__(self, other: Any) -> bool:
+        return (
+            isinstance(other, ListType) and self.item_type == other.item_type
+        )
+
+    def __hash__(self) -> int:
+        return hash((ListType, self.item_type))
+
 
 class DictType(ConjureType):
     key_type: Type[DecodableType]
@@ -70,6 +79,16 @@ class DictType(ConjureType):
         self.key_type = key_type
         self.value_type = value_type
 
+    def __eq__(self, other: Any) -> bool:
+        return (
+            isinstance(other, DictType)
+            and self.key_type == other.key_type
+            and self.value_type == other.value_type
+        )
+
+    def __hash__(self) -> int:
+        return hash((DictType, self.key_type, self.value_type))
+
 
 class OptionalType(ConjureType):
     item_type: Type[DecodableType]
@@ -77,6 +96,15 @@ class OptionalType(ConjureType):
     def __init__(self, item_type: Type[DecodableType]) -> None:
         self.item_type = item_type
 
+    def __eq__(self, other: Any) -> bool:
+        return (
+            isinstance(other, OptionalType)
+            and self.item_type == other.item_type
+        )
+
+    def __hash__(self) -> int:
+        return hash((OptionalType, self.item_type))
+
 
 class BinaryType(ConjureType):
     pass
@@ -104,7 +132,7 @@ class ConjureBeanType(ConjureType):
         if not isinstance(other, self.__class__):
             return False
 
-        for attr in self._fields():
+        for attr in bean_metadata(self.__class__).attributes:
             if getattr(self, attr) != getattr(other, attr):
                 return False
 
@@ -116,7 +144,7 @@ class ConjureBeanType(ConjureType):
     def __repr__(self) -> str:
         fields = [
             "{}={}".format(attr, repr(getattr(self, attr)))
-            for attr, field_def in self._fields().items()
+            for attr in bean_metadata(self.__class__).attributes
         ]
         return "{}({})".format(self.__class__.__name__, ", ".join(fields))
 
@@ -141,13 +169,15 @@ class ConjureUnionType(ConjureType):
 
         assert isinstance(other, ConjureUnionType)
 
-        pythonic_sanitized_identifier = sanitize_identifier(
-            to_snake_case(self.type)
-        )
+        if other.type != self.type:
+            return False
+
+        metadata = union_metadata(self.__class__)
+        attribute = metadata.attribute_by_identifier.get(self.type)
+        if attribute is None:
+            attribute = sanitize_identifier(to_snake_case(self.type))
 
-        return other.type == self.type and getattr(
-            self, pythonic_sanitized_identifier
-        ) == getattr(other, pythonic_sanitized_identifier)
+        return getattr(self, attribute) == getattr(other, attribute)
 
     def __ne__(self, other: Any) -> bool:
         return not self == other
@@ -155,7 +185,7 @@ class ConjureUnionType(ConjureType):
     def __repr__(self) -> str:
         fields = [
             "{}={}".format(attr, repr(getattr(self, attr)))
-            for attr, field_def in self._options().items()
+            for attr in union_metadata(self.__class__).attributes
             if getattr(self, attr) is not None
         ]
         return "{}({})".format(self.__class__.__name__, ", ".join(fields))
@@ -13,10 +13,18 @@
 # limitations under the License.
 
 from .decoder import ConjureDecoder
+from .encoded_cache import EncodedCache
 from .encoder import ConjureEncoder
+from .json_backend import JsonBackend, get_json_backend, set_json_backend
+from .projection import decode_projection
 
 
 __all__ = [
     "ConjureDecoder",
     "ConjureEncoder",
+    "EncodedCache",
+    "JsonBackend",
+    "decode_projection",
+    "get_json_backend",
+    "set_json_backend",
 ]
@@ -0,0 +1,57 @@
+# (c) Copyright 2026 Palantir Technologies Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from .._lib.metadata import bean_metadata
+from .lazy import eq_as_bean_type, hash_as_bean_type, reduce_as_bean_type
+from types import MemberDescriptorType
+from typing import Any, Dict
+
+_COMPACT_TYPES: Dict[type, type] = {}
+
+
+def compact_bean_type(bean_type: type) -> type:
+    """Returns a subclass of bean_type which stores the private attribute
+    behind each bean property in a slot.
+
+    Generated beans keep their fields in a per-instance __dict__. Slots of
+    the subclass shadow those attributes, so that the __dict__ of compact
+    instances is never created. Properties, __eq__, __repr__ and pickling
+    behave as for the generated type. Beans which already keep every field
+    in a slot, as newer conjure-python generates, are returned unchanged,
+    since slots declared again would only grow their instances.
+    """
+    compact_type = _COMPACT_TYPES.get(bean_type)
+    if compact_type is None:
+        slots = tuple(
+            "_" + attribute
+            for attribute in bean_metadata(bean_type).attributes
+            if not isinstance(
+                getattr(bean_type, "_" + attribute, None),
+                MemberDescriptorType,
+            )
+        )
+        if not slots:
+            compact_type = bean_type
+        else:
+            namespace: Dict[str, Any] = {
+                "__module__": bean_type.__module__,
+                "__qualname__": bean_type.__qualname__,
+                "__slots__": slots,
+                "__eq__": eq_as_bean_type,
+                "__hash__": hash_as_bean_type,
+                "__reduce__": reduce_as_bean_type,
+            }
+            compact_type = type(bean_type.__name__, (bean_type,), namespace)
+        compact_type = _COMPACT_TYPES.setdefault(bean_type, compact_type)
+    return compact_type
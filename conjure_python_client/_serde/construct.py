@@ -0,0 +1,132 @@
+# (c) Copyright 2026 Palantir Technologies Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from .._lib.metadata import bean_metadata
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import keyword
+
+_SIMPLE_INIT: Dict[type, bool] = {}
+
+
+def has_simple_init(bean_type: type) -> bool:
+    """Returns whether the constructor of bean_type only assigns each of its
+    arguments to the private attribute behind the matching property, as
+    generated constructors do. Only then may a bean be built by assigning
+    those attributes directly.
+
+    The constructor is called once per type with placeholder arguments.
+    """
+    simple = _SIMPLE_INIT.get(bean_type)
+    if simple is None:
+        simple = _check_simple_init(bean_type)
+        _SIMPLE_INIT[bean_type] = simple
+    return simple
+
+
+def _check_simple_init(bean_type: type) -> bool:
+    attributes = bean_metadata(bean_type).attributes
+    if not all(
+        attribute.isidentifier() and not keyword.iskeyword(attribute)
+        for attribute in attributes
+    ):
+        return False
+    placeholders = {attribute: object() for attribute in attributes}
+    try:
+        bean = bean_type(**placeholders)
+    except Exception:
+        return False
+    private_names = {"_" + attribute for attribute in attributes}
+    if not set(getattr(bean, "__dict__", {})) <= private_names:
+        return False
+    return all(
+        getattr(bean, "_" + attribute, None) is placeholder
+        for attribute, placeholder in placeholders.items()
+    )
+
+
+def _missing_field(identifier: str, obj: Any) -> None:
+    raise Exception("field {} not found in object {}".format(identifier, obj))
+
+
+def compile_bean_decoder(
+    bean_type: type,
+    fields: List[Tuple[str, str, Any, Any]],
+    skipped: List[Tuple[str, Callable[[], Any]]],
+    null_values: Dict[str, Optional[Callable[[], Any]]],
+    decode_non_object: Callable[[Any], Any],
+) -> Callable[[Any], Any]:
+    """Generates a function decoding json into a bean of bean_type, which
+    must have a simple constructor (see has_simple_init).
+
+    The function allocates the bean and assigns the private attribute of
+    each field in turn, skipping the keyword argument dict and the call to
+    the constructor.
+
+    Args:
+        bean_type: the class to instantiate
+        fields: the (python_arg_name, identifier, decode plan, field
+            definition) of each decoded field, in _fields() order; may
+            still be populated after this returns, but before the
+            function is called.
+        skipped: the (python_arg_name, null value factory) of each field
+            outside the projection
+        null_values: the value factory for each absent field by
+            python_arg_name, or None for required fields
+        decode_non_object: decodes json which is not an object
+    """
+    namespace: Dict[str, Any] = {
+        "new": object.__new__,
+        "bean_type": bean_type,
+        "fields": fields,
+        "missing": _missing_field,
+        "decode_non_object": decode_non_object,
+    }
+    skipped_names = {python_arg_name for python_arg_name, _ in skipped}
+    lines = [
+        "def decode_bean(obj):",
+        "    if not isinstance(obj, dict):",
+        "        return decode_non_object(obj)",
+        "    bean = new(bean_type)",
+    ]
+    for index, (python_arg_name, skipped_value) in enumerate(skipped):
+        namespace["skipped_{}".format(index)] = skipped_value
+        lines.append(
+            "    bean._{} = skipped_{}()".format(python_arg_name, index)
+        )
+    index = 0
+    for python_arg_name, field_definition in bean_metadata(
+        bean_type
+    ).fields.items():
+        if python_arg_name in skipped_names:
+            continue
+        identifier = field_definition.identifier
+        null_value = null_values[python_arg_name]
+        if null_value is None:
+            absent = "missing({!r}, obj)".format(identifier)
+        else:
+            namespace["null_{}".format(index)] = null_value
+            absent = "bean._{} = null_{}()".format(python_arg_name, index)
+        lines += [
+            "    value = obj.get({!r})".format(identifier),
+            "    if value is None:",
+            "        " + absent,
+            "    else:",
+            "        bean._{} = fields[{}][2](value)".format(
+                python_arg_name, index
+            ),
+        ]
+        index += 1
+    lines.append("    return bean")
+    exec("\n".join(lines), namespace)
+    return namespace["decode_bean"]
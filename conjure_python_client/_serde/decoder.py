@@ -23,17 +23,170 @@ from .._lib import (
     ListType,
     OptionalType,
 )
+from .._lib.metadata import bean_metadata, union_metadata
+from .compact import compact_bean_type
+from .construct import compile_bean_decoder, has_simple_init
+from .interning import bean_interner, bean_pool, interned_bean_plan
+from .iterative import (
+    BEAN,
+    DICT,
+    LEAF,
+    LIST,
+    OPTIONAL,
+    UNION,
+    DecodeNode,
+    depth_safe_plan,
+    is_recursive_type,
+)
+from .json_backend import (
+    JsonBackend,
+    JsonInput,
+    StdlibJsonBackend,
+    resolve_json_backend,
+)
+from .keys import keys_decoder
+from .lazy import RAW_JSON_ATTRIBUTE, lazy_bean_type
+from .numeric import check_numeric_array_kind, numeric_array_decoder
+from .projection import (
+    Projection,
+    ProjectionSpec,
+    current_projection,
+    parse_projection,
+)
+from .streaming import (
+    DEFAULT_CHUNK_SIZE,
+    JsonSource,
+    iter_json_array,
+    read_fully,
+)
+from collections import OrderedDict
 from typing import Optional, Type, Union, get_origin, get_args
-from typing import Dict, Any, List
+from typing import Callable, Dict, Any, IO, Iterable, Iterator, List
+from typing import NamedTuple, Tuple
 import inspect
 import json
+import sys
+import threading
 
 NoneType = type(None)
 
+DecodePlan = Callable[[Any], Any]
+
+
+class DecodeOptions(NamedTuple):
+    """Options which change how json is decoded, and hence the decode plan.
+
+    Args:
+        return_none_for_unknown_union_types: if set to True, returns None
+            instead of raising an exception when an unknown union type is
+            encountered
+        lazy: if set to True, beans decode each field from the json the first
+            time it is read instead of up front
+        projection: if set, only the selected fields of beans are decoded,
+            see parse_projection
+        numeric_arrays: if set to "array" or "numpy", lists of doubles and
+            integers are decoded into array.array or numpy arrays
+        compact: if set to True, beans are decoded into instances of a
+            subclass storing their fields in slots, see compact_bean_type
+        intern: if set to True, decoded strings are interned
+        intern_beans: if set to True, structurally equal beans within a
+            decode are decoded into a single shared instance
+    """
+
+    return_none_for_unknown_union_types: bool = False
+    lazy: bool = False
+    projection: Optional[Projection] = None
+    numeric_arrays: Optional[str] = None
+    compact: bool = False
+    intern: bool = False
+    intern_beans: bool = False
+
+
+# compiled decode plans, keyed by (decoder class, type, options). Plans are
+# only ever added, so reads are lock free; compilation happens under
+# _DECODE_PLANS_LOCK.
+_DECODE_PLANS: Dict[Tuple[Any, Any, DecodeOptions], DecodePlan] = {}
+_DECODE_PLANS_LOCK = threading.RLock()
+
+# plans with a projection, which callers may choose per decode, are kept
+# apart in an LRU cache of at most PROJECTED_PLAN_CACHE_SIZE entries,
+# guarded by _DECODE_PLANS_LOCK
+PROJECTED_PLAN_CACHE_SIZE = 256
+_PROJECTED_PLANS: "OrderedDict[Any, DecodePlan]" = OrderedDict()
+
+# the classmethods through which do_decode dispatches on the type. Decoders
+# overriding any of them decode through them rather than through plans.
+_DECODE_HOOKS = (
+    "decode_conjure_bean_type",
+    "decode_conjure_union_type",
+    "decode_conjure_enum_type",
+    "decode_dict",
+    "decode_list",
+    "decode_optional",
+    "decode_primitive",
+    "check_null_field",
+)
+
 
 class ConjureDecoder(object):
     """Decodes json into a conjure object"""
 
+    _json_backend: Optional[JsonBackend]
+    _options: DecodeOptions
+
+    def __init__(
+        self,
+        json_backend: Union[str, JsonBackend, None] = None,
+        lazy: bool = False,
+        numeric_arrays: Optional[str] = None,
+        compact: bool = False,
+        intern: bool = False,
+        intern_beans: bool = False,
+    ) -> None:
+        """
+        Args:
+            json_backend: the json backend used to parse strings, see
+                resolve_json_backend. Defaults to the global backend.
+            lazy: if set to True, decoded beans keep their json and decode
+                each field the first time its property is read. Lazy beans
+                are instances of a subclass of the requested bean type.
+            numeric_arrays: if set to "array", lists of doubles and integers
+                (e.g. time series) are decoded into compact array.array
+                values of typecode "d" and "q" instead of lists. If set to
+                "numpy", they are decoded into float64 and int64 numpy
+                arrays, which requires numpy to be installed.
+            compact: if set to True, decoded beans store their fields in
+                slots rather than in a per-instance __dict__, which halves
+                the memory of small beans on Python versions before 3.11.
+                Compact beans are instances of a subclass of the requested
+                bean type. Cannot be combined with lazy.
+            intern: if set to True, decoded strings, including map keys,
+                are interned with sys.intern, so that the many copies of
+                repeated values such as rids or tags in a large response
+                share a single string object.
+            intern_beans: if set to True, structurally equal beans within
+                a single decode are decoded into one shared instance, e.g.
+                the same file system bean repeated in each dataset. Beans
+                are shared with their lists and maps, which must then not
+                be mutated. Cannot be combined with lazy.
+        """
+        self._json_backend = None
+        if json_backend is not None:
+            self._json_backend = resolve_json_backend(json_backend)
+        if numeric_arrays is not None:
+            check_numeric_array_kind(numeric_arrays)
+        if lazy and compact:
+            raise ValueError("lazy beans cannot be compact")
+        if lazy and intern_beans:
+            raise ValueError("lazy beans cannot be interned")
+        self._options = DecodeOptions(
+            lazy=lazy,
+            numeric_arrays=numeric_arrays,
+            compact=compact,
+            intern=intern,
+            intern_beans=intern_beans,
+        )
+
     @classmethod
     def decode_conjure_bean_type(
         cls, obj, conjure_type, return_none_for_unknown_union_types=False
@@ -55,7 +208,7 @@ class ConjureDecoder(object):
         for (
             python_arg_name,
             field_definition,
-        ) in conjure_type._fields().items():
+        ) in bean_metadata(conjure_type).fields.items():
             field_identifier = field_definition.identifier
 
             if field_identifier not in obj or obj[field_identifier] is None:
@@ -74,25 +227,65 @@ class ConjureDecoder(object):
     def check_null_field(
         cls, obj, deserialized, python_arg_name, field_definition
     ):
-        type_origin = get_origin(field_definition.field_type)
-        if isinstance(field_definition.field_type, ListType):
-            deserialized[python_arg_name] = []
-        elif isinstance(field_definition.field_type, DictType):
-            deserialized[python_arg_name] = {}
-        elif isinstance(field_definition.field_type, OptionalType):
-            deserialized[python_arg_name] = None
-        elif type_origin is OptionalTypeWrapper:
-            deserialized[python_arg_name] = None
-        elif type_origin is list:
-            deserialized[python_arg_name] = []
-        elif type_origin is dict:
-            deserialized[python_arg_name] = {}
-        else:
+        null_value = cls.null_value_factory(field_definition.field_type)
+        if null_value is None:
             raise Exception(
                 "field {} not found in object {}".format(
                     field_definition.identifier, obj
                 )
             )
+        deserialized[python_arg_name] = null_value()
+
+    @classmethod
+    def null_value_factory(
+        cls, field_type: Type[DecodableType]
+    ) -> Optional[Callable[[], Any]]:
+        """Returns a factory for the value of a field of type field_type
+        which is absent or null in the json, or None if such a field
+        is required.
+        """
+        type_origin = get_origin(field_type)
+        if isinstance(field_type, ListType) or type_origin is list:
+            return list
+        elif isinstance(field_type, DictType) or type_origin is dict:
+            return dict
+        elif (
+            isinstance(field_type, OptionalType)
+            or type_origin is OptionalTypeWrapper
+        ):
+            return NoneType
+        return None
+
+    @classmethod
+    def _null_value_factory(
+        cls, field_type: Type[DecodableType], options: DecodeOptions
+    ) -> Optional[Callable[[], Any]]:
+        # absent numeric lists decode to empty arrays in numeric array mode
+        element_type = cls._numeric_element_type(field_type, options)
+        if element_type is not None and options.numeric_arrays is not None:
+            to_array = numeric_array_decoder(
+                element_type, options.numeric_arrays
+            )
+            return lambda: to_array([])
+        return cls.null_value_factory(field_type)
+
+    @classmethod
+    def _numeric_element_type(
+        cls, obj_type: Type[DecodableType], options: DecodeOptions
+    ) -> Optional[type]:
+        """Returns float or int if obj_type is a list of them which is
+        decoded into an array under options, otherwise None."""
+        if options.numeric_arrays is None:
+            return None
+        if isinstance(obj_type, ListType):
+            element_type = obj_type.item_type
+        elif get_origin(obj_type) is list:
+            element_type = get_args(obj_type)[0]
+        else:
+            return None
+        if element_type is float or element_type is int:
+            return element_type
+        return None
 
     @classmethod
     def decode_conjure_union_type(
@@ -111,12 +304,9 @@ class ConjureDecoder(object):
             An instance of type conjure_type.
         """
         type_of_union: str = obj["type"]
-        for attr, conjure_field in conjure_type._options().items():
-            if conjure_field.identifier == type_of_union:
-                attribute = attr
-                conjure_field_definition = conjure_field
-                break
-        else:
+        metadata = union_metadata(conjure_type)
+        option = metadata.option_by_identifier.get(type_of_union)
+        if option is None:
             if return_none_for_unknown_union_types:
                 return None
             else:
@@ -126,6 +316,7 @@ class ConjureDecoder(object):
                     )
                 )
 
+        attribute, conjure_field_definition = option
         deserialized: Dict[str, Any] = {}
         if type_of_union not in obj or obj[type_of_union] is None:
             cls.check_null_field(
@@ -138,11 +329,8 @@ class ConjureDecoder(object):
                 value, field_type, return_none_for_unknown_union_types
             )
 
-        # for backwards compatibility with conjure-python,
-        # only pass in arg type_of_union if it is expected
-        param_dict = inspect.signature(conjure_type.__init__).parameters
-        if 'type_of_union' in param_dict:
-            deserialized['type_of_union'] = type_of_union
+        if metadata.accepts_type_of_union:
+            deserialized["type_of_union"] = type_of_union
         return conjure_type(**deserialized)
 
     @classmethod
@@ -330,6 +518,10 @@ class ConjureDecoder(object):
     ) -> Any:
         """Decodes json into the specified type
 
+        Decodes with the cached plan for the type, unless the class
+        overrides one of the decode_* hooks, in which case it dispatches to
+        the hooks on each call.
+
         Args:
             obj: the json object to decode
             obj_type: a class object which is the type we're decoding into.
@@ -337,7 +529,17 @@ class ConjureDecoder(object):
                 instead of raising an exception when an unknown union type is
                 encountered
         """
+        return cls.plan_for(
+            obj_type, DecodeOptions(return_none_for_unknown_union_types)
+        )(obj)
 
+    @classmethod
+    def _decode_with_hooks(
+        cls,
+        obj: Any,
+        obj_type: Type[DecodableType],
+        return_none_for_unknown_union_types: bool = False,
+    ) -> Any:
         type_origin = get_origin(obj_type)
         type_args = get_args(obj_type)
 
@@ -394,23 +596,969 @@ class ConjureDecoder(object):
 
         return cls.decode_primitive(obj, obj_type)
 
+    @classmethod
+    def _overrides_decode_hooks(cls) -> bool:
+        overriding = cls.__mro__[: cls.__mro__.index(ConjureDecoder)]
+        return any(
+            name in vars(subclass)
+            for subclass in overriding
+            for name in _DECODE_HOOKS
+        )
+
+    @classmethod
+    def decode_plan(
+        cls,
+        obj_type: Type[DecodableType],
+        return_none_for_unknown_union_types: bool = False,
+    ) -> DecodePlan:
+        """Returns a function which decodes json into the specified type.
+
+        The type is inspected once and the resulting plan is cached, so
+        repeated decodes of the same type skip the type dispatch entirely.
+        Plans for recursive types, such as trees of beans, decode json of
+        any depth without hitting the recursion limit.
+
+        Args:
+            obj_type: a class object which is the type we're decoding into.
+            return_none_for_unknown_union_types: if set to True, the plan
+                returns None instead of raising an exception when an unknown
+                union type is encountered
+        """
+        return cls.plan_for(
+            obj_type, DecodeOptions(return_none_for_unknown_union_types)
+        )
+
+    @classmethod
+    def plan_for(
+        cls, obj_type: Type[DecodableType], options: DecodeOptions
+    ) -> DecodePlan:
+        """Returns the cached decode plan for a type and decode options."""
+        key = (cls, obj_type, options)
+        try:
+            return _DECODE_PLANS[key]
+        except KeyError:
+            pass
+        except TypeError:
+            # unhashable type descriptors cannot be cached
+            return cls._compile_entry_plan(obj_type, options, {})
+
+        if options.projection is not None:
+            return cls._projected_plan_for(obj_type, options)
+
+        with _DECODE_PLANS_LOCK:
+            plan = _DECODE_PLANS.get(key)
+            if plan is None:
+                # plans are published only once fully compiled, so that
+                # other threads never observe a partially built bean plan
+                compiled: Dict[Any, DecodePlan] = {}
+                plan = cls._compile_entry_plan(obj_type, options, compiled)
+                _DECODE_PLANS.update(compiled)
+                _DECODE_PLANS[key] = plan
+            return plan
+
+    @classmethod
+    def _projected_plan_for(
+        cls, obj_type: Type[DecodableType], options: DecodeOptions
+    ) -> DecodePlan:
+        key = (cls, obj_type, options)
+        with _DECODE_PLANS_LOCK:
+            plan = _PROJECTED_PLANS.get(key)
+            if plan is not None:
+                _PROJECTED_PLANS.move_to_end(key)
+                return plan
+            compiled: Dict[Any, DecodePlan] = {}
+            plan = cls._compile_entry_plan(obj_type, options, compiled)
+            # the plans of fields decoded in full are shared as usual
+            _DECODE_PLANS.update(
+                (compiled_key, compiled_plan)
+                for compiled_key, compiled_plan in compiled.items()
+                if compiled_key[2].projection is None
+            )
+            _PROJECTED_PLANS[key] = plan
+            if len(_PROJECTED_PLANS) > PROJECTED_PLAN_CACHE_SIZE:
+                _PROJECTED_PLANS.popitem(last=False)
+            return plan
+
+    @classmethod
+    def _compile_entry_plan(
+        cls,
+        obj_type: Type[DecodableType],
+        options: DecodeOptions,
+        compiled: Dict[Any, DecodePlan],
+    ) -> DecodePlan:
+        if cls._overrides_decode_hooks():
+            # plans would bypass the overridden hooks
+            return_none = options.return_none_for_unknown_union_types
+
+            def decode_with_hooks(obj):
+                return cls._decode_with_hooks(obj, obj_type, return_none)
+
+            return decode_with_hooks
+        plan = cls._compile_plan(obj_type, options, compiled)
+        if options.lazy or not is_recursive_type(obj_type):
+            return plan
+        # the json of recursive types may be too deep for the nested plans,
+        # in which case it is decoded with an explicit stack instead
+        return depth_safe_plan(
+            plan, cls._decode_node(obj_type, options, {}, compiled)
+        )
+
+    @classmethod
+    def _compile_plan(
+        cls,
+        obj_type: Type[DecodableType],
+        options: DecodeOptions,
+        compiled: Dict[Any, DecodePlan],
+    ) -> DecodePlan:
+        key: Optional[Tuple[Any, Any, DecodeOptions]] = None
+        try:
+            hash(obj_type)
+            key = (cls, obj_type, options)
+        except TypeError:
+            pass
+        if key is not None:
+            plan = _DECODE_PLANS.get(key) or compiled.get(key)
+            if plan is not None:
+                return plan
+
+        def compile_nested(nested_type, nested_options=options):
+            return cls._compile_plan(nested_type, nested_options, compiled)
+
+        type_origin = get_origin(obj_type)
+        type_args = get_args(obj_type)
+
+        if inspect.isclass(obj_type) and issubclass(obj_type, ConjureBeanType):
+            # registered before its fields are compiled to support
+            # recursive types
+            fields: List[Tuple[str, str, DecodePlan, Any]] = []
+            metadata = bean_metadata(obj_type)
+            projection = cls._bean_projection(obj_type, options.projection)
+            # fields outside the projection are set to their empty value
+            skipped: List[Tuple[str, Callable[[], Any]]] = []
+            for python_arg_name, field_definition in metadata.fields.items():
+                if (
+                    projection is not None
+                    and field_definition.identifier not in projection
+                ):
+                    null_value = cls._null_value_factory(
+                        field_definition.field_type, options
+                    )
+                    skipped.append((python_arg_name, null_value or NoneType))
+            null_values = {
+                python_arg_name: cls._null_value_factory(
+                    field_definition.field_type, options
+                )
+                for python_arg_name, field_definition in (
+                    metadata.fields.items()
+                )
+            }
+            if options.lazy:
+                plan = cls._lazy_bean_plan(
+                    obj_type, fields, skipped, null_values
+                )
+            else:
+                bean_type = obj_type
+                if options.compact:
+                    bean_type = compact_bean_type(obj_type)
+                plan = cls._bean_plan(
+                    bean_type,
+                    fields,
+                    skipped,
+                    null_values,
+                    cls._non_object_bean_plan(bean_type, options),
+                )
+                if options.intern_beans:
+                    plan = interned_bean_plan(bean_type, plan)
+            if key is not None:
+                compiled[key] = plan
+            for python_arg_name, field_definition in metadata.fields.items():
+                nested_options = options
+                if projection is not None:
+                    # lazy beans index their fields positionally, so skipped
+                    # fields keep a (never used) plan
+                    if field_definition.identifier not in projection:
+                        if not options.lazy:
+                            continue
+                        nested_projection = None
+                    else:
+                        nested_projection = projection[
+                            field_definition.identifier
+                        ]
+                    nested_options = options._replace(
+                        projection=nested_projection
+                    )
+                fields.append(
+                    (
+                        python_arg_name,
+                        field_definition.identifier,
+                        compile_nested(
+                            field_definition.field_type, nested_options
+                        ),
+                        field_definition,
+                    )
+                )
+            return plan
+
+        elif inspect.isclass(obj_type) and issubclass(
+            obj_type, ConjureUnionType
+        ):
+            variants: Dict[str, Tuple[str, DecodePlan, Any]] = {}
+            plan = cls._union_plan(
+                obj_type,
+                variants,
+                options.return_none_for_unknown_union_types,
+            )
+            if key is not None:
+                compiled[key] = plan
+            union_options = union_metadata(obj_type).option_by_identifier
+            # a projection on a union selects within its members
+            member_projections = dict(options.projection or ())
+            for identifier, (
+                attribute,
+                field_definition,
+            ) in union_options.items():
+                member_options = options._replace(
+                    projection=member_projections.get(identifier)
+                )
+                decode_member = compile_nested(
+                    field_definition.field_type, member_options
+                )
+                variants[identifier] = (
+                    attribute,
+                    decode_member,
+                    field_definition,
+                )
+            return plan
+
+        elif inspect.isclass(obj_type) and issubclass(
+            obj_type, ConjureEnumType
+        ):
+            plan = cls._enum_plan(obj_type)
+
+        elif isinstance(obj_type, DictType):
+            plan = cls._dict_plan(
+                obj_type.key_type,
+                compile_nested(obj_type.key_type),
+                compile_nested(obj_type.value_type),
+                obj_type.value_type,
+                options.intern,
+            )
+
+        elif cls._numeric_element_type(obj_type, options) is not None:
+            plan = cls._numeric_array_plan(
+                cls._numeric_element_type(obj_type, options),
+                options.numeric_arrays,
+            )
+
+        elif isinstance(obj_type, ListType):
+            plan = cls._list_plan(
+                compile_nested(obj_type.item_type),
+                obj_type.item_type,
+                options.intern,
+            )
+
+        elif isinstance(obj_type, OptionalType):
+            plan = cls._optional_plan(compile_nested(obj_type.item_type))
+
+        elif type_origin is OptionalTypeWrapper:
+            plan = cls._optional_plan(compile_nested(type_args[0]))
+
+        elif type_origin is dict:
+            (key_type, value_type) = type_args
+            plan = cls._dict_plan(
+                key_type,
+                compile_nested(key_type),
+                compile_nested(value_type),
+                value_type,
+                options.intern,
+            )
+
+        elif type_origin is list:
+            plan = cls._list_plan(
+                compile_nested(type_args[0]), type_args[0], options.intern
+            )
+
+        else:
+            plan = cls._primitive_plan(obj_type, options.intern)
+
+        if key is not None:
+            compiled[key] = plan
+        return plan
+
+    @classmethod
+    def _decode_node(
+        cls,
+        obj_type: Type[DecodableType],
+        options: DecodeOptions,
+        nodes: Dict[Any, DecodeNode],
+        compiled: Dict[Any, DecodePlan],
+    ) -> DecodeNode:
+        if not is_recursive_type(obj_type):
+            return cls._leaf_node(obj_type, options, compiled)
+        key: Optional[Tuple[Any, DecodeOptions]] = None
+        try:
+            hash(obj_type)
+            key = (obj_type, options)
+        except TypeError:
+            pass
+        if key is not None:
+            node = nodes.get(key)
+            if node is not None:
+                return node
+
+        def nested_node(nested_type, nested_options=options):
+            return cls._decode_node(
+                nested_type, nested_options, nodes, compiled
+            )
+
+        type_origin = get_origin(obj_type)
+        type_args = get_args(obj_type)
+
+        if inspect.isclass(obj_type) and issubclass(obj_type, ConjureBeanType):
+            bean_type: Any = obj_type
+            if options.compact:
+                bean_type = compact_bean_type(obj_type)
+            intern_bean = bean_interner(bean_type)
+
+            def build_bean(values):
+                return bean_type(**values)
+
+            def build_interned_bean(values):
+                return intern_bean(bean_type(**values))
+
+            fields: List[Any] = []
+            skipped: List[Tuple[str, Callable[[], Any]]] = []
+            node = [
+                BEAN,
+                bean_type,
+                fields,
+                skipped,
+                build_interned_bean if options.intern_beans else build_bean,
+                cls._non_object_bean_plan(bean_type, options),
+            ]
+            if key is not None:
+                nodes[key] = node
+            projection = cls._bean_projection(obj_type, options.projection)
+            for python_arg_name, field_definition in bean_metadata(
+                obj_type
+            ).fields.items():
+                null_value = cls._null_value_factory(
+                    field_definition.field_type, options
+                )
+                nested_options = options
+                if projection is not None:
+                    if field_definition.identifier not in projection:
+                        skipped.append(
+                            (python_arg_name, null_value or NoneType)
+                        )
+                        continue
+                    nested_options = options._replace(
+                        projection=projection[field_definition.identifier]
+                    )
+                fields.append(
+                    (
+                        python_arg_name,
+                        field_definition.identifier,
+                        nested_node(
+                            field_definition.field_type, nested_options
+                        ),
+                        null_value,
+                    )
+                )
+            return node
+
+        elif inspect.isclass(obj_type) and issubclass(
+            obj_type, ConjureUnionType
+        ):
+            variants: Dict[str, Tuple[str, DecodeNode, Any]] = {}
+
+            def build_union(values):
+                return obj_type(**values)
+
+            node = [
+                UNION,
+                obj_type,
+                variants,
+                options.return_none_for_unknown_union_types,
+                cls.check_null_field,
+                build_union,
+            ]
+            if key is not None:
+                nodes[key] = node
+            member_projections = dict(options.projection or ())
+            for identifier, (attribute, field_definition) in union_metadata(
+                obj_type
+            ).option_by_identifier.items():
+                member_options = options._replace(
+                    projection=member_projections.get(identifier)
+                )
+                variants[identifier] = (
+                    attribute,
+                    nested_node(field_definition.field_type, member_options),
+                    field_definition,
+                )
+            return node
+
+        elif isinstance(obj_type, DictType) or type_origin is dict:
+            if isinstance(obj_type, DictType):
+                key_type, value_type = obj_type.key_type, obj_type.value_type
+            else:
+                (key_type, value_type) = type_args
+            node = (
+                DICT,
+                keys_decoder(
+                    key_type, cls._compile_plan(key_type, options, compiled)
+                ),
+                nested_node(value_type),
+            )
+
+        elif isinstance(obj_type, ListType):
+            node = (LIST, nested_node(obj_type.item_type))
+
+        elif type_origin is list:
+            node = (LIST, nested_node(type_args[0]))
+
+        elif isinstance(obj_type, OptionalType):
+            node = (OPTIONAL, nested_node(obj_type.item_type))
+
+        elif type_origin is OptionalTypeWrapper:
+            node = (OPTIONAL, nested_node(type_args[0]))
+
+        else:
+            node = cls._leaf_node(obj_type, options, compiled)
+
+        if key is not None:
+            nodes[key] = node
+        return node
+
+    @classmethod
+    def _leaf_node(
+        cls,
+        obj_type: Type[DecodableType],
+        options: DecodeOptions,
+        compiled: Dict[Any, DecodePlan],
+    ) -> DecodeNode:
+        return (LEAF, cls._compile_plan(obj_type, options, compiled))
+
+    @classmethod
+    def _bean_projection(
+        cls, conjure_type, projection: Optional[Projection]
+    ) -> Optional[Dict[str, Optional[Projection]]]:
+        if projection is None:
+            return None
+        selected = dict(projection)
+        unknown = set(selected) - set(
+            bean_metadata(conjure_type).attribute_by_identifier
+        )
+        if unknown:
+            raise ValueError(
+                "unknown fields {} in projection for {}".format(
+                    sorted(unknown), conjure_type
+                )
+            )
+        return selected
+
+    @classmethod
+    def _non_object_bean_plan(
+        cls, conjure_type, options: DecodeOptions
+    ) -> DecodePlan:
+        # json other than an object is checked field by field as it always
+        # was, so that it fails with the same errors
+        return_none = options.return_none_for_unknown_union_types
+
+        def decode_non_object(obj):
+            return cls.decode_conjure_bean_type(obj, conjure_type, return_none)
+
+        return decode_non_object
+
+    @classmethod
+    def _bean_plan(
+        cls, conjure_type, fields, skipped, null_values, decode_non_object
+    ) -> DecodePlan:
+        if has_simple_init(conjure_type):
+            # assigns the private attributes directly
+            return compile_bean_decoder(
+                conjure_type, fields, skipped, null_values, decode_non_object
+            )
+
+        def decode_bean(obj):
+            if not isinstance(obj, dict):
+                return decode_non_object(obj)
+            deserialized: Dict[str, Any] = {}
+            for python_arg_name, null_value in skipped:
+                deserialized[python_arg_name] = null_value()
+            for python_arg_name, identifier, decode_field, field_def in fields:
+                value = obj.get(identifier)
+                if value is None:
+                    null_value = null_values[python_arg_name]
+                    if null_value is None:
+                        raise Exception(
+                            "field {} not found in object {}".format(
+                                identifier, obj
+                            )
+                        )
+                    deserialized[python_arg_name] = null_value()
+                else:
+                    deserialized[python_arg_name] = decode_field(value)
+            return conjure_type(**deserialized)
+
+        return decode_bean
+
+    @classmethod
+    def _lazy_bean_plan(
+        cls, conjure_type, fields, skipped, null_values
+    ) -> DecodePlan:
+        metadata = bean_metadata(conjure_type)
+        skipped_names = {python_arg_name for python_arg_name, _ in skipped}
+        required_identifiers = [
+            field_definition.identifier
+            for python_arg_name, field_definition in metadata.fields.items()
+            if null_values[python_arg_name] is None
+            and python_arg_name not in skipped_names
+        ]
+        skipped_attributes = [
+            ("_" + python_arg_name, null_value)
+            for python_arg_name, null_value in skipped
+        ]
+        lazy_type = lazy_bean_type(
+            conjure_type, fields, list(null_values.values())
+        )
+        new_bean = object.__new__
+
+        def decode_lazy_bean(obj):
+            if not isinstance(obj, dict):
+                raise Exception("expected a python dict")
+            for identifier in required_identifiers:
+                if obj.get(identifier) is None:
+                    raise Exception(
+                        "field {} not found in object {}".format(
+                            identifier, obj
+                        )
+                    )
+            bean: Any = new_bean(lazy_type)
+            attributes = bean.__dict__
+            attributes[RAW_JSON_ATTRIBUTE] = obj
+            for private_name, null_value in skipped_attributes:
+                attributes[private_name] = null_value()
+            return bean
+
+        return decode_lazy_bean
+
+    @classmethod
+    def _union_plan(
+        cls, conjure_type, variants, return_none_for_unknown_union_types
+    ) -> DecodePlan:
+        pass_type_of_union = union_metadata(conjure_type).accepts_type_of_union
+
+        def decode_union(obj):
+            type_of_union = obj["type"]
+            variant = variants.get(type_of_union)
+            if variant is None:
+                if return_none_for_unknown_union_types:
+                    return None
+                raise ValueError(
+                    "unknown union type {0} for {1}".format(
+                        type_of_union, conjure_type
+                    )
+                )
+
+            attribute, decode_value, field_definition = variant
+            deserialized: Dict[str, Any] = {}
+            value = obj.get(type_of_union)
+            if value is None:
+                cls.check_null_field(
+                    obj, deserialized, attribute, field_definition
+                )
+            else:
+                deserialized[attribute] = decode_value(value)
+            if pass_type_of_union:
+                deserialized["type_of_union"] = type_of_union
+            return conjure_type(**deserialized)
+
+        return decode_union
+
+    @classmethod
+    def _enum_plan(cls, conjure_type) -> DecodePlan:
+        members = conjure_type.__members__
+
+        def decode_enum(obj):
+            if not isinstance(obj, str):
+                raise Exception(
+                    "Expected to find str type but found {} instead".format(
+                        type(obj)
+                    )
+                )
+            member = members.get(obj)
+            if member is None:
+                return conjure_type["UNKNOWN"]
+            return member
+
+        return decode_enum
+
+    @classmethod
+    def _exact_primitive_types(cls, object_type) -> Optional[frozenset]:
+        """Returns the exact types of the json values which decode to
+        themselves as object_type, or None if object_type is not such a
+        primitive."""
+        if (
+            object_type is str
+            or object_type is BinaryType
+            or isinstance(object_type, BinaryType)
+        ):
+            return frozenset((str,))
+        elif object_type is int:
+            return frozenset((int, bool))
+        elif object_type is bool:
+            return frozenset((bool,))
+        return None
+
+    @classmethod
+    def _dict_plan(
+        cls, key_type, decode_key, decode_value, value_type=None, intern=False
+    ) -> DecodePlan:
+        if not (
+            key_type is str
+            or isinstance(key_type, BinaryType)
+            or key_type is BinaryType
+        ):
+            # enum keys and json encoded keys
+            return cls._keyed_dict_plan(
+                keys_decoder(key_type, decode_key),
+                decode_value,
+                value_type,
+                intern,
+            )
+
+        def decode_dict(obj):
+            if not isinstance(obj, dict):
+                raise Exception("expected a python dict")
+            return {
+                decode_key(key): decode_value(value)
+                for key, value in obj.items()
+            }
+
+        # bulk paths for maps from strings to primitives: type check all
+        # keys and values in one pass with map(type, ...) and only fall
+        # back to decoding each entry, which raises the usual error,
+        # if the check fails
+        key_types = frozenset((str,))
+        if value_type is float:
+
+            def decode_float_dict(obj):
+                if isinstance(obj, dict) and key_types.issuperset(
+                    map(type, obj)
+                ):
+                    keys = map(sys.intern, obj) if intern else obj
+                    return dict(zip(keys, map(float, obj.values())))
+                return decode_dict(obj)
+
+            return decode_float_dict
+
+        value_types = cls._exact_primitive_types(value_type)
+        if value_types is not None:
+            intern_values = intern and value_types == key_types
+
+            def decode_primitive_dict(obj):
+                if (
+                    isinstance(obj, dict)
+                    and key_types.issuperset(map(type, obj))
+                    and value_types.issuperset(map(type, obj.values()))
+                ):
+                    if not intern:
+                        return dict(obj)
+                    keys = map(sys.intern, obj)
+                    if intern_values:
+                        return dict(zip(keys, map(sys.intern, obj.values())))
+                    return dict(zip(keys, obj.values()))
+                return decode_dict(obj)
+
+            return decode_primitive_dict
+
+        return decode_dict
+
+    @classmethod
+    def _keyed_dict_plan(
+        cls, decode_keys, decode_value, value_type, intern
+    ) -> DecodePlan:
+        """Returns a plan for maps whose keys are not plain strings, which
+        decodes all keys at once with decode_keys, see keys_decoder."""
+        value_types = None
+        if not intern:
+            value_types = cls._exact_primitive_types(value_type)
+
+        def decode_keyed_dict(obj):
+            if not isinstance(obj, dict):
+                raise Exception("expected a python dict")
+            values: Iterable[Any] = obj.values()
+            if value_type is float:
+                values = map(float, values)
+            elif value_types is None or not value_types.issuperset(
+                map(type, values)
+            ):
+                values = map(decode_value, values)
+            return dict(zip(decode_keys(obj), values))
+
+        return decode_keyed_dict
+
+    @classmethod
+    def _list_plan(
+        cls, decode_element, element_type=None, intern=False
+    ) -> DecodePlan:
+        def decode_list(obj):
+            if not isinstance(obj, list):
+                raise Exception("expected a python list")
+            return [decode_element(element) for element in obj]
+
+        # bulk paths for lists of primitives, see _dict_plan
+        if element_type is float:
+
+            def decode_float_list(obj):
+                if not isinstance(obj, list):
+                    raise Exception("expected a python list")
+                # float() also parses the "NaN"/"Infinity" strings
+                return list(map(float, obj))
+
+            return decode_float_list
+
+        element_types = cls._exact_primitive_types(element_type)
+        if element_types is not None:
+            intern_elements = intern and element_types == frozenset((str,))
+
+            def decode_primitive_list(obj):
+                if isinstance(obj, list) and element_types.issuperset(
+                    map(type, obj)
+                ):
+                    if intern_elements:
+                        return list(map(sys.intern, obj))
+                    return obj[:]
+                return decode_list(obj)
+
+            return decode_primitive_list
+
+        return decode_list
+
+    @classmethod
+    def _numeric_array_plan(cls, element_type, kind) -> DecodePlan:
+        to_array = numeric_array_decoder(element_type, kind)
+
+        def decode_numeric_array(obj):
+            if not isinstance(obj, list):
+                raise Exception("expected a python list")
+            return to_array(obj)
+
+        return decode_numeric_array
+
+    @classmethod
+    def _optional_plan(cls, decode_item) -> DecodePlan:
+        def decode_optional(obj):
+            if obj is None:
+                return None
+            return decode_item(obj)
+
+        return decode_optional
+
+    @classmethod
+    def _primitive_plan(cls, object_type, intern=False) -> DecodePlan:
+        if object_type is float:
+            return float
+
+        if (
+            object_type is str
+            or object_type is BinaryType
+            or isinstance(object_type, BinaryType)
+        ):
+            expected_type: Any = str
+        else:
+            expected_type = object_type
+
+        def decode_primitive(obj):
+            if not isinstance(obj, expected_type):
+                raise Exception(
+                    "Expected to find {} type but found {} instead".format(
+                        object_type, type(obj)
+                    )
+                )
+            return obj
+
+        if intern and expected_type is str:
+
+            def decode_interned_string(obj):
+                if type(obj) is str:
+                    return sys.intern(obj)
+                return decode_primitive(obj)
+
+            return decode_interned_string
+
+        return decode_primitive
+
     def decode(
         self,
         obj: Any,
         obj_type: Type[DecodableType],
         return_none_for_unknown_union_types: bool = False,
+        projection: ProjectionSpec = None,
     ) -> Any:
-        return self.do_decode(
-            obj, obj_type, return_none_for_unknown_union_types
+        """Decodes json into the specified type
+
+        Args:
+            obj: the json object to decode
+            obj_type: a class object which is the type we're decoding into.
+            return_none_for_unknown_union_types: if set to True, returns None
+                instead of raising an exception when an unknown union type is
+                encountered
+            projection: the field paths to decode, see parse_projection.
+                Other fields are set to their empty value. Defaults to the
+                projection of the enclosing decode_projection context.
+        """
+        plan = self._plan_for_instance(
+            obj_type, return_none_for_unknown_union_types, projection
+        )
+        if not self._options.intern_beans:
+            return plan(obj)
+        with bean_pool():
+            return plan(obj)
+
+    def _plan_for_instance(
+        self,
+        obj_type: Type[DecodableType],
+        return_none_for_unknown_union_types: bool,
+        projection: ProjectionSpec,
+    ) -> DecodePlan:
+        parsed_projection = (
+            current_projection()
+            if projection is None
+            else parse_projection(projection)
         )
+        options = self._options
+        if (
+            return_none_for_unknown_union_types
+            != options.return_none_for_unknown_union_types
+            or parsed_projection is not None
+        ):
+            options = options._replace(
+                return_none_for_unknown_union_types=(
+                    return_none_for_unknown_union_types
+                ),
+                projection=parsed_projection,
+            )
+        return self.plan_for(obj_type, options)
 
     def read_from_string(
         self,
-        string_value: str,
+        string_value: JsonInput,
         obj_type: Type[DecodableType],
         return_none_for_unknown_union_types: bool = False,
+        projection: ProjectionSpec = None,
     ) -> Any:
-        deserialized = json.loads(string_value)
+        """Parses and decodes json, given either as a str or as utf-8 encoded
+        bytes, bytearray or memoryview. Bytes-like values are handed to the
+        json backend without first being decoded into a str.
+        """
+        deserialized = resolve_json_backend(self._json_backend).loads(
+            string_value
+        )
         return self.decode(
-            deserialized, obj_type, return_none_for_unknown_union_types
+            deserialized,
+            obj_type,
+            return_none_for_unknown_union_types,
+            projection,
+        )
+
+    def read_from_stream(
+        self,
+        stream: IO[bytes],
+        obj_type: Type[DecodableType],
+        return_none_for_unknown_union_types: bool = False,
+        content_length: Optional[int] = None,
+        projection: ProjectionSpec = None,
+    ) -> Any:
+        """Reads a binary stream to its end and decodes its json content.
+
+        Lists parsed by the standard library json backend are parsed from
+        the stream a chunk at a time, one element after the other, so that
+        neither the whole body nor its text is held in memory at once.
+
+        Args:
+            stream: the stream to read, e.g. the ``raw`` stream of a response
+                requested with ``stream=True``.
+            obj_type: a class object which is the type we're decoding into.
+            return_none_for_unknown_union_types: if set to True, returns None
+                instead of raising an exception when an unknown union type is
+                encountered
+            content_length: the size of the body if known, typically the
+                Content-Length header, used to preallocate the read buffer
+            projection: the field paths to decode, see decode
+        """
+        element_type = self._streamed_element_type(obj_type)
+        if element_type is not None:
+            decode_element = self._plan_for_instance(
+                element_type, return_none_for_unknown_union_types, projection
+            )
+            if not self._options.intern_beans:
+                return list(map(decode_element, iter_json_array(stream)))
+            with bean_pool():
+                return list(map(decode_element, iter_json_array(stream)))
+        return self.read_from_string(
+            read_fully(stream, content_length),
+            obj_type,
+            return_none_for_unknown_union_types,
+            projection,
+        )
+
+    def _streamed_element_type(
+        self, obj_type: Type[DecodableType]
+    ) -> Optional[Type[DecodableType]]:
+        # the element type of lists which read_from_stream parses
+        # incrementally. Other backends parse bytes without decoding them
+        # into text first, and numeric arrays and overridden decode_list
+        # hooks take whole lists.
+        backend = resolve_json_backend(self._json_backend)
+        if (
+            not isinstance(backend, StdlibJsonBackend)
+            or self._numeric_element_type(obj_type, self._options)
+            is not None
+            or self._overrides_decode_hooks()
+        ):
+            return None
+        if isinstance(obj_type, ListType):
+            return obj_type.item_type
+        if get_origin(obj_type) is list:
+            return get_args(obj_type)[0]
+        return None
+
+    def iter_decode_list(
+        self,
+        source: JsonSource,
+        element_type: Type[DecodableType],
+        return_none_for_unknown_union_types: bool = False,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        projection: ProjectionSpec = None,
+    ) -> Iterator[Any]:
+        """Incrementally decodes a json list, yielding its elements one at
+        a time so that only a single element is materialised at once.
+
+        Args:
+            source: the json text, either as a str, as utf-8 encoded bytes
+                or as a readable stream of either, e.g. the ``raw`` stream
+                of a response requested with ``stream=True``.
+            element_type: a class object which is the conjure type of
+                the elements in the list.
+            return_none_for_unknown_union_types: if set to True, yields None
+                instead of raising an exception when an unknown union type
+                is encountered
+            chunk_size: the number of bytes or characters to read at a time
+            projection: the field paths to decode within each element, see
+                decode
+        """
+        decode_element = self._plan_for_instance(
+            element_type, return_none_for_unknown_union_types, projection
         )
+        intern_beans = self._options.intern_beans
+        for element in iter_json_array(source, chunk_size):
+            if not intern_beans:
+                yield decode_element(element)
+                continue
+            # a pool per element, which must not outlive it
+            with bean_pool():
+                value = decode_element(element)
+            yield value
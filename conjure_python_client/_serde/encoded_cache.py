@@ -0,0 +1,93 @@
+# (c) Copyright 2026 Palantir Technologies Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+import threading
+
+
+class EncodedCache(object):
+    """A bounded LRU cache of the json encoding of bean instances, see
+    ConjureEncoder.cache_encoded.
+
+    Entries are keyed by identity and hold a reference to their bean, so a
+    cached bean is never garbage collected while it is cached, and its id
+    cannot be reused by another object. Beans are immutable, but lists and
+    maps held by a bean are not: a cached bean must not have its
+    collections mutated, or the stale encoding is sent.
+
+    Args:
+        max_entries: the maximum number of cached beans
+        max_bytes: if set, the maximum total size of the cached encodings.
+            Encodings larger than this are never cached.
+    """
+
+    def __init__(
+        self, max_entries: int = 1024, max_bytes: Optional[int] = None
+    ) -> None:
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._entries: "OrderedDict[int, Tuple[Any, bytes]]" = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, obj: Any) -> Optional[bytes]:
+        """Returns the cached encoding of obj, or None."""
+        key = id(obj)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] is not obj:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, obj: Any, encoded: bytes) -> None:
+        """Caches the encoding of obj, evicting the least recently used
+        encodings if the cache is full."""
+        if self._max_bytes is not None and len(encoded) > self._max_bytes:
+            return
+        key = id(obj)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._size -= len(previous[1])
+            self._entries[key] = (obj, encoded)
+            self._size += len(encoded)
+            while len(self._entries) > self._max_entries or (
+                self._max_bytes is not None and self._size > self._max_bytes
+            ):
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    @property
+    def size(self) -> int:
+        """The total size in bytes of the cached encodings."""
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        return "EncodedCache(entries={}, bytes={}, hits={}, misses={})".format(
+            len(self), self._size, self.hits, self.misses
+        )
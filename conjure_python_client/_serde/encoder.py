@@ -13,9 +13,44 @@
 # limitations under the License.
 
 from .._lib import ConjureBeanType, ConjureUnionType, ConjureEnumType
-from math import isnan, isinf
-from typing import Dict, Any
+from .._lib.metadata import bean_metadata, union_metadata
+from .encoded_cache import EncodedCache
+from .json_backend import JsonBackend, resolve_json_backend
+from .numeric import encode_numeric_array, is_numeric_array_type
+from .streaming import DEFAULT_CHUNK_SIZE
+from json.encoder import encode_basestring_ascii
+from math import isfinite, isnan, isinf
+from operator import attrgetter
+from typing import Callable, Dict, Any, Iterable, Iterator, Optional, Tuple
+from typing import Union
 import json
+import threading
+
+EncodePlan = Callable[[Any], Any]
+WritePlan = Callable[[Any, bytearray], None]
+
+# compiled encode plans, keyed by (encoder class, class of the encoded
+# value). Plans are only ever added, so reads are lock free.
+_ENCODE_PLANS: Dict[Tuple[type, type], EncodePlan] = {}
+_ENCODE_PLANS_LOCK = threading.Lock()
+
+# plans behind the default encode_conjure_bean_type and
+# encode_conjure_union_type, keyed like _ENCODE_PLANS
+_MEMBER_PLANS: Dict[Tuple[type, type], EncodePlan] = {}
+
+# compiled write plans, see ConjureEncoder.write_to_buffer
+_WRITE_PLANS: Dict[Tuple[type, type], WritePlan] = {}
+
+# caches registered with ConjureEncoder.cache_encoded, keyed by (encoder
+# class, bean class)
+_ENCODED_CACHES: Dict[Tuple[type, type], EncodedCache] = {}
+
+
+_PASSTHROUGH_TYPES = frozenset((str, int, bool, type(None)))
+
+
+def _identity(obj: Any) -> Any:
+    return obj
 
 
 class ConjureEncoder(json.JSONEncoder):
@@ -24,33 +59,12 @@ class ConjureEncoder(json.JSONEncoder):
     @classmethod
     def encode_conjure_bean_type(cls, obj: ConjureBeanType) -> Any:
         """Encodes a conjure bean into json"""
-        encoded: Dict[str, Any] = {}
-        for attribute_name, field_definition in obj._fields().items():
-            encoded[field_definition.identifier] = cls.do_encode(
-                getattr(obj, attribute_name)
-            )
-        return encoded
+        return cls._member_plan(obj.__class__)(obj)
 
     @classmethod
     def encode_conjure_union_type(cls, obj: ConjureUnionType) -> Any:
         """Encodes a conjure union into json"""
-        encoded: Dict[str, Any] = {}
-        encoded["type"] = obj.type
-        for attr, field_definition in obj._options().items():
-            if field_definition.identifier == obj.type:
-                attribute = attr
-                break
-        else:
-            raise ValueError(
-                "could not find attribute for union "
-                + "member {0} of type {1}".format(obj.type, obj.__class__)
-            )
-
-        defined_field_definition = obj._options()[attribute]
-        encoded[defined_field_definition.identifier] = cls.do_encode(
-            getattr(obj, attribute)
-        )
-        return encoded
+        return cls._member_plan(obj.__class__)(obj)
 
     @classmethod
     def encode_primitive(cls, obj: Any) -> Any:
@@ -63,26 +77,506 @@ class ConjureEncoder(json.JSONEncoder):
     @classmethod
     def do_encode(cls, obj: Any) -> Any:
         """Encodes the passed object into json"""
-        if isinstance(obj, ConjureBeanType):
-            return cls.encode_conjure_bean_type(obj)
+        plan = _ENCODE_PLANS.get((cls, obj.__class__))
+        if plan is None:
+            plan = cls.encode_plan(obj.__class__)
+        return plan(obj)
+
+    @classmethod
+    def encode_plan(cls, obj_type: type) -> EncodePlan:
+        """Returns a function which encodes instances of obj_type into json.
+
+        The class is inspected once and the resulting plan is cached, so
+        that encoding e.g. a list of beans walks the bean's fields without
+        looking up its metadata again for every bean.
+        """
+        key = (cls, obj_type)
+        plan = _ENCODE_PLANS.get(key)
+        if plan is None:
+            with _ENCODE_PLANS_LOCK:
+                plan = _ENCODE_PLANS.get(key)
+                if plan is None:
+                    plan = cls._compile_encode_plan(obj_type)
+                    _ENCODE_PLANS[key] = plan
+        return plan
+
+    @classmethod
+    def _member_plan(cls, obj_type: type) -> EncodePlan:
+        key = (cls, obj_type)
+        plan = _MEMBER_PLANS.get(key)
+        if plan is None:
+            with _ENCODE_PLANS_LOCK:
+                plan = _MEMBER_PLANS.get(key)
+                if plan is None:
+                    if issubclass(obj_type, ConjureBeanType):
+                        plan = cls._bean_encode_plan(obj_type)
+                    else:
+                        plan = cls._union_encode_plan(obj_type)
+                    _MEMBER_PLANS[key] = plan
+        return plan
+
+    @classmethod
+    def _overrides(cls, hook: str) -> bool:
+        """Returns whether the class overrides the given classmethod of
+        ConjureEncoder, which plans must then call."""
+        return (
+            getattr(cls, hook).__func__
+            is not getattr(ConjureEncoder, hook).__func__
+        )
+
+    @classmethod
+    def _compile_encode_plan(cls, obj_type: type) -> EncodePlan:
+        if issubclass(obj_type, ConjureBeanType):
+            if cls._overrides("encode_conjure_bean_type"):
+                return cls.encode_conjure_bean_type
+            return cls._bean_encode_plan(obj_type)
+
+        elif issubclass(obj_type, ConjureUnionType):
+            if cls._overrides("encode_conjure_union_type"):
+                return cls.encode_conjure_union_type
+            return cls._union_encode_plan(obj_type)
+
+        elif issubclass(obj_type, ConjureEnumType):
+            return attrgetter("value")
+
+        elif issubclass(obj_type, list):
+            return cls._list_encode_plan()
+
+        elif issubclass(obj_type, dict):
+            return cls._dict_encode_plan()
+
+        elif is_numeric_array_type(obj_type):
+            # array.array or numpy array, see ConjureDecoder numeric_arrays
+            encode_primitive = cls.encode_primitive
 
-        elif isinstance(obj, ConjureUnionType):
-            return cls.encode_conjure_union_type(obj)
+            def encode_array(obj):
+                return encode_numeric_array(obj, encode_primitive)
 
-        elif isinstance(obj, ConjureEnumType):
-            return obj.value
+            return encode_array
 
-        elif isinstance(obj, list):
-            return list(map(cls.do_encode, obj))
+        elif obj_type in cls._passthrough_types():
+            return _identity
 
-        elif isinstance(obj, dict):
+        return cls.encode_primitive
+
+    @classmethod
+    def _passthrough_types(cls) -> frozenset:
+        """Returns the types which encode_primitive returns unchanged."""
+        if cls._overrides("encode_primitive"):
+            return frozenset()
+        return _PASSTHROUGH_TYPES
+
+    @classmethod
+    def _bean_encode_plan(cls, bean_type: type) -> EncodePlan:
+        metadata = bean_metadata(bean_type)
+        identifiers = tuple(
+            field_definition.identifier
+            for field_definition in metadata.fields.values()
+        )
+        do_encode = cls.do_encode
+        if not identifiers:
+            return lambda obj: {}
+        if len(identifiers) == 1:
+            # attrgetter only returns a tuple for several attributes
+            (identifier,) = identifiers
+            (attribute,) = metadata.attributes
+
+            def encode_single_field_bean(obj):
+                return {identifier: do_encode(getattr(obj, attribute))}
+
+            return encode_single_field_bean
+
+        get_values = attrgetter(*metadata.attributes)
+        passthrough_types = cls._passthrough_types()
+
+        def encode_bean(obj):
+            values = get_values(obj)
+            if passthrough_types.issuperset(map(type, values)):
+                # beans of only strings, integers, booleans and nulls
+                return dict(zip(identifiers, values))
+            return dict(zip(identifiers, map(do_encode, values)))
+
+        return encode_bean
+
+    @classmethod
+    def _union_encode_plan(cls, union_type: type) -> EncodePlan:
+        attribute_by_identifier = union_metadata(
+            union_type
+        ).attribute_by_identifier
+        do_encode = cls.do_encode
+
+        def encode_union(obj):
+            attribute = attribute_by_identifier.get(obj.type)
+            if attribute is None:
+                raise ValueError(
+                    "could not find attribute for union "
+                    + "member {0} of type {1}".format(obj.type, obj.__class__)
+                )
             return {
-                cls.do_encode(key): cls.do_encode(value)
-                for key, value in obj.items()
+                "type": obj.type,
+                obj.type: do_encode(getattr(obj, attribute)),
             }
 
-        else:
-            return cls.encode_primitive(obj)
+        return encode_union
+
+    @classmethod
+    def _list_encode_plan(cls) -> EncodePlan:
+        do_encode = cls.do_encode
+
+        def encode_list(obj):
+            return list(map(do_encode, obj))
+
+        return encode_list
+
+    @classmethod
+    def _dict_encode_plan(cls) -> EncodePlan:
+        do_encode = cls.do_encode
+
+        def encode_dict(obj):
+            return {
+                do_encode(key): do_encode(value) for key, value in obj.items()
+            }
+
+        return encode_dict
 
     def default(self, obj: Any) -> Any:
         return self.do_encode(obj)
+
+    @classmethod
+    def write_to_buffer(
+        cls, obj: Any, buffer: Optional[bytearray] = None
+    ) -> bytearray:
+        """Writes the passed object as utf-8 encoded json straight into a
+        buffer, in a single pass and without first encoding it into a tree
+        of dicts and lists or a str.
+
+        The output is the same as that of ``json.dumps(do_encode(obj))``,
+        so the buffer can be sent as a request body in place of the json
+        argument; its length is the Content-Length.
+
+        Args:
+            obj: the object to write
+            buffer: the buffer to append to. Defaults to a new bytearray.
+        Returns:
+            The buffer.
+        """
+        if buffer is None:
+            buffer = bytearray()
+        cls._write_value(obj, buffer)
+        return buffer
+
+    @classmethod
+    def iter_encode_list(
+        cls, elements: Iterable[Any], chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> Iterator[bytes]:
+        """Lazily encodes an iterable, e.g. a generator of beans read from a
+        database cursor, into a json list, yielding utf-8 encoded chunks of
+        about chunk_size bytes.
+
+        Elements are consumed as the chunks are, so only a chunk is held in
+        memory at a time however long the list is.
+
+        Args:
+            elements: the elements of the list
+            chunk_size: the size in bytes after which a chunk is yielded;
+                chunks are larger if single elements are.
+        """
+        buffer = bytearray(b"[")
+        separator = b""
+        for element in elements:
+            buffer += separator
+            separator = b", "
+            cls._write_value(element, buffer)
+            if len(buffer) >= chunk_size:
+                yield bytes(buffer)
+                buffer.clear()
+        buffer += b"]"
+        yield bytes(buffer)
+
+    @classmethod
+    def cache_encoded(
+        cls, bean_type: type, cache: Optional[EncodedCache]
+    ) -> None:
+        """Memoises the json encoding of instances of a bean type, e.g. of
+        large configuration beans resent on every request, so that
+        write_to_buffer and iter_encode_list splice in the cached bytes
+        instead of encoding such a bean again. Services use these for
+        request bodies passed as conjure objects rather than json trees.
+
+        Args:
+            bean_type: the ConjureBeanType class whose instances are cached
+            cache: the cache to use, which may be shared between bean
+                types, or None to stop caching
+        """
+        with _ENCODE_PLANS_LOCK:
+            if cache is None:
+                _ENCODED_CACHES.pop((cls, bean_type), None)
+            else:
+                _ENCODED_CACHES[(cls, bean_type)] = cache
+            # recompile the write plans of the type and its subclasses
+            for encoder, obj_type in list(_WRITE_PLANS):
+                if encoder is cls and issubclass(obj_type, bean_type):
+                    del _WRITE_PLANS[(encoder, obj_type)]
+
+    @classmethod
+    def _write_value(cls, obj: Any, out: bytearray) -> None:
+        plan = _WRITE_PLANS.get((cls, obj.__class__))
+        if plan is None:
+            plan = cls.write_plan(obj.__class__)
+        plan(obj, out)
+
+    @classmethod
+    def write_plan(cls, obj_type: type) -> WritePlan:
+        """Returns a function which writes instances of obj_type as json
+        into a bytearray, see encode_plan."""
+        key = (cls, obj_type)
+        plan = _WRITE_PLANS.get(key)
+        if plan is None:
+            with _ENCODE_PLANS_LOCK:
+                plan = _WRITE_PLANS.get(key)
+                if plan is None:
+                    plan = cls._compile_write_plan(obj_type)
+                    _WRITE_PLANS[key] = plan
+        return plan
+
+    @classmethod
+    def _compile_write_plan(cls, obj_type: type) -> WritePlan:
+        write_value = cls._write_value
+        passthrough_types = cls._passthrough_types()
+
+        if issubclass(obj_type, ConjureBeanType) and not cls._overrides(
+            "encode_conjure_bean_type"
+        ):
+            metadata = bean_metadata(obj_type)
+            parts = [
+                (
+                    (b", " if index else b"{")
+                    + _json_string(field_definition.identifier)
+                    + b": ",
+                    attribute,
+                )
+                for index, (attribute, field_definition) in enumerate(
+                    metadata.fields.items()
+                )
+            ]
+
+            def write_bean(obj, out):
+                if not parts:
+                    out += b"{"
+                for prefix, attribute in parts:
+                    out += prefix
+                    write_value(getattr(obj, attribute), out)
+                out += b"}"
+
+            for bean_type in obj_type.__mro__:
+                cache = _ENCODED_CACHES.get((cls, bean_type))
+                if cache is not None:
+                    return _cached_write_plan(write_bean, cache)
+            return write_bean
+
+        elif issubclass(obj_type, ConjureUnionType) and not cls._overrides(
+            "encode_conjure_union_type"
+        ):
+            prefixes = {
+                identifier: (
+                    b'{"type": '
+                    + _json_string(identifier)
+                    + b", "
+                    + _json_string(identifier)
+                    + b": ",
+                    attribute,
+                )
+                for identifier, attribute in union_metadata(
+                    obj_type
+                ).attribute_by_identifier.items()
+            }
+
+            def write_union(obj, out):
+                member = prefixes.get(obj.type)
+                if member is None:
+                    raise ValueError(
+                        "could not find attribute for union "
+                        + "member {0} of type {1}".format(
+                            obj.type, obj.__class__
+                        )
+                    )
+                prefix, attribute = member
+                out += prefix
+                write_value(getattr(obj, attribute), out)
+                out += b"}"
+
+            return write_union
+
+        elif issubclass(obj_type, ConjureEnumType):
+
+            def write_enum(obj, out):
+                out += _json_string(obj.value)
+
+            return write_enum
+
+        elif issubclass(obj_type, list):
+
+            def write_list(obj, out):
+                separator = b"["
+                for element in obj:
+                    out += separator
+                    separator = b", "
+                    write_value(element, out)
+                out += b"]" if obj else b"[]"
+
+            return write_list
+
+        elif issubclass(obj_type, dict):
+            encode_key = cls.do_encode
+
+            def write_dict(obj, out):
+                separator = b"{"
+                for key, value in obj.items():
+                    out += separator
+                    separator = b", "
+                    if key.__class__ is str:
+                        out += _json_string(key)
+                    else:
+                        _write_json_key(encode_key(key), out)
+                    out += b": "
+                    write_value(value, out)
+                out += b"}" if obj else b"{}"
+
+            return write_dict
+
+        elif obj_type in passthrough_types or obj_type is float:
+            if issubclass(obj_type, str):
+                return _write_str
+            elif obj_type is bool:
+                return _write_bool
+            elif obj_type is float:
+                encode_primitive = cls.encode_primitive
+
+                def write_float(obj, out):
+                    if isfinite(obj):
+                        out += float.__repr__(obj).encode("ascii")
+                    else:
+                        out += _json_string(encode_primitive(obj))
+
+                return write_float
+            elif issubclass(obj_type, int):
+                return _write_int
+            return _write_null
+
+        encode = cls.do_encode
+
+        def write_encoded(obj, out):
+            # numeric arrays, or values of custom encode_* methods
+            _write_json(encode(obj), out)
+
+        return write_encoded
+
+    @classmethod
+    def write_to_bytes(
+        cls, obj: Any, json_backend: Union[str, JsonBackend, None] = None
+    ) -> bytes:
+        """Encodes the passed object into utf-8 encoded json bytes.
+
+        Args:
+            obj: the object to encode
+            json_backend: the json backend used to serialise the encoded
+                object, see resolve_json_backend. Defaults to the global
+                backend.
+        """
+        return resolve_json_backend(json_backend).dumps(cls.do_encode(obj))
+
+
+def _cached_write_plan(write: WritePlan, cache: EncodedCache) -> WritePlan:
+    def write_cached(obj, out):
+        encoded = cache.get(obj)
+        if encoded is None:
+            start = len(out)
+            write(obj, out)
+            cache.put(obj, bytes(out[start:]))
+        else:
+            out += encoded
+
+    return write_cached
+
+
+def _json_string(value: str) -> bytes:
+    return encode_basestring_ascii(value).encode("ascii")
+
+
+def _write_str(obj: str, out: bytearray) -> None:
+    out += encode_basestring_ascii(obj).encode("ascii")
+
+
+def _write_int(obj: int, out: bytearray) -> None:
+    out += int.__repr__(obj).encode("ascii")
+
+
+def _write_bool(obj: bool, out: bytearray) -> None:
+    out += b"true" if obj else b"false"
+
+
+def _write_null(obj: None, out: bytearray) -> None:
+    out += b"null"
+
+
+def _write_json_key(key: Any, out: bytearray) -> None:
+    # stringifies non-string keys the way json.dumps does
+    if isinstance(key, str):
+        out += _json_string(key)
+    elif isinstance(key, bool):
+        out += b'"true"' if key else b'"false"'
+    elif isinstance(key, int):
+        out += b'"' + int.__repr__(key).encode("ascii") + b'"'
+    elif isinstance(key, float):
+        out += b'"' + float.__repr__(key).encode("ascii") + b'"'
+    elif key is None:
+        out += b'"null"'
+    else:
+        raise TypeError(
+            "keys must be str, int, float, bool or None, not {}".format(
+                key.__class__.__name__
+            )
+        )
+
+
+def _write_json(obj: Any, out: bytearray) -> None:
+    """Writes an already encoded json tree, like json.dumps with
+    allow_nan=False."""
+    if isinstance(obj, str):
+        out += _json_string(obj)
+    elif obj is None:
+        out += b"null"
+    elif obj is True:
+        out += b"true"
+    elif obj is False:
+        out += b"false"
+    elif isinstance(obj, int):
+        out += int.__repr__(obj).encode("ascii")
+    elif isinstance(obj, float):
+        if not isfinite(obj):
+            raise ValueError(
+                "Out of range float values are not JSON compliant"
+            )
+        out += float.__repr__(obj).encode("ascii")
+    elif isinstance(obj, (list, tuple)):
+        out += b"["
+        for index, element in enumerate(obj):
+            if index:
+                out += b", "
+            _write_json(element, out)
+        out += b"]"
+    elif isinstance(obj, dict):
+        out += b"{"
+        for index, (key, value) in enumerate(obj.items()):
+            if index:
+                out += b", "
+            _write_json_key(key, out)
+            out += b": "
+            _write_json(value, out)
+        out += b"}"
+    else:
+        raise TypeError(
+            "Object of type {} is not JSON serializable".format(
+                obj.__class__.__name__
+            )
+        )
@@ -0,0 +1,93 @@
+# (c) Copyright 2026 Palantir Technologies Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from .._lib import ConjureType
+from .._lib.metadata import bean_values_getter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, Optional
+
+# the beans decoded so far by the current decode, keyed by bean type and
+# field values
+_bean_pool: ContextVar[Optional[Dict[Any, Any]]] = ContextVar(
+    "conjure_decode_bean_pool", default=None
+)
+
+
+@contextmanager
+def bean_pool() -> Iterator[None]:
+    """Scopes the interning of beans to a single decode, so that the pool
+    and the beans it holds are released with the decoded value."""
+    token = _bean_pool.set({})
+    try:
+        yield
+    finally:
+        _bean_pool.reset(token)
+
+
+def _intern_key(value: Any) -> Any:
+    # conjure values nested in an interned bean are themselves interned,
+    # so their identity stands for their content; collections are frozen
+    # as interned beans are shared
+    if isinstance(value, ConjureType):
+        return (ConjureType, id(value))
+    elif isinstance(value, list):
+        return (list, tuple(map(_intern_key, value)))
+    elif isinstance(value, dict):
+        return (
+            dict,
+            frozenset(
+                (_intern_key(key), _intern_key(item))
+                for key, item in value.items()
+            ),
+        )
+    elif isinstance(value, float):
+        # keeps the sign of zeros apart, which compare equal
+        return (float, repr(value))
+    # values of any fields which compare equal across types, e.g. True and
+    # 1, are kept apart by their type
+    return (type(value), value)
+
+
+def bean_interner(bean_type: type) -> Callable[[Any], Any]:
+    """Returns a function which, within a bean_pool, maps each bean of
+    bean_type to the first structurally equal bean seen in the pool."""
+    get_values = bean_values_getter(bean_type)
+
+    def intern_bean(bean):
+        pool = _bean_pool.get()
+        if pool is None:
+            return bean
+        key = (bean_type, tuple(map(_intern_key, get_values(bean))))
+        try:
+            # the pool holds every interned bean, so ids in keys stay unique
+            return pool.setdefault(key, bean)
+        except TypeError:
+            # fields of unhashable custom types
+            return bean
+
+    return intern_bean
+
+
+def interned_bean_plan(
+    bean_type: type, decode_bean: Callable[[Any], Any]
+) -> Callable[[Any], Any]:
+    """Wraps a bean decode plan so that, within a bean_pool, structurally
+    equal beans of bean_type decode to a single shared instance."""
+    intern_bean = bean_interner(bean_type)
+
+    def decode_interned_bean(obj):
+        return intern_bean(decode_bean(obj))
+
+    return decode_interned_bean
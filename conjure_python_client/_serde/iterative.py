@@ -0,0 +1,234 @@
+# (c) Copyright 2026 Palantir Technologies Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from .._lib import ConjureBeanType, ConjureUnionType
+from .._lib.hashing import nested_conjure_types
+from .._lib.metadata import bean_metadata, union_metadata
+from .construct import _missing_field
+from itertools import repeat
+from typing import Any, Callable, Dict, List, Set, Tuple
+import inspect
+
+# Decode nodes describe how to decode a recursive type. They are tuples, or
+# lists for beans and unions which are referenced before being filled in,
+# whose first item is one of the kinds below.
+#
+#   (LEAF, plan): decoded by a regular decode plan
+#   [BEAN, bean type, fields, skipped, build, decode non object]: fields
+#       are (python argument name, identifier, node, null value factory or
+#       None if required) and skipped are (python argument name, null value
+#       factory). The fields are passed to build once all of them are
+#       decoded. Json other than an object is decoded by decode non object.
+#   (LIST, element node)
+#   (DICT, keys decoder, value node)
+#   (OPTIONAL, item node)
+#   [UNION, union type, variants, return_none_for_unknown_union_types,
+#       check_null_field, build]: variants are (attribute, node, field
+#       definition) by identifier
+LEAF = 0
+BEAN = 1
+LIST = 2
+DICT = 3
+OPTIONAL = 4
+UNION = 5
+
+DecodeNode = Any
+
+_RECURSIVE_TYPES: Dict[Any, bool] = {}
+
+
+def is_recursive_type(obj_type: Any) -> bool:
+    """Returns whether decoding obj_type may reach a bean or union type
+    which contains itself, so that the depth of the json is unbounded."""
+    try:
+        return _RECURSIVE_TYPES[obj_type]
+    except KeyError:
+        pass
+    except TypeError:
+        return _find_cycle(obj_type)
+    recursive = _find_cycle(obj_type)
+    _RECURSIVE_TYPES[obj_type] = recursive
+    return recursive
+
+
+def _conjure_edges(conjure_type: type) -> Set[type]:
+    if issubclass(conjure_type, ConjureBeanType):
+        definitions = bean_metadata(conjure_type).fields.values()
+    else:
+        definitions = union_metadata(conjure_type).options.values()
+    return {
+        nested
+        for field_definition in definitions
+        for nested in nested_conjure_types(field_definition.field_type)
+    }
+
+
+def _find_cycle(obj_type: Any) -> bool:
+    if inspect.isclass(obj_type) and issubclass(
+        obj_type, (ConjureBeanType, ConjureUnionType)
+    ):
+        roots = {obj_type}
+    else:
+        roots = set(nested_conjure_types(obj_type))
+    # depth first search for a back edge, without recursion
+    visiting: Set[type] = set()
+    done: Set[type] = set()
+    for root in roots:
+        if root in done:
+            continue
+        visiting.add(root)
+        pending = [(root, iter(_conjure_edges(root)))]
+        while pending:
+            current, edges = pending[-1]
+            for nested in edges:
+                if nested in visiting:
+                    return True
+                if nested not in done:
+                    visiting.add(nested)
+                    pending.append((nested, iter(_conjure_edges(nested))))
+                    break
+            else:
+                pending.pop()
+                visiting.discard(current)
+                done.add(current)
+    return False
+
+
+def depth_safe_plan(
+    plan: Callable[[Any], Any], root: DecodeNode
+) -> Callable[[Any], Any]:
+    """Returns a decode plan which decodes with the given recursive plan,
+    unless the json is too deep for its nested calls, in which case the
+    json is decoded again from the top by iterative_decoder(root)."""
+    decode_iteratively = iterative_decoder(root)
+
+    def decode_any_depth(obj):
+        try:
+            return plan(obj)
+        except RecursionError:
+            return decode_iteratively(obj)
+
+    return decode_any_depth
+
+
+# pending entries building a bean or union from its decoded fields, which
+# are pushed beneath the entries of those fields
+_BUILD = -1
+
+
+def iterative_decoder(root: DecodeNode) -> Callable[[Any], Any]:
+    """Returns a decode plan for the given node which decodes json of any
+    depth, with an explicit stack of pending (node, json, container, key)
+    entries instead of nested calls. Each entry decodes its json into the
+    container waiting for it, a list, dict, or the fields of a bean or
+    union, which is built once all of its fields are decoded."""
+
+    def decode_iteratively(obj):
+        result: List[Any] = [None]
+        pending: List[Tuple[DecodeNode, Any, Any, Any]] = [
+            (root, obj, result, 0)
+        ]
+        while pending:
+            node, obj, target, key = pending.pop()
+            kind = node[0]
+            if kind == LEAF:
+                target[key] = node[1](obj)
+            elif kind == OPTIONAL:
+                if obj is None:
+                    target[key] = None
+                else:
+                    pending.append((node[1], obj, target, key))
+            elif kind == LIST:
+                if not isinstance(obj, list):
+                    raise Exception("expected a python list")
+                items = [None] * len(obj)
+                target[key] = items
+                # pushed in reverse, so that elements are decoded in order
+                pending.extend(
+                    zip(
+                        repeat(node[1]),
+                        reversed(obj),
+                        repeat(items),
+                        reversed(range(len(obj))),
+                    )
+                )
+            elif kind == DICT:
+                if not isinstance(obj, dict):
+                    raise Exception("expected a python dict")
+                keys = node[1](obj)
+                # keys are inserted in the order of the json object up front
+                entries = dict.fromkeys(keys)
+                target[key] = entries
+                pending.extend(
+                    zip(
+                        repeat(node[2]),
+                        reversed(list(obj.values())),
+                        repeat(entries),
+                        reversed(keys),
+                    )
+                )
+            elif kind == BEAN:
+                _expand_bean(node, obj, target, key, pending)
+            elif kind == UNION:
+                _expand_union(node, obj, target, key, pending)
+            else:
+                target[key] = node[1](obj)
+        return result[0]
+
+    return decode_iteratively
+
+
+def _expand_bean(node: DecodeNode, obj, target, key, pending) -> None:
+    _, bean_type, fields, skipped, build, decode_non_object = node
+    if not isinstance(obj, dict):
+        target[key] = decode_non_object(obj)
+        return
+    values: Dict[str, Any] = {}
+    pending.append(((_BUILD, build), values, target, key))
+    for name, null_value in skipped:
+        values[name] = null_value()
+    children = []
+    for name, identifier, field_node, null_value in fields:
+        value = obj.get(identifier)
+        if value is not None:
+            children.append((field_node, value, values, name))
+        elif null_value is None:
+            _missing_field(identifier, obj)
+        else:
+            values[name] = null_value()
+    pending.extend(reversed(children))
+
+
+def _expand_union(node: DecodeNode, obj, target, key, pending) -> None:
+    _, union_type, variants, return_none, check_null_field, build = node
+    type_of_union = obj["type"]
+    variant = variants.get(type_of_union)
+    if variant is None:
+        if return_none:
+            target[key] = None
+            return
+        raise ValueError(
+            "unknown union type {0} for {1}".format(type_of_union, union_type)
+        )
+    attribute, member, field_definition = variant
+    values: Dict[str, Any] = {}
+    if union_metadata(union_type).accepts_type_of_union:
+        values["type_of_union"] = type_of_union
+    value = obj.get(type_of_union)
+    if value is None:
+        check_null_field(obj, values, attribute, field_definition)
+        target[key] = build(values)
+    else:
+        pending.append(((_BUILD, build), values, target, key))
+        pending.append((member, value, values, attribute))
@@ -0,0 +1,167 @@
+# (c) Copyright 2026 Palantir Technologies Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Any, Callable, Dict, Union
+import importlib
+import json
+
+JsonInput = Union[str, bytes, bytearray, memoryview]
+
+
+class JsonBackend(object):
+    """Parses and serialises json on behalf of the conjure serde layer.
+
+    Backends only ever see plain json trees: conjure specific encoding such
+    as NaN/Infinity as strings or json encoded map keys is done by
+    ConjureEncoder/ConjureDecoder, so all backends produce the same values.
+    """
+
+    name: str = ""
+
+    def loads(self, value: JsonInput) -> Any:
+        """Parses json text or utf-8 encoded json bytes."""
+        raise NotImplementedError()
+
+    def dumps(self, obj: Any) -> bytes:
+        """Serialises a json tree to utf-8 encoded json bytes."""
+        raise NotImplementedError()
+
+    def __repr__(self) -> str:
+        return "{}()".format(self.__class__.__name__)
+
+
+class StdlibJsonBackend(JsonBackend):
+    """The default backend, using the standard library json module."""
+
+    name = "json"
+
+    def loads(self, value: JsonInput) -> Any:
+        if isinstance(value, memoryview):
+            value = bytes(value)
+        return json.loads(value)
+
+    def dumps(self, obj: Any) -> bytes:
+        # matches how requests serialises the json request argument
+        return json.dumps(obj, allow_nan=False).encode("utf-8")
+
+
+class OrjsonBackend(JsonBackend):
+    name = "orjson"
+
+    def __init__(self) -> None:
+        self._orjson = importlib.import_module("orjson")
+        # the stdlib json module stringifies non-string map keys
+        self._options = self._orjson.OPT_NON_STR_KEYS
+
+    def loads(self, value: JsonInput) -> Any:
+        return self._orjson.loads(value)
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._orjson.dumps(obj, option=self._options)
+
+
+class UjsonBackend(JsonBackend):
+    """Parses with ujson. Serialisation stays with the standard library, as
+    ujson stringifies non-string map keys differently."""
+
+    name = "ujson"
+
+    def __init__(self) -> None:
+        self._ujson = importlib.import_module("ujson")
+
+    def loads(self, value: JsonInput) -> Any:
+        if isinstance(value, (bytearray, memoryview)):
+            value = bytes(value)
+        return self._ujson.loads(value)
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(obj, allow_nan=False).encode("utf-8")
+
+
+class SimdjsonBackend(JsonBackend):
+    """Parses with pysimdjson, which has no serialiser of its own."""
+
+    name = "simdjson"
+
+    def __init__(self) -> None:
+        self._simdjson = importlib.import_module("simdjson")
+
+    def loads(self, value: JsonInput) -> Any:
+        if isinstance(value, (bytearray, memoryview)):
+            value = bytes(value)
+        return self._simdjson.loads(value)
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(obj, allow_nan=False).encode("utf-8")
+
+
+_BACKENDS: Dict[str, Callable[[], JsonBackend]] = {
+    StdlibJsonBackend.name: StdlibJsonBackend,
+    OrjsonBackend.name: OrjsonBackend,
+    UjsonBackend.name: UjsonBackend,
+    SimdjsonBackend.name: SimdjsonBackend,
+}
+
+# order in which "auto" picks the first installed backend
+_PREFERRED_BACKENDS = ("orjson", "simdjson", "ujson", "json")
+
+_default_backend: JsonBackend = StdlibJsonBackend()
+
+
+def resolve_json_backend(
+    backend: Union[str, JsonBackend, None]
+) -> JsonBackend:
+    """Returns the backend for a name, passing through backend instances.
+
+    Args:
+        backend: one of "json", "orjson", "ujson", "simdjson", "auto" for
+            the fastest installed backend, a JsonBackend instance, or None
+            for the global default.
+    """
+    if backend is None:
+        return _default_backend
+    if isinstance(backend, JsonBackend):
+        return backend
+    if backend == "auto":
+        for name in _PREFERRED_BACKENDS:
+            try:
+                return _BACKENDS[name]()
+            except ImportError:
+                continue
+    if backend not in _BACKENDS:
+        raise ValueError(
+            "unknown json backend {}, expected one of {}".format(
+                backend, ", ".join(sorted(_BACKENDS) + ["auto"])
+            )
+        )
+    return _BACKENDS[backend]()
+
+
+def get_json_backend() -> JsonBackend:
+    """Returns the json backend used when none is configured explicitly."""
+    return _default_backend
+
+
+def set_json_backend(backend: Union[str, JsonBackend, None]) -> None:
+    """Sets the json backend used when none is configured explicitly.
+
+    Args:
+        backend: see resolve_json_backend, None restores the standard
+            library backend.
+    """
+    global _default_backend
+    if backend is None:
+        _default_backend = StdlibJsonBackend()
+    else:
+        _default_backend = resolve_json_backend(backend)
@@ -0,0 +1,98 @@
+# (c) Copyright 2026 Palantir Technologies Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from .._lib import BinaryType, ConjureEnumType
+from typing import Any, Callable, Dict, List
+import inspect
+import json
+
+# the number of parsed keys of other types cached by each keys decoder
+KEY_CACHE_SIZE = 4096
+
+_BOOLEAN_KEYS = {"true": True, "false": False}
+
+KeysDecoder = Callable[[Dict[str, Any]], List[Any]]
+
+
+def _is_string_key_type(key_type: Any) -> bool:
+    """Returns whether map keys of key_type are json strings as they are,
+    rather than json encoded values."""
+    return (
+        key_type is str
+        or key_type is BinaryType
+        or isinstance(key_type, BinaryType)
+        or (
+            inspect.isclass(key_type)
+            and issubclass(key_type, ConjureEnumType)
+        )
+    )
+
+
+def keys_decoder(
+    key_type: Any, decode_key: Callable[[Any], Any]
+) -> KeysDecoder:
+    """Returns a function decoding the keys of a json object into a list of
+    values of key_type, in order.
+
+    Keys of other types than strings are themselves json encoded. Integer,
+    double and boolean keys are converted by int(), float() or a lookup
+    over all keys at once, and only keys which fail to convert go through
+    json. Keys of any other type are parsed as json, with a bounded cache
+    of the parses so that keys repeated across maps are parsed once.
+
+    Args:
+        key_type: the conjure type of the keys
+        decode_key: the decode plan for key_type
+    """
+    if _is_string_key_type(key_type):
+
+        def decode_string_keys(obj):
+            return list(map(decode_key, obj))
+
+        return decode_string_keys
+
+    parsed_keys: Dict[str, Any] = {}
+
+    def decode_json_key(key):
+        try:
+            parsed = parsed_keys[key]
+        except KeyError:
+            parsed = json.loads(key)
+            if len(parsed_keys) >= KEY_CACHE_SIZE:
+                parsed_keys.clear()
+            parsed_keys[key] = parsed
+        return decode_key(parsed)
+
+    if key_type is int:
+        convert: Callable[[str], Any] = int
+    elif key_type is float:
+        # also parses the "NaN" and "Infinity" strings
+        convert = float
+    elif key_type is bool:
+        convert = _BOOLEAN_KEYS.__getitem__
+    else:
+
+        def decode_json_keys(obj):
+            return list(map(decode_json_key, obj))
+
+        return decode_json_keys
+
+    def decode_keys(obj):
+        try:
+            return list(map(convert, obj))
+        except (KeyError, ValueError):
+            # raises the usual error for keys which are not of key_type
+            return list(map(decode_json_key, obj))
+
+    return decode_keys
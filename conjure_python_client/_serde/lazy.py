@@ -0,0 +1,130 @@
+# (c) Copyright 2026 Palantir Technologies Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from .._lib.metadata import bean_metadata
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# instance attribute holding the raw json of a lazily decoded bean, which is
+# not a field attribute of the bean as those never end in "__"
+RAW_JSON_ATTRIBUTE = "__conjure_raw__"
+
+
+class _LazyField(object):
+    """Non-data descriptor shadowing the private attribute behind a bean
+    property. The first access decodes the field from the raw json and stores
+    it on the instance, which then takes precedence over the descriptor."""
+
+    def __init__(
+        self,
+        private_name: str,
+        identifier: str,
+        null_value: Optional[Callable[[], Any]],
+        fields: List[Tuple[str, str, Any, Any]],
+        index: int,
+    ) -> None:
+        self._private_name = private_name
+        self._identifier = identifier
+        self._null_value = null_value
+        self._fields = fields
+        self._index = index
+
+    def __get__(self, instance: Any, owner: Any = None) -> Any:
+        if instance is None:
+            return self
+        value = instance.__dict__[RAW_JSON_ATTRIBUTE].get(self._identifier)
+        if value is None:
+            # required fields are checked when the bean is decoded
+            value = self._null_value() if self._null_value else None
+        else:
+            value = self._fields[self._index][2](value)
+        instance.__dict__[self._private_name] = value
+        return value
+
+
+def _rebuild_bean(bean_type: type, kwargs: Dict[str, Any]) -> Any:
+    return bean_type(**kwargs)
+
+
+def eq_as_bean_type(self: Any, other: Any) -> bool:
+    # equality of the runtime subclasses of a generated bean type: equal to
+    # beans of the generated type, whatever their runtime subclass
+    bean_type = self.__class__.__bases__[0]
+    if not isinstance(other, bean_type):
+        return False
+    for attribute in bean_metadata(bean_type).attributes:
+        if getattr(self, attribute) != getattr(other, attribute):
+            return False
+    return True
+
+
+def hash_as_bean_type(self: Any) -> int:
+    # looked up on each call, as hashing may be enabled after the runtime
+    # subclass is created, see enable_hashing
+    bean_hash = self.__class__.__bases__[0].__hash__
+    if bean_hash is None:
+        raise TypeError(
+            "unhashable type: '{}'".format(self.__class__.__name__)
+        )
+    return bean_hash(self)
+
+
+def reduce_as_bean_type(self: Any) -> Any:
+    # runtime subclasses cannot be pickled by name, so pickle beans as the
+    # generated type
+    bean_type = self.__class__.__bases__[0]
+    return (
+        _rebuild_bean,
+        (
+            bean_type,
+            {
+                attribute: getattr(self, attribute)
+                for attribute in bean_metadata(bean_type).attributes
+            },
+        ),
+    )
+
+
+def lazy_bean_type(
+    bean_type: type,
+    fields: List[Tuple[str, str, Any, Any]],
+    null_values: List[Optional[Callable[[], Any]]],
+) -> type:
+    """Returns a subclass of bean_type whose instances decode each field from
+    their raw json the first time it is read.
+
+    Args:
+        bean_type: the generated ConjureBeanType class
+        fields: the (python_arg_name, identifier, decode plan, field
+            definition) of each field, in _fields() order; may still be
+            populated after this returns, but before the type is used.
+        null_values: the value factory for each absent optional, list or map
+            field, or None for required fields
+    """
+    namespace: Dict[str, Any] = {
+        "__module__": bean_type.__module__,
+        "__qualname__": bean_type.__qualname__,
+        "__eq__": eq_as_bean_type,
+        "__hash__": hash_as_bean_type,
+        "__reduce__": reduce_as_bean_type,
+    }
+    metadata = bean_metadata(bean_type)
+    for index, attribute in enumerate(metadata.attributes):
+        namespace["_" + attribute] = _LazyField(
+            "_" + attribute,
+            metadata.fields[attribute].identifier,
+            null_values[index],
+            fields,
+            index,
+        )
+    return type(bean_type.__name__, (bean_type,), namespace)
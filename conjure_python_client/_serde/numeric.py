@@ -0,0 +1,118 @@
+# (c) Copyright 2026 Palantir Technologies Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from array import array
+from math import isfinite
+from typing import Any, Callable, List
+import importlib
+
+ARRAY = "array"
+NUMPY = "numpy"
+NUMERIC_ARRAY_KINDS = (ARRAY, NUMPY)
+
+# typecodes of array.array for conjure double and integer (and safelong)
+_ARRAY_TYPECODES = {float: "d", int: "q"}
+_NUMPY_DTYPES = {float: "float64", int: "int64"}
+_INTEGER_TYPES = frozenset((int, bool))
+
+
+def check_numeric_array_kind(kind: str) -> None:
+    if kind not in NUMERIC_ARRAY_KINDS:
+        raise ValueError(
+            "unknown numeric array kind {}, expected one of {}".format(
+                kind, ", ".join(NUMERIC_ARRAY_KINDS)
+            )
+        )
+    if kind == NUMPY:
+        # fail when the decoder is created rather than on first decode
+        importlib.import_module("numpy")
+
+
+def numeric_array_decoder(
+    element_type: type, kind: str
+) -> Callable[[List[Any]], Any]:
+    """Returns a function converting a json list of doubles or integers into
+    an array.array or a numpy array.
+
+    Doubles are converted with float(), which also parses the Conjure
+    "NaN"/"Infinity"/"-Infinity" strings. Integers are type checked in a
+    single pass before conversion.
+    """
+    if kind == NUMPY:
+        numpy = importlib.import_module("numpy")
+        dtype = numpy.dtype(_NUMPY_DTYPES[element_type])
+        if element_type is float:
+
+            def to_numpy_floats(values):
+                return numpy.fromiter(
+                    map(float, values), dtype=dtype, count=len(values)
+                )
+
+            return to_numpy_floats
+
+        def to_numpy_ints(values):
+            _check_integers(values)
+            return numpy.array(values, dtype=dtype)
+
+        return to_numpy_ints
+
+    typecode = _ARRAY_TYPECODES[element_type]
+    if element_type is float:
+
+        def to_float_array(values):
+            return array(typecode, map(float, values))
+
+        return to_float_array
+
+    def to_int_array(values):
+        _check_integers(values)
+        return array(typecode, values)
+
+    return to_int_array
+
+
+def _check_integers(values: List[Any]) -> None:
+    if not _INTEGER_TYPES.issuperset(map(type, values)):
+        for value in values:
+            if not isinstance(value, int):
+                raise Exception(
+                    "Expected to find {} type but found {} instead".format(
+                        int, type(value)
+                    )
+                )
+
+
+def is_numeric_array_type(obj_type: type) -> bool:
+    """Returns whether obj_type is array.array or a numpy array type,
+    without importing numpy."""
+    return issubclass(obj_type, array) or (
+        obj_type.__module__ == NUMPY and hasattr(obj_type, "tolist")
+    )
+
+
+def encode_numeric_array(
+    obj: Any, encode_primitive: Callable[[Any], Any]
+) -> List[Any]:
+    """Converts an array into a json list, encoding non finite doubles
+    with encode_primitive."""
+    values = obj.tolist()
+    if not isinstance(values, list):
+        # zero-dimensional numpy arrays are scalars
+        return encode_primitive(values)
+    if values and isinstance(values[0], list):
+        # multi-dimensional numpy arrays are nested lists
+        return [encode_numeric_array(row, encode_primitive) for row in obj]
+    if all(map(isfinite, values)):
+        return values
+    return list(map(encode_primitive, values))
@@ -0,0 +1,96 @@
+# (c) Copyright 2026 Palantir Technologies Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+# a parsed projection: sorted (identifier, nested projection) pairs, where a
+# nested projection of None keeps the whole field. Hashable, so that it can
+# be part of a decode plan's cache key.
+Projection = Tuple[Tuple[str, Any], ...]
+
+ProjectionSpec = Union[Iterable[str], Projection, None]
+
+_current_projection: ContextVar[Optional[Projection]] = ContextVar(
+    "conjure_decode_projection", default=None
+)
+
+
+def parse_projection(spec: ProjectionSpec) -> Optional[Projection]:
+    """Parses field paths such as ``["rid", "backingFileSystem.baseUri"]``
+    into a Projection.
+
+    Paths are made of the json identifiers of bean fields separated by dots.
+    Lists, maps and optionals are traversed transparently, so a path below a
+    ``list<Dataset>`` field selects fields of each dataset. A path below a
+    union field starts with the identifier of the union member.
+    """
+    if spec is None:
+        return None
+    paths: List[Any] = [spec] if isinstance(spec, str) else list(spec)
+    if all(isinstance(path, tuple) for path in paths):
+        # already parsed
+        return tuple(paths)
+    tree: Dict[str, Any] = {}
+    for path in paths:
+        node = tree
+        segments = path.split(".")
+        for index, segment in enumerate(segments):
+            last = index == len(segments) - 1
+            if segment in node and node[segment] is None:
+                # the whole field is already selected
+                break
+            if last:
+                node[segment] = None
+            else:
+                node = node.setdefault(segment, {})
+    return _freeze(tree)
+
+
+def _freeze(tree: Dict[str, Any]) -> Projection:
+    return tuple(
+        sorted(
+            (key, None if value is None else _freeze(value))
+            for key, value in tree.items()
+        )
+    )
+
+
+@contextmanager
+def decode_projection(spec: ProjectionSpec) -> Iterator[None]:
+    """Restricts every decode in this context which is not given an explicit
+    projection, e.g. the decode of a generated service call's response, to
+    the given field paths. Fields outside the projection are not decoded and
+    are set to their empty value: [] for lists, {} for maps and None
+    otherwise.
+    """
+    token = _current_projection.set(parse_projection(spec))
+    try:
+        yield
+    finally:
+        _current_projection.reset(token)
+
+
+def current_projection() -> Optional[Projection]:
+    return _current_projection.get()
@@ -0,0 +1,213 @@
+# (c) Copyright 2026 Palantir Technologies Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Any, Iterator, Optional, Union, IO
+import codecs
+import json
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = " \t\n\r"
+
+JsonSource = Union[str, bytes, bytearray, memoryview, IO[Any]]
+
+
+def read_fully(
+    stream: IO[bytes],
+    content_length: Optional[int] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> memoryview:
+    """Reads a binary stream to its end into a single buffer.
+
+    The buffer is preallocated to content_length and filled in place with
+    readinto where the stream supports it, so the body is copied exactly
+    once on its way from the stream to the returned view. Bodies longer than
+    content_length, e.g. bodies decompressed while reading, still read fully.
+
+    Args:
+        stream: the stream to read, e.g. the raw stream of a response
+        content_length: the expected number of bytes, if known
+        chunk_size: the number of bytes to read at a time when the length
+            is unknown or exceeded
+    """
+    buffer = bytearray(content_length or chunk_size)
+    size = 0
+    readinto = getattr(stream, "readinto", None)
+    while True:
+        if size == len(buffer):
+            data = stream.read(chunk_size)
+            if not data:
+                break
+            buffer += data
+            size += len(data)
+            buffer.extend(bytes(max(size, chunk_size)))
+            continue
+        if readinto is not None:
+            with memoryview(buffer) as view:
+                read = readinto(view[size:])
+        else:
+            data = stream.read(len(buffer) - size)
+            read = len(data)
+            buffer[size:size + read] = data
+        if not read:
+            break
+        size += read
+    return memoryview(buffer)[:size]
+
+
+class _BytesReader(object):
+    """Reads a bytes-like object in chunks, as views rather than copies."""
+
+    def __init__(self, data: Union[bytes, bytearray, memoryview]) -> None:
+        self._view = memoryview(data).cast("B")
+        self._offset = 0
+
+    def read(self, size: int) -> memoryview:
+        chunk = self._view[self._offset:self._offset + size]
+        self._offset += len(chunk)
+        return chunk
+
+
+class _TextReader(object):
+    """Reads text from a str, a bytes-like object or a readable stream of
+    either, decoding utf-8 incrementally. Bytes-like objects are decoded a
+    chunk at a time like streams, so that the whole text is never held."""
+
+    def __init__(self, source: JsonSource) -> None:
+        self._eof = False
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self._pending: Any = None
+        if isinstance(source, str):
+            self._pending = source
+            self._stream: Any = None
+        elif isinstance(source, (bytes, bytearray, memoryview)):
+            self._stream = _BytesReader(source)
+        else:
+            self._stream = source
+
+    @property
+    def eof(self) -> bool:
+        return self._eof
+
+    def read(self, size: int) -> str:
+        """Returns the next chunk of text, which is empty only at eof."""
+        if self._stream is None:
+            chunk, self._pending = self._pending or "", None
+            self._eof = True
+            return chunk
+        while True:
+            data = self._stream.read(size)
+            if not data:
+                self._eof = True
+                return self._utf8.decode(b"", final=True)
+            if isinstance(data, str):
+                return data
+            text = self._utf8.decode(data)
+            if text:
+                return text
+
+
+def iter_json_array(
+    source: JsonSource, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[Any]:
+    """Incrementally parses a json array, yielding its elements one at a time.
+
+    Only the element currently being parsed and at most a chunk of
+    unparsed text are held in memory, however large the array is.
+
+    Args:
+        source: the json text, either as a str, as utf-8 encoded bytes or
+            as a readable stream (e.g. a response's raw stream) of either.
+        chunk_size: the number of bytes or characters to read at a time
+    """
+    reader = _TextReader(source)
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+
+    def fill(size: int) -> bool:
+        # appends more text to the buffer, returning False at eof
+        nonlocal buffer, pos
+        chunk = reader.read(size)
+        if not chunk:
+            return False
+        buffer = buffer[pos:] + chunk
+        pos = 0
+        return True
+
+    def next_token() -> str:
+        # skips whitespace and returns the next character, or "" at eof
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos < len(buffer):
+                return buffer[pos]
+            if not fill(chunk_size):
+                return ""
+
+    if next_token() != "[":
+        raise Exception("expected a json array")
+    pos += 1
+    if next_token() == "]":
+        pos += 1
+    else:
+        read_size = chunk_size
+        while True:
+            try:
+                element, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if reader.eof:
+                    raise
+                complete = False
+            else:
+                delimiter = end
+                while (
+                    delimiter < len(buffer)
+                    and buffer[delimiter] in _WHITESPACE
+                ):
+                    delimiter += 1
+                # a value directly followed by the end of the buffer or
+                # by something other than its delimiter may be a number
+                # truncated by the chunking
+                complete = delimiter < len(buffer) and (
+                    delimiter > end or buffer[delimiter] in ",]"
+                )
+
+            if not complete and not reader.eof:
+                # grow reads so that large elements are not re-parsed
+                # from the start once per chunk
+                fill(read_size)
+                read_size *= 2
+                continue
+
+            if delimiter >= len(buffer):
+                raise Exception("unexpected end of json array")
+            if buffer[delimiter] not in ",]":
+                raise Exception(
+                    "expected ',' or ']' but found {!r}".format(
+                        buffer[delimiter]
+                    )
+                )
+
+            read_size = chunk_size
+            pos = delimiter + 1
+            yield element
+            if buffer[delimiter] == "]":
+                break
+            if next_token() == "":
+                raise Exception("unexpected end of json array")
+
+    if next_token() != "":
+        raise Exception("unexpected data after json array")
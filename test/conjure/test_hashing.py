@@ -0,0 +1,147 @@
+# (c) Copyright 2026 Palantir Technologies Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pickle
+import pytest
+from typing import Dict, List
+from conjure_python_client import (
+    ConjureBeanType,
+    ConjureDecoder,
+    ConjureFieldDefinition,
+    ConjureUnionType,
+    DictType,
+    ListType,
+    enable_hashing,
+)
+from conjure_python_client._lib.hashing import HASH_ATTRIBUTE
+
+
+class Tag(ConjureBeanType):
+    @classmethod
+    def _fields(cls) -> Dict[str, ConjureFieldDefinition]:
+        return {
+            "name": ConjureFieldDefinition("name", str),
+            "labels": ConjureFieldDefinition("labels", DictType(str, str)),
+        }
+
+    _name: str = None
+    _labels: Dict[str, str] = None
+
+    def __init__(self, name: str, labels: Dict[str, str]) -> None:
+        self._name = name
+        self._labels = labels
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def labels(self) -> Dict[str, str]:
+        return self._labels
+
+
+class Leaf(ConjureBeanType):
+    # as generated by conjure-python 4.4.0
+    __slots__: List[str] = ["_name"]
+
+    @classmethod
+    def _fields(cls) -> Dict[str, ConjureFieldDefinition]:
+        return {"name": ConjureFieldDefinition("name", str)}
+
+    def __init__(self, name: str) -> None:
+        self._name = name
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+
+class Target(ConjureUnionType):
+    _tag: Tag = None
+    _tags: List[Tag] = None
+
+    @classmethod
+    def _options(cls) -> Dict[str, ConjureFieldDefinition]:
+        return {
+            "tag": ConjureFieldDefinition("tag", Tag),
+            "tags": ConjureFieldDefinition("tags", ListType(Tag)),
+        }
+
+    def __init__(self, tag: Tag = None, tags: List[Tag] = None) -> None:
+        if tag is not None:
+            self._tag = tag
+            self._type = "tag"
+        elif tags is not None:
+            self._tags = tags
+            self._type = "tags"
+
+    @property
+    def tag(self) -> Tag:
+        return self._tag
+
+    @property
+    def tags(self) -> List[Tag]:
+        return self._tags
+
+
+enable_hashing(Target)
+enable_hashing(Leaf)
+
+
+def test_beans_hash_by_value():
+    first = Tag("a", {"k": "v"})
+    assert first == Tag("a", {"k": "v"})
+    assert first != Tag("a", {})
+    assert hash(first) == hash(Tag("a", {"k": "v"}))
+    assert len({first, Tag("a", {"k": "v"}), Tag("b", {})}) == 2
+
+
+def test_hash_is_cached_on_the_instance():
+    tag = Tag("a", {})
+    hash(tag)
+    assert getattr(tag, HASH_ATTRIBUTE) == hash(tag)
+    unpickled = pickle.loads(pickle.dumps(tag))
+    assert HASH_ATTRIBUTE not in vars(unpickled)
+    assert unpickled == tag
+
+
+def test_slotted_beans_pickle_their_fields():
+    leaf = Leaf("a")
+    hash(leaf)
+    unpickled = pickle.loads(pickle.dumps(leaf))
+    assert unpickled.name == "a"
+    assert HASH_ATTRIBUTE not in vars(unpickled)
+    assert unpickled == leaf
+
+
+def test_unions_hash_by_value():
+    assert Target(tags=[Tag("a", {})]) == Target(tags=[Tag("a", {})])
+    assert Target(tag=Tag("a", {})) != Target(tags=[Tag("a", {})])
+    assert len({Target(tag=Tag("a", {})), Target(tag=Tag("a", {}))}) == 1
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_decoded_beans_deduplicate(lazy):
+    decoded = ConjureDecoder(lazy=lazy).decode(
+        [{"name": "a"}, {"name": "a", "labels": {}}, {"name": "b"}],
+        ListType(Tag),
+    )
+    assert len(set(decoded)) == 2
+    assert decoded[0] == Tag("a", {})
+    assert Tag("a", {}) == decoded[0]
+
+
+def test_only_conjure_types_can_be_hashed():
+    with pytest.raises(ValueError):
+        enable_hashing(dict)
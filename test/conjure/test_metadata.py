@@ -0,0 +1,54 @@
+# (c) Copyright 2026 Palantir Technologies Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from unittest import mock
+from conjure_python_client._lib.metadata import (
+    bean_metadata,
+    bean_values_getter,
+)
+from test.example_service.product.datasets import BackingFileSystem, Dataset
+
+
+def test_bean_metadata_is_built_once_per_class():
+    metadata = bean_metadata(BackingFileSystem)
+    assert bean_metadata(BackingFileSystem) is metadata
+    assert bean_metadata(Dataset) is not metadata
+
+
+def test_bean_metadata_indexes_identifiers():
+    metadata = bean_metadata(BackingFileSystem)
+    assert metadata.attributes == (
+        "file_system_id",
+        "base_uri",
+        "configuration",
+    )
+    assert metadata.attribute_by_identifier == {
+        "fileSystemId": "file_system_id",
+        "baseUri": "base_uri",
+        "configuration": "configuration",
+    }
+
+
+def test_bean_values_getter_reads_fields_in_order():
+    get_values = bean_values_getter(Dataset)
+    assert get_values(Dataset("fs", "rid")) == ("fs", "rid")
+
+
+def test_bean_equality_does_not_rebuild_fields():
+    bean_metadata(Dataset)
+    with mock.patch.object(Dataset, "_fields", side_effect=AssertionError):
+        assert Dataset("fs", "rid") == Dataset("fs", "rid")
+        assert repr(Dataset("fs", "rid")) == (
+            "Dataset(file_system_id='fs', rid='rid')"
+        )
@@ -72,3 +72,34 @@ class SimpleService(Service):
 
         _decoder = ConjureDecoder()
         return _decoder.decode(_response.json(), str)
+
+
+class AsyncSimpleService(AsyncService):
+    async def testEndpoint(
+        self, string: str, decoration: List[str] = []
+    ) -> str:
+
+        _headers: Dict[str, Any] = {
+            "Accept": "application/json",
+            "Content-Type": "application/json",
+        }
+
+        _params: Dict[str, Any] = {"decoration": decoration}
+
+        _path_params: Dict[str, Any] = {}
+
+        _json: Any = ConjureEncoder().default(string)
+
+        _path = "/catalog/testEndpoint"
+        _path = _path.format(**_path_params)
+
+        _response = await self._request(
+            "POST",
+            self._uri + _path,
+            params=_params,
+            headers=_headers,
+            json=_json,
+        )
+
+        _decoder = ConjureDecoder()
+        return _decoder.decode(_response.json(), str)
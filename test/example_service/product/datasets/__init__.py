@@ -110,3 +110,68 @@ class MapExample(ConjureBeanType):
     @property
     def value(self) -> Dict[str, str]:
         return self._value
+
+
+class DatasetReference(ConjureUnionType):
+    _rid: Optional[str] = None
+    _path: Optional[str] = None
+    _dataset: Optional[Dataset] = None
+
+    @classmethod
+    def _options(cls) -> Dict[str, ConjureFieldDefinition]:
+        return {
+            "rid": ConjureFieldDefinition("rid", str),
+            "path": ConjureFieldDefinition("path", str),
+            "dataset": ConjureFieldDefinition("dataset", Dataset),
+        }
+
+    def __init__(
+        self,
+        rid: Optional[str] = None,
+        path: Optional[str] = None,
+        dataset: Optional[Dataset] = None,
+        type_of_union: Optional[str] = None,
+    ) -> None:
+        if type_of_union is None:
+            if (rid is not None) + (path is not None) + (
+                dataset is not None
+            ) != 1:
+                raise ValueError("a union must contain a single member")
+
+            if rid is not None:
+                self._rid = rid
+                self._type = "rid"
+            if path is not None:
+                self._path = path
+                self._type = "path"
+            if dataset is not None:
+                self._dataset = dataset
+                self._type = "dataset"
+
+        elif type_of_union == "rid":
+            if rid is None:
+                raise ValueError("a union value must not be None")
+            self._rid = rid
+            self._type = "rid"
+        elif type_of_union == "path":
+            if path is None:
+                raise ValueError("a union value must not be None")
+            self._path = path
+            self._type = "path"
+        elif type_of_union == "dataset":
+            if dataset is None:
+                raise ValueError("a union value must not be None")
+            self._dataset = dataset
+            self._type = "dataset"
+
+    @property
+    def rid(self) -> Optional[str]:
+        return self._rid
+
+    @property
+    def path(self) -> Optional[str]:
+        return self._path
+
+    @property
+    def dataset(self) -> Optional[Dataset]:
+        return self._dataset
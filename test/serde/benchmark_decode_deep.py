@@ -0,0 +1,106 @@
+# (c) Copyright 2026 Palantir Technologies Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compares the decoding of recursive types by the recursive plans, the
+depth safe plans which fall back to an explicit stack when the json is too
+deep for them, and the explicit stack alone. Run from the repository root:
+
+    python -m test.serde.benchmark_decode_deep
+"""
+
+import gc
+import sys
+import time
+from conjure_python_client import ConjureDecoder
+from conjure_python_client._serde.decoder import DecodeOptions
+from conjure_python_client._serde.iterative import iterative_decoder
+from test.serde.test_decode_deep import Chain
+from test.serde.test_decode_plan import TreeNode
+
+RUNS = 7
+
+
+class RecursiveDecoder(ConjureDecoder):
+    """Keeps its plans apart from the cached plans of ConjureDecoder."""
+
+
+def _tree(fanout, depth):
+    if not depth:
+        return {"name": "leaf", "children": []}
+    return {
+        "name": "node",
+        "children": [_tree(fanout, depth - 1) for _ in range(fanout)],
+    }
+
+
+def _chain(depth):
+    json = {"value": 0}
+    for value in range(1, depth):
+        json = {"value": value, "next": json}
+    return json
+
+
+CASES = [
+    ("4-ary tree, 21k nodes", TreeNode, _tree(4, 7)),
+    ("binary tree, 16k nodes", TreeNode, _tree(2, 13)),
+    ("chain, 2000 deep", Chain, _chain(2000)),
+]
+
+
+def _time(plan, json):
+    gc.collect()
+    started = time.perf_counter()
+    plan(json)
+    return time.perf_counter() - started
+
+
+def main():
+    deep = _chain(100000)
+    print(
+        "chain, 100k deep, at the default recursion limit: {:.1f}ms".format(
+            _time(ConjureDecoder.decode_plan(Chain), deep) * 1000
+        )
+    )
+    # the recursive plans need a deep stack for the chain
+    sys.setrecursionlimit(100000)
+    print(
+        "{:24} {:>10} {:>10} {:>10}".format(
+            "", "recursive", "depth safe", "stack"
+        )
+    )
+    options = DecodeOptions()
+    for name, obj_type, json in CASES:
+        plans = [
+            RecursiveDecoder._compile_plan(obj_type, options, {}),
+            ConjureDecoder.decode_plan(obj_type),
+            iterative_decoder(
+                ConjureDecoder._decode_node(obj_type, options, {}, {})
+            ),
+        ]
+        expected = repr(plans[0](json))
+        assert all(repr(plan(json)) == expected for plan in plans)
+        timings = [[] for _ in plans]
+        # interleaved, so that all plans see the same machine load
+        for _ in range(RUNS):
+            for plan, times in zip(plans, timings):
+                times.append(_time(plan, json))
+        print(
+            "{:24} {:>8.1f}ms {:>8.1f}ms {:>8.1f}ms".format(
+                name, *(min(times) * 1000 for times in timings)
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
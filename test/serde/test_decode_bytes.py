@@ -0,0 +1,62 @@
+# (c) Copyright 2026 Palantir Technologies Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import io
+import pytest
+from conjure_python_client import ConjureDecoder
+from conjure_python_client._serde.streaming import read_fully
+from test.example_service.product.datasets import Dataset
+
+BODY = '{"fileSystemId": "fs", "rid": "ri.é"}'.encode("utf-8")
+
+
+class _UnbufferedStream(object):
+    # a stream without readinto that returns short reads
+    def __init__(self, data):
+        self._data = io.BytesIO(data)
+
+    def read(self, size):
+        return self._data.read(min(size, 3))
+
+
+@pytest.mark.parametrize("backend", ["json", "orjson"])
+@pytest.mark.parametrize("wrap", [bytes, bytearray, memoryview])
+def test_bytes_like_values_decode(backend, wrap):
+    if backend == "orjson":
+        pytest.importorskip("orjson")
+    decoded = ConjureDecoder(backend).read_from_string(wrap(BODY), Dataset)
+    assert decoded == Dataset("fs", "ri.é")
+
+
+@pytest.mark.parametrize("content_length", [None, 0, 5, len(BODY), 1000])
+def test_read_fully(content_length):
+    body = read_fully(io.BytesIO(BODY), content_length, chunk_size=4)
+    assert body.tobytes() == BODY
+
+
+def test_read_fully_without_readinto():
+    body = read_fully(_UnbufferedStream(BODY), len(BODY))
+    assert body.tobytes() == BODY
+
+
+def test_read_fully_fills_preallocated_buffer():
+    body = read_fully(io.BytesIO(BODY), len(BODY))
+    assert len(body.obj) == len(BODY)
+
+
+def test_stream_decodes():
+    decoded = ConjureDecoder().read_from_stream(
+        io.BytesIO(BODY), Dataset, content_length=len(BODY)
+    )
+    assert decoded == Dataset("fs", "ri.é")
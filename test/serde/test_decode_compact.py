@@ -0,0 +1,134 @@
+# (c) Copyright 2026 Palantir Technologies Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Dict, List
+import pickle
+import pytest
+import sys
+from conjure_python_client import (
+    ConjureBeanType,
+    ConjureDecoder,
+    ConjureEncoder,
+    ConjureFieldDefinition,
+    ListType,
+)
+from test.example_service.product.datasets import BackingFileSystem
+
+
+class Leaf(ConjureBeanType):
+    # as generated by conjure-python 4.4.0
+    __slots__: List[str] = ["_name", "_size"]
+
+    @classmethod
+    def _fields(cls) -> Dict[str, ConjureFieldDefinition]:
+        return {
+            "name": ConjureFieldDefinition("name", str),
+            "size": ConjureFieldDefinition("size", int),
+        }
+
+    def __init__(self, name: str, size: int) -> None:
+        self._name = name
+        self._size = size
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+
+class Branch(Leaf):
+    # a field kept outside of the slots of the base
+    @classmethod
+    def _fields(cls) -> Dict[str, ConjureFieldDefinition]:
+        return dict(
+            super()._fields(), label=ConjureFieldDefinition("label", str)
+        )
+
+    _label: str = None
+
+    def __init__(self, name: str, size: int, label: str) -> None:
+        super().__init__(name, size)
+        self._label = label
+
+    @property
+    def label(self) -> str:
+        return self._label
+
+
+JSON = {
+    "fileSystemId": "fs",
+    "baseUri": "s3://bucket",
+    "configuration": {"a": "b"},
+}
+
+
+def test_compact_bean_stores_fields_in_slots():
+    decoded = ConjureDecoder(compact=True).decode(JSON, BackingFileSystem)
+    assert isinstance(decoded, BackingFileSystem)
+    assert type(decoded) is not BackingFileSystem
+    assert type(decoded).__slots__ == (
+        "_file_system_id",
+        "_base_uri",
+        "_configuration",
+    )
+    assert decoded.configuration == {"a": "b"}
+    assert decoded.__dict__ == {}
+
+
+def test_compact_bean_equality_and_repr():
+    eager = ConjureDecoder().decode(JSON, BackingFileSystem)
+    compact = ConjureDecoder(compact=True).decode(JSON, BackingFileSystem)
+    assert compact == eager
+    assert eager == compact
+    assert repr(compact) == repr(eager)
+
+
+def test_compact_bean_encodes_and_pickles():
+    compact = ConjureDecoder(compact=True).decode(
+        [JSON], ListType(BackingFileSystem)
+    )
+    assert ConjureEncoder.do_encode(compact) == [JSON]
+    assert ConjureEncoder.write_to_buffer(compact) == (
+        ConjureEncoder.write_to_buffer(
+            [BackingFileSystem("fs", "s3://bucket", {"a": "b"})]
+        )
+    )
+    unpickled = pickle.loads(pickle.dumps(compact[0]))
+    assert type(unpickled) is BackingFileSystem
+    assert unpickled == compact[0]
+
+
+def test_slotted_beans_do_not_grow():
+    decoded = ConjureDecoder(compact=True).decode(
+        {"name": "a", "size": 1}, Leaf
+    )
+    assert type(decoded) is Leaf
+    assert sys.getsizeof(decoded) == sys.getsizeof(Leaf("a", 1))
+
+
+def test_only_missing_slots_are_added():
+    decoded = ConjureDecoder(compact=True).decode(
+        {"name": "a", "size": 1, "label": "b"}, Branch
+    )
+    assert type(decoded).__slots__ == ("_label",)
+    assert (decoded.name, decoded.size, decoded.label) == ("a", 1, "b")
+    assert decoded.__dict__ == {}
+
+
+def test_compact_beans_cannot_be_lazy():
+    with pytest.raises(ValueError):
+        ConjureDecoder(lazy=True, compact=True)
@@ -0,0 +1,364 @@
+# (c) Copyright 2026 Palantir Technologies Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+from typing import Dict, List, Optional
+from conjure_python_client import (
+    ConjureBeanType,
+    ConjureDecoder,
+    ConjureFieldDefinition,
+    ConjureUnionType,
+    DictType,
+    ListType,
+    OptionalType,
+)
+from conjure_python_client._serde.iterative import is_recursive_type
+from test.example_service.product import CreateDatasetRequest
+from test.serde.test_decode_plan import TreeNode
+
+DEPTH = 10000
+
+
+class Link(ConjureBeanType):
+    @classmethod
+    def _fields(cls) -> Dict[str, ConjureFieldDefinition]:
+        return {
+            "value": ConjureFieldDefinition("value", int),
+            "next": ConjureFieldDefinition("next", OptionalType(Link)),
+        }
+
+    _value: int = None
+    _next: Optional["Link"] = None
+
+    def __init__(self, value: int, next: Optional["Link"] = None) -> None:
+        # not a generated constructor, so links are built bottom up
+        if value < 0:
+            raise ValueError("value must not be negative")
+        self._value = value
+        self._next = next
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+    @property
+    def next(self) -> Optional["Link"]:
+        return self._next
+
+
+class Chain(ConjureBeanType):
+    @classmethod
+    def _fields(cls) -> Dict[str, ConjureFieldDefinition]:
+        return {
+            "value": ConjureFieldDefinition("value", int),
+            "next": ConjureFieldDefinition("next", OptionalType(Chain)),
+        }
+
+    _value: int = None
+    _next: Optional["Chain"] = None
+
+    def __init__(self, value: int, next: Optional["Chain"] = None) -> None:
+        self._value = value
+        self._next = next
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+    @property
+    def next(self) -> Optional["Chain"]:
+        return self._next
+
+
+class SlottedChain(ConjureBeanType):
+    __slots__ = ("_value", "_next")
+
+    @classmethod
+    def _fields(cls) -> Dict[str, ConjureFieldDefinition]:
+        return {
+            "value": ConjureFieldDefinition("value", int),
+            "next": ConjureFieldDefinition(
+                "next", OptionalType(SlottedChain)
+            ),
+        }
+
+    def __init__(
+        self, value: int, next: Optional["SlottedChain"] = None
+    ) -> None:
+        self._value = value
+        self._next = next
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+    @property
+    def next(self) -> Optional["SlottedChain"]:
+        return self._next
+
+
+class Directory(ConjureBeanType):
+    @classmethod
+    def _fields(cls) -> Dict[str, ConjureFieldDefinition]:
+        return {
+            "entries": ConjureFieldDefinition(
+                "entries", DictType(str, Directory)
+            ),
+        }
+
+    _entries: Dict[str, "Directory"] = None
+
+    def __init__(self, entries: Dict[str, "Directory"]) -> None:
+        self._entries = entries
+
+    @property
+    def entries(self) -> Dict[str, "Directory"]:
+        return self._entries
+
+
+class Negation(ConjureBeanType):
+    @classmethod
+    def _fields(cls) -> Dict[str, ConjureFieldDefinition]:
+        return {
+            "operand": ConjureFieldDefinition("operand", Expression),
+        }
+
+    _operand: "Expression" = None
+
+    def __init__(self, operand: "Expression") -> None:
+        self._operand = operand
+
+    @property
+    def operand(self) -> "Expression":
+        return self._operand
+
+
+class Expression(ConjureUnionType):
+    _literal: int = None
+    _negation: Negation = None
+    _sum: List["Expression"] = None
+
+    @classmethod
+    def _options(cls) -> Dict[str, ConjureFieldDefinition]:
+        return {
+            "literal": ConjureFieldDefinition("literal", int),
+            "negation": ConjureFieldDefinition("negation", Negation),
+            "sum": ConjureFieldDefinition("sum", ListType(Expression)),
+        }
+
+    def __init__(
+        self,
+        literal: int = None,
+        negation: Negation = None,
+        sum: List["Expression"] = None,
+    ) -> None:
+        if literal is not None:
+            self._literal = literal
+            self._type = "literal"
+        elif negation is not None:
+            self._negation = negation
+            self._type = "negation"
+        elif sum is not None:
+            self._sum = sum
+            self._type = "sum"
+
+    @property
+    def literal(self) -> int:
+        return self._literal
+
+    @property
+    def negation(self) -> Negation:
+        return self._negation
+
+    @property
+    def sum(self) -> List["Expression"]:
+        return self._sum
+
+
+def _chain(depth, wrap, leaf):
+    # built without recursion
+    obj = leaf
+    for index in range(depth):
+        obj = wrap(obj, index)
+    return obj
+
+
+def test_recursive_types_are_detected():
+    assert is_recursive_type(TreeNode)
+    assert is_recursive_type(ListType(Expression))
+    assert is_recursive_type(Negation)
+    assert not is_recursive_type(CreateDatasetRequest)
+    assert not is_recursive_type(ListType(str))
+
+
+def test_deep_tree_decodes():
+    obj = _chain(
+        DEPTH,
+        lambda child, index: {"name": str(index), "children": [child]},
+        {"name": "leaf"},
+    )
+    node = ConjureDecoder().decode(obj, TreeNode)
+    depth = 0
+    while node.children:
+        assert node.name == str(DEPTH - 1 - depth)
+        (node,) = node.children
+        depth += 1
+    assert depth == DEPTH
+    assert node.name == "leaf"
+
+
+def test_deep_optional_chain_calls_constructors():
+    obj = _chain(
+        DEPTH,
+        lambda child, index: {"value": index + 1, "next": child},
+        {"value": 0},
+    )
+    link = ConjureDecoder().decode(obj, Link)
+    for expected in range(DEPTH, -1, -1):
+        assert type(link) is Link
+        assert link.value == expected
+        link = link.next
+    assert link is None
+
+
+def test_deep_maps_decode():
+    obj = _chain(
+        DEPTH,
+        lambda child, index: {"entries": {"a": {"entries": {}}, "b": child}},
+        {"entries": {}},
+    )
+    directory = ConjureDecoder().decode(obj, Directory)
+    for _ in range(DEPTH):
+        assert list(directory.entries) == ["a", "b"]
+        directory = directory.entries["b"]
+    assert directory.entries == {}
+
+
+def test_deep_unions_decode():
+    obj = _chain(
+        DEPTH,
+        lambda child, index: {
+            "type": "negation",
+            "negation": {
+                "operand": {
+                    "type": "sum",
+                    "sum": [{"type": "literal", "literal": index}, child],
+                }
+            },
+        },
+        {"type": "literal", "literal": -1},
+    )
+    expression = ConjureDecoder().decode(obj, Expression)
+    for index in range(DEPTH - 1, -1, -1):
+        literal, expression = expression.negation.operand.sum
+        assert literal.literal == index
+    assert expression.literal == -1
+
+
+@pytest.mark.parametrize("depth", [50, DEPTH])
+def test_order_is_kept_at_any_depth(depth):
+    def wrap(child, index):
+        siblings = [{"name": "{}.{}".format(index, i)} for i in range(3)]
+        return {"name": str(index), "children": siblings + [child]}
+
+    obj = _chain(depth, wrap, {"name": "leaf"})
+    decoded = ConjureDecoder().decode(obj, TreeNode)
+    for index in range(depth - 1, -1, -1):
+        assert [child.name for child in decoded.children[:3]] == [
+            "{}.{}".format(index, i) for i in range(3)
+        ]
+        decoded = decoded.children[3]
+    assert decoded == TreeNode("leaf", [])
+
+
+def test_errors_surface_from_deep_values():
+    obj = _chain(
+        DEPTH,
+        lambda child, index: {"value": 1, "next": child},
+        {"value": -1},
+    )
+    with pytest.raises(ValueError):
+        ConjureDecoder().decode(obj, Link)
+    obj = _chain(
+        DEPTH,
+        lambda child, index: {"name": "a", "children": [child]},
+        {"children": []},
+    )
+    with pytest.raises(Exception) as e:
+        ConjureDecoder().decode(obj, TreeNode)
+    assert e.match("field name not found")
+
+
+def test_unknown_deep_union_types():
+    obj = _chain(
+        DEPTH,
+        lambda child, index: {"type": "sum", "sum": [child]},
+        {"type": "product"},
+    )
+    with pytest.raises(ValueError):
+        ConjureDecoder().decode(obj, Expression)
+    expression = ConjureDecoder().decode(obj, Expression, True)
+    for _ in range(DEPTH):
+        (expression,) = expression.sum
+    assert expression is None
+
+
+@pytest.mark.parametrize(
+    "chain_type,compact",
+    [(Chain, True), (SlottedChain, False), (SlottedChain, True)],
+)
+def test_chains_of_beans_in_slots_decode(chain_type, compact):
+    obj = _chain(
+        DEPTH,
+        lambda child, index: {"value": index + 1, "next": child},
+        {"value": 0},
+    )
+    link = ConjureDecoder(compact=compact).decode(obj, chain_type)
+    for expected in range(DEPTH, -1, -1):
+        assert isinstance(link, chain_type)
+        assert not hasattr(link, "__dict__") or not link.__dict__
+        assert link.value == expected
+        link = link.next
+    assert link is None
+
+
+def test_compact_maps_and_unions_decode():
+    obj = _chain(
+        DEPTH,
+        lambda child, index: {"entries": {"a": {"entries": {}}, "b": child}},
+        {"entries": {}},
+    )
+    directory = ConjureDecoder(compact=True).decode(obj, Directory)
+    for _ in range(DEPTH):
+        assert list(directory.entries) == ["a", "b"]
+        directory = directory.entries["b"]
+    assert directory.entries == {}
+    negation = ConjureDecoder(compact=True).decode(
+        {"operand": {"type": "literal", "literal": 1}}, Negation
+    )
+    assert negation.operand.literal == 1
+
+
+def test_deep_interned_beans_are_shared():
+    obj = _chain(
+        DEPTH,
+        lambda child, index: {"entries": {"a": {"entries": {}}, "b": child}},
+        {"entries": {}},
+    )
+    directory = ConjureDecoder(intern_beans=True).decode(obj, Directory)
+    empty = directory.entries["a"]
+    for _ in range(DEPTH):
+        assert directory.entries["a"] is empty
+        directory = directory.entries["b"]
+    assert directory is empty
@@ -0,0 +1,129 @@
+# (c) Copyright 2026 Palantir Technologies Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from typing import Any, Dict
+import json
+import pytest
+from conjure_python_client import (
+    ConjureBeanType,
+    ConjureDecoder,
+    ConjureFieldDefinition,
+    DictType,
+    ListType,
+)
+from test.example_service.product.datasets import BackingFileSystem
+
+
+class Point(ConjureBeanType):
+    @classmethod
+    def _fields(cls) -> Dict[str, ConjureFieldDefinition]:
+        return {
+            "x": ConjureFieldDefinition("x", float),
+            "a": ConjureFieldDefinition("a", object),
+        }
+
+    _x: float = None
+    _a: Any = None
+
+    def __init__(self, x: float, a: Any) -> None:
+        self._x = x
+        self._a = a
+
+    @property
+    def x(self) -> float:
+        return self._x
+
+    @property
+    def a(self) -> Any:
+        return self._a
+
+
+def _fresh(value):
+    # json.loads returns distinct string objects for repeated values
+    return json.loads(json.dumps(value))
+
+
+def test_strings_are_interned():
+    decoded = ConjureDecoder(intern=True).decode(
+        _fresh(["x" * 20, "x" * 20]), ListType(str)
+    )
+    assert decoded[0] is decoded[1]
+
+
+def test_map_keys_and_values_are_interned():
+    decoded = ConjureDecoder(intern=True).decode(
+        _fresh([{"key" * 10: "value" * 10}, {"key" * 10: "value" * 10}]),
+        ListType(DictType(str, str)),
+    )
+    (first_key, first_value), = decoded[0].items()
+    (second_key, second_value), = decoded[1].items()
+    assert first_key is second_key
+    assert first_value is second_value
+
+
+def test_strings_are_not_interned_by_default():
+    decoded = ConjureDecoder().decode(
+        _fresh(["x" * 20, "x" * 20]), ListType(str)
+    )
+    assert decoded[0] is not decoded[1]
+
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_equal_beans_are_shared(compact):
+    file_system = {
+        "fileSystemId": "fs",
+        "baseUri": "s3://bucket",
+        "configuration": {"a": "b"},
+    }
+    other = dict(file_system, baseUri="s3://other")
+    decoded = ConjureDecoder(intern_beans=True, compact=compact).decode(
+        _fresh([file_system, other, file_system]), ListType(BackingFileSystem)
+    )
+    assert decoded[0] is decoded[2]
+    assert decoded[0] is not decoded[1]
+    assert decoded[1].base_uri == "s3://other"
+
+
+def test_beans_are_shared_within_a_decode_only():
+    decoder = ConjureDecoder(intern_beans=True)
+    file_system = {"fileSystemId": "fs", "baseUri": "uri"}
+    first = decoder.decode(file_system, BackingFileSystem)
+    assert first is not decoder.decode(file_system, BackingFileSystem)
+    assert list(decoder.iter_decode_list("[{}, {}]".format(
+        json.dumps(file_system), json.dumps(file_system)
+    ), BackingFileSystem)) == [first, first]
+
+
+def test_beans_of_equal_values_of_other_types_are_not_shared():
+    decoded = ConjureDecoder(intern_beans=True).decode(
+        [
+            {"x": 0.0, "a": 1},
+            {"x": -0.0, "a": True},
+            {"x": 0.0, "a": 1.0},
+            {"x": 0.0, "a": 1},
+        ],
+        ListType(Point),
+    )
+    assert [(str(point.x), repr(point.a)) for point in decoded] == [
+        ("0.0", "1"),
+        ("-0.0", "True"),
+        ("0.0", "1.0"),
+        ("0.0", "1"),
+    ]
+    assert decoded[0] is decoded[3]
+
+
+def test_lazy_beans_cannot_be_interned():
+    with pytest.raises(ValueError):
+        ConjureDecoder(lazy=True, intern_beans=True)
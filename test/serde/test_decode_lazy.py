@@ -0,0 +1,75 @@
+# (c) Copyright 2026 Palantir Technologies Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pickle
+import pytest
+from conjure_python_client import ConjureDecoder, ConjureEncoder, ListType
+from test.example_service.product.datasets import (
+    BackingFileSystem,
+    ListExample,
+)
+
+JSON = {
+    "fileSystemId": "fs",
+    "baseUri": "s3://bucket",
+    "configuration": {"a": "b"},
+}
+
+
+def test_lazy_bean_decodes_fields_on_access():
+    decoded = ConjureDecoder(lazy=True).decode(JSON, BackingFileSystem)
+    assert isinstance(decoded, BackingFileSystem)
+    assert "_configuration" not in decoded.__dict__
+    assert decoded.configuration == {"a": "b"}
+    assert decoded.__dict__["_configuration"] == {"a": "b"}
+    assert decoded.configuration is decoded.configuration
+
+
+def test_lazy_bean_field_errors_surface_on_access():
+    decoded = ConjureDecoder(lazy=True).decode(
+        dict(JSON, configuration=[]), BackingFileSystem
+    )
+    assert decoded.file_system_id == "fs"
+    with pytest.raises(Exception):
+        decoded.configuration
+
+
+def test_lazy_bean_missing_required_field_fails_on_decode():
+    with pytest.raises(Exception) as e:
+        ConjureDecoder(lazy=True).decode({"baseUri": "u"}, BackingFileSystem)
+    assert e.match("field fileSystemId not found")
+
+
+def test_lazy_bean_fills_absent_collections():
+    decoded = ConjureDecoder(lazy=True).decode({}, ListExample)
+    assert decoded.value == []
+
+
+def test_lazy_bean_equality_and_repr():
+    eager = ConjureDecoder().decode(JSON, BackingFileSystem)
+    lazy = ConjureDecoder(lazy=True).decode(JSON, BackingFileSystem)
+    assert lazy == eager
+    assert eager == lazy
+    assert not lazy != eager
+    assert repr(lazy) == repr(eager)
+
+
+def test_lazy_bean_encodes_and_pickles():
+    lazy = ConjureDecoder(lazy=True).decode(
+        [JSON], ListType(BackingFileSystem)
+    )
+    assert ConjureEncoder.do_encode(lazy) == [JSON]
+    unpickled = pickle.loads(pickle.dumps(lazy[0]))
+    assert type(unpickled) is BackingFileSystem
+    assert unpickled == lazy[0]
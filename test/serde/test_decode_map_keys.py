@@ -0,0 +1,78 @@
+# (c) Copyright 2026 Palantir Technologies Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import math
+import pytest
+from typing import Dict
+from unittest import mock
+from conjure_python_client import (
+    ConjureDecoder,
+    ConjureEncoder,
+    DictType,
+    ListType,
+)
+from test.conjure.test_hashing import Tag
+
+
+def test_integer_keys_are_converted_without_json():
+    with mock.patch("json.loads", side_effect=AssertionError):
+        decoded = ConjureDecoder().decode(
+            {"1": "a", "-20": "b"}, DictType(int, str)
+        )
+    assert decoded == {1: "a", -20: "b"}
+    assert list(decoded) == [1, -20]
+
+
+def test_double_and_boolean_keys_are_converted():
+    decoded = ConjureDecoder().decode(
+        {"1": 1, "2.5": 2, "NaN": 3}, Dict[float, int]
+    )
+    assert list(decoded)[:2] == [1.0, 2.5]
+    assert type(list(decoded)[0]) is float
+    assert math.isnan(list(decoded)[2])
+    assert ConjureDecoder().decode(
+        {"true": ["a"], "false": []}, DictType(bool, ListType(str))
+    ) == {True: ["a"], False: []}
+
+
+@pytest.mark.parametrize(
+    "value,obj_type",
+    [
+        ({"1.5": "a"}, DictType(int, str)),
+        ({"a": "b"}, DictType(int, str)),
+        ({"1": "b"}, DictType(bool, str)),
+        ({"1": 1.5}, DictType(int, int)),
+    ],
+)
+def test_mistyped_keys_fail(value, obj_type):
+    with pytest.raises(Exception):
+        ConjureDecoder().decode(value, obj_type)
+
+
+def test_json_encoded_keys_are_parsed_once():
+    encoded = ConjureEncoder().default(Tag("a", {"k": "v"}))
+    value = {json.dumps(encoded): 1}
+    obj_type = DictType(Tag, int)
+    decoder = ConjureDecoder()
+    assert decoder.decode(value, obj_type) == {Tag("a", {"k": "v"}): 1}
+    with mock.patch("json.loads", side_effect=AssertionError):
+        assert len(decoder.decode(value, obj_type)) == 1
+
+
+def test_large_integer_keyed_map():
+    value = {str(index): index * 0.5 for index in range(100000)}
+    decoded = ConjureDecoder().decode(value, DictType(int, float))
+    assert len(decoded) == 100000
+    assert decoded[99999] == 49999.5
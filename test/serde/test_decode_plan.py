@@ -0,0 +1,145 @@
+# (c) Copyright 2026 Palantir Technologies Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+from typing import Dict, List
+from unittest import mock
+from conjure_python_client import (
+    ConjureBeanType,
+    ConjureDecoder,
+    ConjureFieldDefinition,
+    DictType,
+    ListType,
+    OptionalType,
+)
+from conjure_python_client._serde.construct import has_simple_init
+from test.example_service.product import CreateDatasetRequest
+
+
+class TreeNode(ConjureBeanType):
+    @classmethod
+    def _fields(cls) -> Dict[str, ConjureFieldDefinition]:
+        return {
+            "name": ConjureFieldDefinition("name", str),
+            "children": ConjureFieldDefinition("children", ListType(TreeNode)),
+        }
+
+    _name: str = None
+    _children: List["TreeNode"] = None
+
+    def __init__(self, name: str, children: List["TreeNode"]) -> None:
+        self._name = name
+        self._children = children
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def children(self) -> List["TreeNode"]:
+        return self._children
+
+
+def test_decode_plan_is_cached_per_type():
+    plan = ConjureDecoder.decode_plan(ListType(CreateDatasetRequest))
+    assert ConjureDecoder.decode_plan(ListType(CreateDatasetRequest)) is plan
+    assert ConjureDecoder.decode_plan(List[CreateDatasetRequest]) is not plan
+
+
+def test_decode_plan_decodes_beans():
+    plan = ConjureDecoder.decode_plan(ListType(CreateDatasetRequest))
+    decoded = plan([{"fileSystemId": "foo", "path": "bar"}])
+    assert decoded == [CreateDatasetRequest("foo", "bar")]
+
+
+def test_decode_plan_supports_recursive_types():
+    decoded = ConjureDecoder().read_from_string(
+        '{"name": "a", "children": [{"name": "b"}]}', TreeNode
+    )
+    assert decoded == TreeNode("a", [TreeNode("b", [])])
+
+
+def test_container_types_compare_structurally():
+    assert ListType(str) == ListType(str)
+    assert hash(DictType(str, int)) == hash(DictType(str, int))
+    assert OptionalType(str) != OptionalType(int)
+    assert ListType(str) != OptionalType(str)
+
+
+class ValidatingNode(TreeNode):
+    def __init__(self, name: str, children: List["TreeNode"]) -> None:
+        if not name:
+            raise ValueError("name must not be empty")
+        super().__init__(name.upper(), children)
+
+
+def test_generated_constructors_are_bypassed():
+    assert has_simple_init(TreeNode)
+    with mock.patch.object(TreeNode, "__init__", side_effect=AssertionError):
+        decoded = ConjureDecoder().decode({"name": "a"}, TreeNode)
+    assert decoded == TreeNode("a", [])
+    assert vars(decoded) == vars(TreeNode("a", []))
+
+
+def test_custom_constructors_are_called():
+    assert not has_simple_init(ValidatingNode)
+    decoded = ConjureDecoder().decode({"name": "a"}, ValidatingNode)
+    assert decoded.name == "A"
+
+
+def test_missing_required_field_raises():
+    with pytest.raises(Exception) as e:
+        ConjureDecoder().decode({"children": []}, TreeNode)
+    assert e.match("field name not found")
+
+
+@pytest.mark.parametrize("node_type", [TreeNode, ValidatingNode])
+def test_non_object_json_fails_as_before(node_type):
+    with pytest.raises(Exception) as e:
+        ConjureDecoder().decode(["children"], node_type)
+    assert e.match("field name not found in object")
+    with pytest.raises(TypeError):
+        ConjureDecoder().decode(1, node_type)
+
+
+class UpperCaseDecoder(ConjureDecoder):
+    @classmethod
+    def decode_primitive(cls, obj, object_type):
+        return super().decode_primitive(obj, object_type).upper()
+
+
+class CountingDecoder(ConjureDecoder):
+    beans: List[type] = []
+
+    @classmethod
+    def decode_conjure_bean_type(
+        cls, obj, conjure_type, return_none_for_unknown_union_types=False
+    ):
+        cls.beans.append(conjure_type)
+        return super().decode_conjure_bean_type(
+            obj, conjure_type, return_none_for_unknown_union_types
+        )
+
+
+def test_overridden_hooks_are_called():
+    obj = {"name": "a", "children": [{"name": "b"}]}
+    assert UpperCaseDecoder().decode(obj, TreeNode) == TreeNode(
+        "A", [TreeNode("B", [])]
+    )
+    assert UpperCaseDecoder.do_decode("c", str) == "C"
+    assert CountingDecoder.do_decode(obj, TreeNode) == TreeNode(
+        "a", [TreeNode("b", [])]
+    )
+    assert CountingDecoder.beans == [TreeNode, TreeNode]
+    assert ConjureDecoder().decode(obj, TreeNode).name == "a"
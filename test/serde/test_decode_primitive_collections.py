@@ -0,0 +1,71 @@
+# (c) Copyright 2026 Palantir Technologies Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import math
+import pytest
+from typing import Dict, List
+from conjure_python_client import ConjureDecoder, DictType, ListType
+
+
+def test_float_list_decodes_conjure_strings():
+    decoded = ConjureDecoder().read_from_string(
+        '[1, 2.5, "NaN", "Infinity", "-Infinity"]', ListType(float)
+    )
+    assert decoded[:2] == [1.0, 2.5]
+    assert type(decoded[0]) is float
+    assert math.isnan(decoded[2])
+    assert decoded[3:] == [float("inf"), -float("inf")]
+
+
+@pytest.mark.parametrize(
+    "value,obj_type",
+    [
+        (["a", "b"], ListType(str)),
+        (["a", "b"], List[str]),
+        ([1, True], ListType(int)),
+        ([True, False], ListType(bool)),
+        ({"a": "b"}, DictType(str, str)),
+        ({"a": 1}, Dict[str, int]),
+    ],
+)
+def test_primitive_collections_decode_to_copies(value, obj_type):
+    decoded = ConjureDecoder().decode(value, obj_type)
+    assert decoded == value
+    assert decoded is not value
+
+
+@pytest.mark.parametrize(
+    "value,obj_type",
+    [
+        (["a", 1], ListType(str)),
+        ([1, 1.5], ListType(int)),
+        ([1], ListType(bool)),
+        (["a"], ListType(float)),
+        ({"a": 1}, DictType(str, str)),
+        ({"a": "b"}, DictType(str, float)),
+        ("a", ListType(str)),
+        (["a"], DictType(str, str)),
+    ],
+)
+def test_mistyped_primitive_collections_fail(value, obj_type):
+    with pytest.raises(Exception):
+        ConjureDecoder().decode(value, obj_type)
+
+
+def test_float_map_decodes():
+    decoded = ConjureDecoder().decode(
+        {"a": 1, "b": "NaN"}, DictType(str, float)
+    )
+    assert decoded["a"] == 1.0 and type(decoded["a"]) is float
+    assert math.isnan(decoded["b"])
@@ -0,0 +1,101 @@
+# (c) Copyright 2026 Palantir Technologies Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+from unittest import mock
+from conjure_python_client import (
+    ConjureDecoder,
+    ListType,
+    decode_projection,
+)
+from conjure_python_client._serde import decoder
+from conjure_python_client._serde.projection import parse_projection
+from test.example_service.product.datasets import (
+    BackingFileSystem,
+    Dataset,
+    DatasetReference,
+)
+
+FILE_SYSTEMS = [
+    {"fileSystemId": "fs", "baseUri": "s3://a", "configuration": {"a": "b"}},
+    {"fileSystemId": "fs2", "baseUri": 1, "configuration": "not a map"},
+]
+
+
+def test_parse_projection():
+    assert parse_projection(["a.b", "a.c", "d"]) == (
+        ("a", (("b", None), ("c", None))),
+        ("d", None),
+    )
+    assert parse_projection(["a.b", "a"]) == (("a", None),)
+    assert parse_projection("a") == (("a", None),)
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_projection_skips_unselected_fields(lazy):
+    decoded = ConjureDecoder(lazy=lazy).decode(
+        FILE_SYSTEMS,
+        ListType(BackingFileSystem),
+        projection=["fileSystemId"],
+    )
+    assert decoded == [
+        BackingFileSystem("fs", None, {}),
+        BackingFileSystem("fs2", None, {}),
+    ]
+
+
+def test_projection_selects_within_union_members():
+    decoded = ConjureDecoder().decode(
+        {"type": "dataset", "dataset": {"rid": "ri.1"}},
+        DatasetReference,
+        projection=["dataset.rid"],
+    )
+    assert decoded == DatasetReference(dataset=Dataset(None, "ri.1"))
+
+
+def test_projection_with_unknown_field_fails():
+    with pytest.raises(ValueError) as e:
+        ConjureDecoder().decode(
+            FILE_SYSTEMS, ListType(BackingFileSystem), False, ["fileSystemID"]
+        )
+    assert e.match("unknown fields")
+
+
+def test_projection_context_applies_to_decode():
+    with decode_projection(["rid"]):
+        decoded = ConjureDecoder().read_from_string(
+            '{"fileSystemId": 1, "rid": "ri.1"}', Dataset
+        )
+    assert decoded == Dataset(None, "ri.1")
+    with pytest.raises(Exception):
+        ConjureDecoder().read_from_string(
+            '{"fileSystemId": 1, "rid": "ri.1"}', Dataset
+        )
+
+
+def test_projected_plans_are_bounded():
+    decoder._PROJECTED_PLANS.clear()
+    with mock.patch.object(decoder, "PROJECTED_PLAN_CACHE_SIZE", 2):
+        for field in ["fileSystemId", "baseUri", "configuration"]:
+            ConjureDecoder().decode(
+                FILE_SYSTEMS[:1],
+                ListType(BackingFileSystem),
+                projection=[field],
+            )
+    assert [
+        options.projection for _, _, options in decoder._PROJECTED_PLANS
+    ] == [(("baseUri", None),), (("configuration", None),)]
+    assert all(
+        options.projection is None for _, _, options in decoder._DECODE_PLANS
+    )
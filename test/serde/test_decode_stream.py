@@ -0,0 +1,105 @@
+# (c) Copyright 2026 Palantir Technologies Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import io
+import json
+import pytest
+from typing import List
+from unittest import mock
+from conjure_python_client import ConjureDecoder, ListType
+from conjure_python_client._serde import decoder
+from test.example_service.product.datasets import Dataset
+
+
+VALUES = [
+    [1, 2.5, -3e10, True, None, "café ☃", [], {}],
+    [{"a": [1, {"b": "c"}]}, "x,y]", 123456789],
+]
+
+
+@pytest.mark.parametrize("value", VALUES)
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 4096])
+def test_stream_yields_each_element(value, chunk_size):
+    encoded = json.dumps(value, indent=1).encode("utf-8")
+    decoded = ConjureDecoder().iter_decode_list(
+        io.BytesIO(encoded), object, chunk_size=chunk_size
+    )
+    assert list(decoded) == value
+
+
+@pytest.mark.parametrize("wrap", [bytes, bytearray, memoryview])
+@pytest.mark.parametrize("chunk_size", [1, 2, 7])
+def test_bytes_are_decoded_in_chunks(wrap, chunk_size):
+    encoded = json.dumps(VALUES[0], ensure_ascii=False).encode("utf-8")
+    decoded = ConjureDecoder().iter_decode_list(
+        wrap(encoded), object, chunk_size=chunk_size
+    )
+    assert list(decoded) == VALUES[0]
+    # elements before invalid utf-8 are yielded before it is reached
+    decoded = ConjureDecoder().iter_decode_list(
+        wrap(b'[1, 2, "\xff"]'), object, chunk_size=chunk_size
+    )
+    assert next(decoded) == 1
+    with pytest.raises(UnicodeDecodeError):
+        list(decoded)
+
+
+@pytest.mark.parametrize("list_type", [ListType(Dataset), List[Dataset]])
+def test_lists_are_read_from_streams_incrementally(list_type):
+    encoded = (
+        b'[{"fileSystemId": "fs", "rid": "ri.1"},'
+        b' {"fileSystemId": "fs", "rid": "ri.2"}]'
+    )
+    with mock.patch.object(
+        decoder, "read_fully", side_effect=AssertionError
+    ):
+        decoded = ConjureDecoder().read_from_stream(
+            io.BytesIO(encoded), list_type
+        )
+    assert decoded == [Dataset("fs", "ri.1"), Dataset("fs", "ri.2")]
+    decoded = ConjureDecoder(numeric_arrays="array").read_from_stream(
+        io.BytesIO(b"[1.5, 2]"), ListType(float)
+    )
+    assert decoded.tolist() == [1.5, 2.0]
+
+
+def test_stream_decodes_from_string():
+    decoded = ConjureDecoder().iter_decode_list(
+        '[{"fileSystemId": "fs", "rid": "ri.1"}]', Dataset
+    )
+    assert list(decoded) == [Dataset("fs", "ri.1")]
+
+
+def test_stream_decodes_lazily():
+    stream = io.BytesIO(b'[[1], [2], "not an int list"]')
+    decoded = ConjureDecoder().iter_decode_list(
+        stream, ListType(int), chunk_size=4
+    )
+    assert next(decoded) == [1]
+    assert stream.tell() < len(stream.getvalue())
+    assert next(decoded) == [2]
+    with pytest.raises(Exception):
+        next(decoded)
+
+
+def test_stream_of_empty_array():
+    assert list(ConjureDecoder().iter_decode_list(" [ ] ", int)) == []
+
+
+@pytest.mark.parametrize(
+    "value", ["{}", "null", "[1, 2", "[1 2]", "[1] 2", "[1,]", ""]
+)
+def test_stream_of_invalid_array_fails(value):
+    with pytest.raises(Exception):
+        list(ConjureDecoder().iter_decode_list(io.StringIO(value), object))
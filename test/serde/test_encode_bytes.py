@@ -0,0 +1,68 @@
+# (c) Copyright 2026 Palantir Technologies Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import pytest
+from array import array
+from conjure_python_client import ConjureEncoder
+from test.example_service.product import CreateDatasetRequest
+from test.example_service.product.datasets import (
+    Dataset,
+    DatasetReference,
+    ListExample,
+    MapExample,
+)
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        CreateDatasetRequest('fé "s"', "path"),
+        [
+            DatasetReference(rid="ri"),
+            DatasetReference(dataset=Dataset("a", "b")),
+        ],
+        [ListExample([]), MapExample({}), MapExample({"a": "b"})],
+        {1: [1.5, float("nan")], None: -float("inf"), 2.5: True},
+        array("d", [1.0, float("inf")]),
+        ("a", 1, None, False, 1e300),
+        [],
+        {},
+    ],
+)
+def test_write_to_buffer_matches_json_dumps(value):
+    expected = json.dumps(ConjureEncoder.do_encode(value), allow_nan=False)
+    assert ConjureEncoder.write_to_buffer(value) == expected.encode("utf-8")
+
+
+def test_write_to_buffer_appends():
+    buffer = bytearray(b"[")
+    assert ConjureEncoder.write_to_buffer("a", buffer) is buffer
+    assert buffer == b'["a"'
+
+
+def test_write_to_buffer_rejects_unknown_values():
+    with pytest.raises(TypeError):
+        ConjureEncoder.write_to_buffer([object()])
+
+
+def test_iter_encode_list_yields_chunks():
+    beans = (CreateDatasetRequest("fs", str(i)) for i in range(100))
+    chunks = list(ConjureEncoder.iter_encode_list(beans, chunk_size=256))
+    assert len(chunks) > 1
+    assert all(len(chunk) < 256 + 64 for chunk in chunks)
+    assert json.loads(b"".join(chunks)) == [
+        {"fileSystemId": "fs", "path": str(i)} for i in range(100)
+    ]
+    assert b"".join(ConjureEncoder.iter_encode_list([])) == b"[]"
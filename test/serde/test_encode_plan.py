@@ -0,0 +1,96 @@
+# (c) Copyright 2026 Palantir Technologies Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from unittest import mock
+from conjure_python_client import ConjureEncoder
+from test.example_service.product import CreateDatasetRequest
+from test.example_service.product.datasets import (
+    Dataset,
+    DatasetReference,
+    ListExample,
+    MapExample,
+)
+import json
+
+
+def test_encode_plan_is_cached_per_class():
+    plan = ConjureEncoder.encode_plan(Dataset)
+    assert ConjureEncoder.encode_plan(Dataset) is plan
+    assert ConjureEncoder.encode_plan(CreateDatasetRequest) is not plan
+
+
+def test_encode_plan_does_not_walk_fields_per_bean():
+    ConjureEncoder.do_encode(CreateDatasetRequest("fs", "path"))
+    with mock.patch.object(
+        CreateDatasetRequest, "_fields", side_effect=AssertionError
+    ):
+        encoded = ConjureEncoder.do_encode(
+            [CreateDatasetRequest("fs", str(i)) for i in range(3)]
+        )
+    assert encoded[2] == {"fileSystemId": "fs", "path": "2"}
+
+
+def test_encodes_nested_values():
+    assert ConjureEncoder.do_encode(
+        [ListExample([]), MapExample({"a": "b"})]
+    ) == [{"value": []}, {"value": {"a": "b"}}]
+    assert ConjureEncoder.do_encode(
+        DatasetReference(dataset=Dataset("fs", "ri"))
+    ) == {"type": "dataset", "dataset": {"fileSystemId": "fs", "rid": "ri"}}
+
+
+def test_encoder_subclasses_get_their_own_plans():
+    class UpperCaseEncoder(ConjureEncoder):
+        @classmethod
+        def encode_primitive(cls, obj):
+            return obj.upper() if isinstance(obj, str) else obj
+
+    assert UpperCaseEncoder.do_encode(Dataset("fs", "ri")) == {
+        "fileSystemId": "FS",
+        "rid": "RI",
+    }
+    assert ConjureEncoder.do_encode(Dataset("fs", "ri")) == {
+        "fileSystemId": "fs",
+        "rid": "ri",
+    }
+
+
+class TaggingEncoder(ConjureEncoder):
+    @classmethod
+    def encode_conjure_bean_type(cls, obj):
+        encoded = super().encode_conjure_bean_type(obj)
+        encoded["bean"] = obj.__class__.__name__
+        return encoded
+
+    @classmethod
+    def encode_conjure_union_type(cls, obj):
+        encoded = super().encode_conjure_union_type(obj)
+        encoded["union"] = obj.__class__.__name__
+        return encoded
+
+
+def test_overridden_hooks_are_called():
+    obj = [DatasetReference(dataset=Dataset("fs", "ri"))]
+    expected = [
+        {
+            "type": "dataset",
+            "dataset": {"fileSystemId": "fs", "rid": "ri", "bean": "Dataset"},
+            "union": "DatasetReference",
+        }
+    ]
+    assert TaggingEncoder.do_encode(obj) == expected
+    assert json.loads(TaggingEncoder.write_to_buffer(obj)) == expected
+    assert ConjureEncoder.do_encode(obj) == [
+        {"type": "dataset", "dataset": {"fileSystemId": "fs", "rid": "ri"}}
+    ]
@@ -0,0 +1,77 @@
+# (c) Copyright 2026 Palantir Technologies Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+from unittest import mock
+from conjure_python_client import ConjureEncoder, EncodedCache
+from test.example_service.product.datasets import BackingFileSystem, Dataset
+
+
+@pytest.fixture
+def cache():
+    cache = EncodedCache(max_entries=2)
+    ConjureEncoder.cache_encoded(BackingFileSystem, cache)
+    yield cache
+    ConjureEncoder.cache_encoded(BackingFileSystem, None)
+
+
+def test_cached_encoding_is_spliced(cache):
+    bean = BackingFileSystem("fs", "uri", {"key": "value"})
+    expected = ConjureEncoder.write_to_buffer(bean)
+    assert len(cache) == 1
+
+    with mock.patch.object(
+        BackingFileSystem, "_fields", side_effect=AssertionError
+    ):
+        with mock.patch(
+            "conjure_python_client._serde.encoder._json_string",
+            side_effect=AssertionError,
+        ):
+            assert ConjureEncoder.write_to_buffer([bean]) == (
+                b"[" + expected + b"]"
+            )
+    assert cache.hits == 1
+
+
+def test_cache_is_keyed_by_identity(cache):
+    first = BackingFileSystem("fs", "uri", {})
+    second = BackingFileSystem("fs", "other", {})
+    assert ConjureEncoder.write_to_buffer(first) != (
+        ConjureEncoder.write_to_buffer(second)
+    )
+    assert cache.hits == 0
+
+
+def test_cache_evicts_least_recently_used(cache):
+    beans = [BackingFileSystem("fs", str(i), {}) for i in range(3)]
+    for bean in beans:
+        ConjureEncoder.write_to_buffer(bean)
+    assert len(cache) == 2
+    assert cache.get(beans[0]) is None
+    assert cache.get(beans[2]) is not None
+
+
+def test_cache_bounds_total_size():
+    cache = EncodedCache(max_bytes=10)
+    cache.put("a", b"12345678")
+    cache.put("b", b"1234")
+    assert cache.size == 4
+    cache.put("c", b"12345678901")
+    assert cache.get("c") is None
+    assert len(cache) == 1
+
+
+def test_other_beans_are_not_cached(cache):
+    ConjureEncoder.write_to_buffer(Dataset("fs", "rid"))
+    assert len(cache) == 0
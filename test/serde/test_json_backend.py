@@ -0,0 +1,68 @@
+# (c) Copyright 2026 Palantir Technologies Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import pytest
+from conjure_python_client import (
+    ConjureDecoder,
+    ConjureEncoder,
+    DictType,
+    ListType,
+    get_json_backend,
+    set_json_backend,
+)
+from conjure_python_client._serde.json_backend import (
+    StdlibJsonBackend,
+    resolve_json_backend,
+)
+from test.example_service.product.datasets import BackingFileSystem
+
+orjson = pytest.importorskip("orjson")
+
+VALUES = [
+    [float("nan"), float("inf"), -float("inf"), 1.5],
+    {1: "a", 2.5: "b", "c": [None, True]},
+    BackingFileSystem("fs", "s3://bucket", {"key": "é"}),
+]
+
+
+@pytest.mark.parametrize("value", VALUES)
+def test_backends_encode_identical_values(value):
+    stdlib = ConjureEncoder.write_to_bytes(value, "json")
+    fast = ConjureEncoder.write_to_bytes(value, "orjson")
+    assert json.loads(stdlib) == json.loads(fast)
+
+
+def test_backends_decode_identical_values():
+    value = '{"1": ["NaN", "Infinity", 2.0], "2": []}'
+    obj_type = DictType(int, ListType(float))
+    stdlib = ConjureDecoder("json").read_from_string(value, obj_type)
+    fast = ConjureDecoder("orjson").read_from_string(value, obj_type)
+    assert repr(stdlib) == repr(fast)
+
+
+def test_resolve_json_backend():
+    assert resolve_json_backend("orjson").name == "orjson"
+    assert resolve_json_backend("auto").name == "orjson"
+    with pytest.raises(ValueError):
+        resolve_json_backend("unknown")
+
+
+def test_set_json_backend():
+    try:
+        set_json_backend("orjson")
+        assert get_json_backend().name == "orjson"
+    finally:
+        set_json_backend(None)
+    assert isinstance(get_json_backend(), StdlibJsonBackend)
@@ -0,0 +1,131 @@
+# (c) Copyright 2026 Palantir Technologies Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import math
+import pytest
+from array import array
+from typing import Dict, List
+from conjure_python_client import (
+    ConjureBeanType,
+    ConjureDecoder,
+    ConjureEncoder,
+    ConjureFieldDefinition,
+    ListType,
+)
+
+
+class TimeSeries(ConjureBeanType):
+    @classmethod
+    def _fields(cls) -> Dict[str, ConjureFieldDefinition]:
+        return {
+            "name": ConjureFieldDefinition("name", str),
+            "timestamps": ConjureFieldDefinition("timestamps", ListType(int)),
+            "values": ConjureFieldDefinition("values", ListType(float)),
+        }
+
+    _name: str = None
+    _timestamps: List[int] = None
+    _values: List[float] = None
+
+    def __init__(
+        self, name: str, timestamps: List[int], values: List[float]
+    ) -> None:
+        self._name = name
+        self._timestamps = timestamps
+        self._values = values
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def timestamps(self) -> List[int]:
+        return self._timestamps
+
+    @property
+    def values(self) -> List[float]:
+        return self._values
+
+
+def test_numeric_lists_decode_to_arrays():
+    decoded = ConjureDecoder(numeric_arrays="array").read_from_string(
+        '{"name": "cpu", "timestamps": [1, 2], "values": [0.5, "NaN"]}',
+        TimeSeries,
+    )
+    assert decoded.name == "cpu"
+    assert decoded.timestamps == array("q", [1, 2])
+    assert decoded.values.typecode == "d"
+    assert decoded.values[0] == 0.5
+    assert math.isnan(decoded.values[1])
+
+
+def test_absent_numeric_lists_decode_to_empty_arrays():
+    decoded = ConjureDecoder(numeric_arrays="array").decode(
+        {"name": "cpu"}, TimeSeries
+    )
+    assert decoded.timestamps == array("q")
+    assert decoded.values == array("d")
+
+
+def test_other_lists_are_unchanged():
+    decoder = ConjureDecoder(numeric_arrays="array")
+    assert decoder.decode(["a"], ListType(str)) == ["a"]
+    assert decoder.decode([1.5], List[float]) == array("d", [1.5])
+    assert ConjureDecoder().decode([1.5], ListType(float)) == [1.5]
+
+
+@pytest.mark.parametrize(
+    "value,obj_type",
+    [([1, 1.5], ListType(int)), (["a"], ListType(float)), (1, ListType(int))],
+)
+def test_numeric_arrays_validate_elements(value, obj_type):
+    with pytest.raises(Exception):
+        ConjureDecoder(numeric_arrays="array").decode(value, obj_type)
+
+
+def test_unknown_numeric_array_kind_raises():
+    with pytest.raises(ValueError):
+        ConjureDecoder(numeric_arrays="tensor")
+
+
+def test_arrays_encode_to_conjure_json():
+    encoded = ConjureEncoder.do_encode(
+        TimeSeries(
+            "cpu",
+            array("q", [1, 2]),
+            array("d", [0.5, float("nan"), -float("inf")]),
+        )
+    )
+    assert encoded == {
+        "name": "cpu",
+        "timestamps": [1, 2],
+        "values": [0.5, "NaN", "-Infinity"],
+    }
+    assert json.dumps(array("d", [1.0]), cls=ConjureEncoder) == "[1.0]"
+
+
+def test_numpy_arrays_round_trip():
+    numpy = pytest.importorskip("numpy")
+    decoded = ConjureDecoder(numeric_arrays="numpy").decode(
+        {"name": "cpu", "timestamps": [1, 2], "values": [0.5, "Infinity"]},
+        TimeSeries,
+    )
+    assert decoded.timestamps.dtype == numpy.int64
+    assert decoded.values.dtype == numpy.float64
+    assert ConjureEncoder.do_encode(decoded) == {
+        "name": "cpu",
+        "timestamps": [1, 2],
+        "values": [0.5, "Infinity"],
+    }
@@ -0,0 +1,62 @@
+# (c) Copyright 2026 Palantir Technologies Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+from unittest import mock
+from conjure_python_client import ConjureDecoder, ConjureEncoder
+from conjure_python_client._lib.metadata import union_metadata
+from test.example_service.product.datasets import Dataset, DatasetReference
+
+
+def test_union_metadata_indexes_options():
+    metadata = union_metadata(DatasetReference)
+    assert metadata.accepts_type_of_union
+    assert metadata.option_by_identifier["dataset"][0] == "dataset"
+    assert metadata.attribute_by_identifier["path"] == "path"
+
+
+@pytest.mark.parametrize(
+    "json_value,expected",
+    [
+        ('{"type": "rid", "rid": "ri.1"}', DatasetReference(rid="ri.1")),
+        (
+            '{"type": "dataset", '
+            '"dataset": {"fileSystemId": "fs", "rid": "ri.2"}}',
+            DatasetReference(dataset=Dataset("fs", "ri.2")),
+        ),
+    ],
+)
+def test_union_decodes(json_value, expected):
+    decoded = ConjureDecoder().read_from_string(json_value, DatasetReference)
+    assert decoded == expected
+
+
+def test_union_decode_does_not_inspect_signature():
+    union_metadata(DatasetReference)
+    with mock.patch("inspect.signature", side_effect=AssertionError):
+        decoded = ConjureDecoder.decode_conjure_union_type(
+            {"type": "path", "path": "/a"}, DatasetReference
+        )
+    assert decoded == DatasetReference(path="/a")
+
+
+def test_union_encodes():
+    encoded = ConjureEncoder.do_encode(DatasetReference(path="/a"))
+    assert encoded == {"type": "path", "path": "/a"}
+
+
+def test_union_equality():
+    assert DatasetReference(rid="a") == DatasetReference(rid="a")
+    assert DatasetReference(rid="a") != DatasetReference(rid="b")
+    assert DatasetReference(rid="a") != DatasetReference(path="a")
@@ -0,0 +1,134 @@
+# (c) Copyright 2026 Palantir Technologies Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from collections import namedtuple
+from conjure_python_client import NodeSelector
+import asyncio
+import socket
+
+
+class FirstNodeSelector(NodeSelector):
+    """Sends requests to the first available node, so that tests know
+    which node a request goes to."""
+
+    def select(self):
+        return self.available_nodes()[0]
+
+
+Request = namedtuple("Request", ["method", "target", "headers", "body"])
+
+
+class LocalServer(object):
+    """An HTTP/1.1 server on asyncio streams, answering each request with
+    the status, headers and content returned by respond. Content given as a
+    list of pieces is written a piece at a time, pause seconds apart. The
+    server speaks https when given an ssl context."""
+
+    def __init__(self, respond, close_connections=False, pause=0, ssl=None):
+        self.respond = respond
+        self.close_connections = close_connections
+        self.pause = pause
+        self.ssl = ssl
+        self.requests = []
+        self.connections = 0
+        self._handlers = {}
+
+    async def __aenter__(self):
+        self._server = await asyncio.start_server(
+            self._handle, "127.0.0.1", 0, ssl=self.ssl
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def __aexit__(self, *exc_info):
+        # ends the handlers of kept alive connections
+        handlers = list(self._handlers.items())
+        for writer, handler in handlers:
+            writer.close()
+        await asyncio.gather(
+            *(handler for _, handler in handlers), return_exceptions=True
+        )
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        self._handlers[writer] = asyncio.current_task()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    return
+                method, target, _ = line.decode().split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line == b"\r\n":
+                        break
+                    name, _, value = line.decode().partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = b""
+                if headers.get("transfer-encoding") == "chunked":
+                    while True:
+                        size = int(await reader.readline(), 16)
+                        body += (await reader.readexactly(size + 2))[:-2]
+                        if not size:
+                            break
+                else:
+                    length = int(headers.get("content-length", 0))
+                    body = await reader.readexactly(length)
+                request = Request(method, target, headers, body)
+                self.requests.append(request)
+                status, response_headers, content = await self.respond(
+                    request
+                )
+                pieces = []
+                if isinstance(content, list):
+                    content, *pieces = content
+                    length = len(content) + sum(map(len, pieces))
+                else:
+                    length = len(content)
+                head = "HTTP/1.1 {} Reason\r\n".format(status)
+                if "Transfer-Encoding" in response_headers:
+                    chunks = [content[:3], content[3:], b""]
+                    content = b"".join(
+                        b"%x\r\n%s\r\n" % (len(chunk), chunk)
+                        for chunk in chunks
+                    )
+                else:
+                    head += "Content-Length: {}\r\n".format(length)
+                for name, value in response_headers.items():
+                    head += "{}: {}\r\n".format(name, value)
+                writer.write(head.encode() + b"\r\n" + content)
+                await writer.drain()
+                for piece in pieces:
+                    await asyncio.sleep(self.pause)
+                    writer.write(piece)
+                    await writer.drain()
+                if self.close_connections:
+                    return
+        finally:
+            self._handlers.pop(writer, None)
+            writer.close()
+
+
+async def ok(request):
+    return 200, {"Content-Type": "application/json"}, b'"bar"'
+
+
+def dead_port():
+    """Returns a local port which refuses connections."""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
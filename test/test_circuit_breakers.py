@@ -0,0 +1,205 @@
+# (c) Copyright 2026 Palantir Technologies Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from conjure_python_client import (
+    AsyncRequestsClient,
+    CircuitBreaker,
+    CircuitBreakerConfiguration,
+    Node,
+    NodeStats,
+    RequestsClient,
+    RoundRobinNodeSelector,
+    ServiceConfiguration,
+)
+from concurrent.futures import ThreadPoolExecutor
+from conjure_python_client._http.nodes import PROBE_CLAIM_SECONDS
+from threading import Barrier
+from unittest import mock
+import asyncio
+import time
+from test.example_service.product import AsyncSimpleService, SimpleService
+from test.support import FirstNodeSelector, LocalServer, dead_port, ok
+
+
+def _node(**kwargs):
+    configuration = CircuitBreakerConfiguration(**kwargs)
+    return Node("http://node", CircuitBreaker(configuration))
+
+
+def _finish(node, failed):
+    node.finished(node.started(), failed)
+
+
+def _later(seconds):
+    now = time.monotonic()
+    return mock.patch("time.monotonic", return_value=now + seconds)
+
+
+def _config(port, failures):
+    # the first uri refuses connections
+    return ServiceConfiguration(
+        uris=[
+            "http://127.0.0.1:{}/api".format(port)
+            for port in (dead_port(), port)
+        ],
+        backoff_slot_size=1,
+        node_selection=FirstNodeSelector,
+        circuit_breaker=CircuitBreakerConfiguration(failures=failures),
+    )
+
+
+def test_opens_after_consecutive_failures():
+    node = _node(failures=3)
+    for failed in [True, True, False, True, True]:
+        _finish(node, failed)
+    assert node.circuit_state == "closed"
+    assert node.available()
+    _finish(node, True)
+    assert node.circuit_state == "open"
+    assert not node.available()
+
+
+def test_opens_at_the_error_rate_of_a_full_window():
+    node = _node(failures=None, error_rate=0.5, window=10)
+    for _ in range(4):
+        _finish(node, True)
+        _finish(node, False)
+    _finish(node, True)
+    assert node.circuit_state == "closed"
+    _finish(node, False)
+    assert node.circuit_state == "open"
+
+
+def test_probes_close_the_breaker():
+    node = _node(failures=1, open_seconds=30, probes=2)
+    _finish(node, True)
+    with _later(29):
+        assert node.circuit_state == "open"
+    with _later(30):
+        assert node.circuit_state == "half_open"
+        # one probe at a time
+        started = node.started()
+        assert not node.available()
+        node.finished(started, False)
+        assert node.available()
+        _finish(node, False)
+        assert node.circuit_state == "closed"
+    assert node.stats() == NodeStats(
+        uri="http://node",
+        in_flight=0,
+        latency=node.latency,
+        requests=3,
+        failures=1,
+        circuit_state="closed",
+        circuit_opens=1,
+    )
+
+
+def test_failed_probes_open_the_breaker_again():
+    node = _node(failures=1, open_seconds=30)
+    _finish(node, True)
+    with _later(30):
+        _finish(node, True)
+        assert node.circuit_state == "open"
+    with _later(59):
+        assert node.circuit_state == "open"
+    with _later(60):
+        assert node.circuit_state == "half_open"
+    assert node.stats().circuit_opens == 2
+
+
+def test_a_single_probe_is_admitted_at_once():
+    node = _node(failures=1, open_seconds=30)
+    _finish(node, True)
+    threads = 8
+    barrier = Barrier(threads)
+
+    def check(_):
+        barrier.wait()
+        return node.available()
+
+    with _later(30), ThreadPoolExecutor(threads) as executor:
+        assert sorted(executor.map(check, range(threads))) == [False] * (
+            threads - 1
+        ) + [True]
+
+
+def test_unused_probes_are_admitted_again():
+    node = _node(failures=1, open_seconds=30)
+    _finish(node, True)
+    with _later(30):
+        assert node.available()
+        # admitted to a selector which chose another node
+        assert not node.available()
+    with _later(30 + PROBE_CLAIM_SECONDS):
+        assert node.available()
+        _finish(node, False)
+        assert node.circuit_state == "closed"
+
+
+def test_open_nodes_are_not_selected():
+    nodes = [_node(failures=1) for _ in range(3)]
+    selector = RoundRobinNodeSelector(nodes)
+    _finish(nodes[0], True)
+    assert {selector.select() for _ in range(10)} == set(nodes[1:])
+    assert selector.failover(nodes[1]) is nodes[2]
+    # requests are still attempted when every breaker is open
+    for node in nodes[1:]:
+        _finish(node, True)
+    assert {selector.select() for _ in range(10)} == set(nodes)
+
+
+def test_services_stop_sending_requests_to_open_nodes():
+    def call(service):
+        return [service.testEndpoint("foo") for _ in range(10)]
+
+    async def run():
+        async with LocalServer(ok) as server:
+            config = _config(server.port, failures=2)
+            service = RequestsClient.create(SimpleService, "pytest", config)
+            loop = asyncio.get_running_loop()
+            results = await loop.run_in_executor(None, call, service)
+            return results, RequestsClient.node_stats(service)
+
+    results, (dead, alive) = asyncio.run(run())
+    assert results == ["bar"] * 10
+    assert (dead.requests, dead.failures) == (2, 2)
+    assert (dead.circuit_state, dead.circuit_opens) == ("open", 1)
+    assert (alive.requests, alive.failures) == (10, 0)
+    assert alive.circuit_state == "closed"
+
+
+def test_async_services_stop_sending_requests_to_open_nodes():
+    async def run():
+        async with LocalServer(ok) as server:
+            config = _config(server.port, failures=1)
+            service = AsyncRequestsClient.create(
+                AsyncSimpleService, "pytest", config
+            )
+            for _ in range(5):
+                assert await service.testEndpoint("foo") == "bar"
+            return AsyncRequestsClient.node_stats(service)
+
+    dead, alive = asyncio.run(run())
+    assert (dead.requests, dead.circuit_state) == (1, "open")
+    assert alive.requests == 5
+
+
+def test_nodes_without_breakers_are_always_available():
+    node = Node("http://node")
+    for _ in range(10):
+        _finish(node, True)
+    assert node.available()
+    assert node.circuit_state == "closed"
+    assert node.stats().circuit_opens == 0
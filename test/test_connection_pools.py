@@ -0,0 +1,171 @@
+# (c) Copyright 2026 Palantir Technologies Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from concurrent.futures import ThreadPoolExecutor
+from conjure_python_client import (
+    AsyncRequestsClient,
+    RequestsClient,
+    ServiceConfiguration,
+)
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from requests.packages.urllib3.exceptions import EmptyPoolError
+from threading import Thread
+import asyncio
+import pytest
+import time
+from test.example_service.product import AsyncSimpleService, SimpleService
+from test.support import LocalServer
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        time.sleep(0.02)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", "5")
+        self.end_headers()
+        self.wfile.write(b'"bar"')
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture()
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowHandler)
+    server.daemon_threads = True
+    Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _config(port, **kwargs):
+    return ServiceConfiguration(
+        uris=["http://127.0.0.1:{}/simple/api".format(port)], **kwargs
+    )
+
+
+def _call_concurrently(service, count):
+    with ThreadPoolExecutor(count) as executor:
+        return list(executor.map(service.testEndpoint, ["foo"] * count))
+
+
+def test_pool_configuration_is_honoured():
+    config = _config(
+        80, pool_connections=2, pool_maxsize=3, pool_block=True
+    )
+    service = RequestsClient.create(SimpleService, "pytest", config)
+    adapter = service._requests_session.get_adapter(config.uris[0])
+    assert adapter.poolmanager.connection_pool_kw["maxsize"] == 3
+    assert adapter.poolmanager.connection_pool_kw["block"]
+    assert adapter.poolmanager.pools._maxsize == 2
+
+    default = RequestsClient.create(SimpleService, "pytest", _config(80))
+    adapter = default._requests_session.get_adapter(config.uris[0])
+    assert adapter.poolmanager.connection_pool_kw["maxsize"] == 10
+    assert not adapter.poolmanager.connection_pool_kw["block"]
+
+
+def test_pools_which_do_not_block_discard_connections(server):
+    config = _config(server.server_port, pool_maxsize=2)
+    service = RequestsClient.create(SimpleService, "pytest", config)
+    assert _call_concurrently(service, 8) == ["bar"] * 8
+
+    (stats,) = RequestsClient.pool_stats(service)
+    assert stats.host == "http://127.0.0.1:{}".format(server.server_port)
+    assert stats.maxsize == 2
+    assert stats.requests == 8
+    assert stats.in_use == 0
+    assert stats.max_in_use > 2
+    assert stats.connections_created > 2
+    assert stats.discarded == stats.connections_created - 2
+    assert stats.idle == 2
+    assert stats.waits == 0
+
+
+def test_blocking_pools_reuse_connections(server):
+    config = _config(server.server_port, pool_maxsize=2, pool_block=True)
+    service = RequestsClient.create(SimpleService, "pytest", config)
+    assert _call_concurrently(service, 8) == ["bar"] * 8
+
+    (stats,) = RequestsClient.pool_stats(service)
+    assert stats.connections_created <= 2
+    assert stats.max_in_use == 2
+    assert stats.discarded == 0
+    assert stats.waits > 0
+    assert stats.wait_time > 0
+
+
+def test_pool_timeout(server):
+    config = _config(
+        server.server_port, pool_maxsize=1, pool_block=True, pool_timeout=0.001
+    )
+    service = RequestsClient.create(SimpleService, "pytest", config)
+    with pytest.raises(EmptyPoolError):
+        _call_concurrently(service, 4)
+    (stats,) = RequestsClient.pool_stats(service)
+    assert stats.timeouts > 0
+
+
+async def _slow(request):
+    await asyncio.sleep(0.01)
+    return 200, {"Content-Type": "application/json"}, b'"bar"'
+
+
+def _async_calls(count, **kwargs):
+    async def run():
+        async with LocalServer(_slow) as server:
+            service = AsyncRequestsClient.create(
+                AsyncSimpleService, "pytest", _config(server.port, **kwargs)
+            )
+            results = await asyncio.gather(
+                *(service.testEndpoint("foo") for _ in range(count)),
+                return_exceptions=True,
+            )
+            return results, AsyncRequestsClient.pool_stats(service)
+
+    return asyncio.run(run())
+
+
+def test_async_pools_block_by_default():
+    results, (stats,) = _async_calls(100, pool_maxsize=4)
+    assert results == ["bar"] * 100
+    assert stats.maxsize == 4
+    assert stats.requests == 100
+    assert stats.connections_created == 4
+    assert stats.idle == 4
+    assert stats.in_use == 0
+    assert stats.max_in_use == 4
+    assert stats.waits == 96
+    assert stats.discarded == 0
+
+
+def test_async_pools_which_do_not_block():
+    results, (stats,) = _async_calls(10, pool_maxsize=2, pool_block=False)
+    assert results == ["bar"] * 10
+    assert stats.connections_created == 10
+    assert stats.discarded == 8
+    assert stats.idle == 2
+    assert stats.waits == 0
+
+
+def test_async_pool_timeout():
+    results, (stats,) = _async_calls(3, pool_maxsize=1, pool_timeout=0.001)
+    assert results[0] == "bar"
+    assert all(isinstance(result, EmptyPoolError) for result in results[1:])
+    assert stats.timeouts == 2
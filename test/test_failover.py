@@ -0,0 +1,237 @@
+# (c) Copyright 2026 Palantir Technologies Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from conjure_python_client import (
+    AsyncRequestsClient,
+    RequestsClient,
+    ServiceConfiguration,
+)
+from conjure_python_client._http.nodes import FAILURE_LATENCY_SECONDS
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from requests.packages.urllib3.exceptions import (
+    MaxRetryError,
+    NewConnectionError,
+    ProxyError,
+    ReadTimeoutError,
+    SSLError,
+)
+from threading import Thread
+from unittest import mock
+import asyncio
+import pytest
+import requests
+from test.example_service.product import AsyncSimpleService, SimpleService
+from test.support import FirstNodeSelector, LocalServer, dead_port, ok
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.paths.append(self.path)
+        status, headers = self.server.status, self.server.headers
+        if self.server.statuses:
+            status = self.server.statuses.pop(0)
+        content = b'"bar"' if status == 200 else b"{}"
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture()
+def servers():
+    started = []
+
+    def start(status, headers=None):
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        server.daemon_threads = True
+        server.status, server.headers, server.paths = status, headers or {}, []
+        server.statuses = []
+        Thread(target=server.serve_forever, args=(0.01,), daemon=True).start()
+        started.append(server)
+        return server
+
+    yield start
+    for server in started:
+        server.shutdown()
+        server.server_close()
+
+
+def _config(*ports, **kwargs):
+    return ServiceConfiguration(
+        uris=["http://127.0.0.1:{}/api".format(port) for port in ports],
+        backoff_slot_size=1,
+        node_selection=FirstNodeSelector,
+        **kwargs
+    )
+
+
+def test_connect_errors_fail_over(servers):
+    live = servers(200)
+    config = _config(dead_port(), live.server_port)
+    service = RequestsClient.create(SimpleService, "pytest", config)
+    assert service.testEndpoint("foo") == "bar"
+    assert live.paths == ["/api/catalog/testEndpoint"]
+    dead, _ = service._node_selector.nodes
+    assert dead.latency >= FAILURE_LATENCY_SECONDS
+
+
+def test_tls_handshake_errors_fail_over(servers):
+    live, plain = servers(200), servers(200)
+    config = ServiceConfiguration(
+        uris=[
+            "https://127.0.0.1:{}/api".format(plain.server_port),
+            "http://127.0.0.1:{}/api".format(live.server_port),
+        ],
+        backoff_slot_size=1,
+        node_selection=FirstNodeSelector,
+    )
+    service = RequestsClient.create(SimpleService, "pytest", config)
+    assert service.testEndpoint("foo") == "bar"
+    assert plain.paths == []
+    assert live.paths == ["/api/catalog/testEndpoint"]
+
+
+@pytest.mark.parametrize(
+    "reason",
+    [
+        NewConnectionError(None, "refused"),
+        SSLError("handshake failed"),
+        ProxyError("Unable to connect to proxy", OSError()),
+    ],
+)
+@mock.patch("requests.Session.request")
+def test_errors_before_sending_are_retried(mock_request, reason):
+    mock_request.side_effect = requests.exceptions.ConnectionError(
+        MaxRetryError(None, "/api/catalog/testEndpoint", reason)
+    )
+    config = _config(80, 81)
+    service = RequestsClient.create(SimpleService, "pytest", config)
+    with mock.patch("time.sleep"), pytest.raises(
+        requests.exceptions.ConnectionError
+    ):
+        service.testEndpoint("foo")
+    assert mock_request.call_count == 5
+
+
+@pytest.mark.parametrize("status", [308, 429, 503])
+def test_retryable_statuses_fail_over(servers, status):
+    live = servers(200)
+    # 308 responses are retried rather than followed
+    failing = servers(status, {"Location": "/elsewhere"})
+    config = _config(failing.server_port, live.server_port)
+    service = RequestsClient.create(SimpleService, "pytest", config)
+    assert service.testEndpoint("foo") == "bar"
+    assert failing.paths == ["/api/catalog/testEndpoint"]
+    assert live.paths == ["/api/catalog/testEndpoint"]
+
+
+def test_retries_are_shared_by_nodes(servers):
+    first, second = servers(503), servers(503)
+    config = _config(first.server_port, second.server_port)
+    service = RequestsClient.create(SimpleService, "pytest", config)
+    with pytest.raises(requests.exceptions.RetryError):
+        service.testEndpoint("foo")
+    assert (len(first.paths), len(second.paths)) == (3, 2)
+
+    config = _config(first.server_port, max_num_retries=0)
+    service = RequestsClient.create(SimpleService, "pytest", config)
+    with pytest.raises(requests.exceptions.RetryError):
+        service.testEndpoint("foo")
+    assert len(first.paths) == 4
+
+
+def test_retry_after_is_respected(servers):
+    live = servers(200)
+    failing = servers(503, {"Retry-After": "3"})
+    config = _config(failing.server_port, live.server_port)
+    service = RequestsClient.create(SimpleService, "pytest", config)
+    with mock.patch("time.sleep") as sleep:
+        assert service.testEndpoint("foo") == "bar"
+    sleep.assert_called_once_with(3)
+
+
+def test_streamed_responses_are_released_when_retried(servers):
+    server = servers(200)
+    server.statuses = [503]
+    config = _config(
+        server.server_port, pool_maxsize=1, pool_block=True, pool_timeout=1
+    )
+    service = RequestsClient.create(SimpleService, "pytest", config)
+    response = service._request(
+        "POST", service._uri + "/catalog/testEndpoint", json="foo", stream=True
+    )
+    assert response.status_code == 200
+    assert response.json() == "bar"
+    assert len(server.paths) == 2
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        requests.exceptions.ReadTimeout(),
+        requests.exceptions.ConnectionError(ConnectionResetError()),
+        requests.exceptions.ReadTimeout(
+            MaxRetryError(None, "/", ReadTimeoutError(None, "/", "timed out"))
+        ),
+    ],
+)
+@mock.patch("requests.Session.request")
+def test_read_errors_are_not_retried(mock_request, error):
+    mock_request.side_effect = error
+    config = _config(80, 81)
+    service = RequestsClient.create(SimpleService, "pytest", config)
+    with pytest.raises(type(error)):
+        service.testEndpoint("foo")
+    assert mock_request.call_count == 1
+
+
+def test_async_connect_errors_fail_over():
+    async def run():
+        async with LocalServer(ok) as server:
+            config = _config(dead_port(), server.port)
+            service = AsyncRequestsClient.create(
+                AsyncSimpleService, "pytest", config
+            )
+            return await service.testEndpoint("foo"), server.requests
+
+    result, (request,) = asyncio.run(run())
+    assert result == "bar"
+    assert request.target == "/api/catalog/testEndpoint"
+
+
+def test_async_retryable_statuses_fail_over():
+    async def unavailable(request):
+        return 503, {}, b""
+
+    async def run():
+        async with LocalServer(unavailable) as failing, LocalServer(
+            ok
+        ) as live:
+            config = _config(failing.port, live.port)
+            service = AsyncRequestsClient.create(
+                AsyncSimpleService, "pytest", config
+            )
+            result = await service.testEndpoint("foo")
+            return result, len(failing.requests), len(live.requests)
+
+    assert asyncio.run(run()) == ("bar", 1, 1)
@@ -13,7 +13,9 @@
 # limitations under the License.
 
 from conjure_python_client import (
+    ConjureEncoder,
     ConjureHTTPError,
+    EncodedCache,
     RequestsClient,
     ServiceConfiguration,
 )
@@ -21,7 +23,7 @@ from unittest import mock
 import pytest
 import requests
 from requests.exceptions import HTTPError
-from test.example_service.product import SimpleService
+from test.example_service.product import CreateDatasetRequest, SimpleService
 
 
 class TestHttpRemoting(object):
@@ -164,3 +166,114 @@ class TestHttpRemoting(object):
         second_trace = second_call[2]["headers"]["X-B3-TraceId"]
 
         assert first_trace != second_trace
+
+    @mock.patch("requests.Session.request")
+    def test_json_backend(self, mock_request):
+        pytest.importorskip("orjson")
+        config = ServiceConfiguration()
+        config.uris = ["https://dummy/simple/api"]
+        service = RequestsClient.create(
+            SimpleService,
+            user_agent="pytest",
+            service_config=config,
+            json_backend="orjson",
+        )
+        mock_request.return_value = self._mock_response(content=b'"bar"')
+
+        assert service.testEndpoint("foo") == "bar"
+
+        name, args, kwargs = mock_request.mock_calls[0]
+        assert "json" not in kwargs
+        assert kwargs["data"] == b'"foo"'
+        assert kwargs["headers"]["Content-Type"] == "application/json"
+
+    @mock.patch("requests.Session.request")
+    def test_conjure_body_is_written_to_bytes(self, mock_request):
+        mock_request.return_value = self._mock_response()
+        service = self._test_service()
+        service._request(
+            "POST",
+            service._uri + "/catalog/datasets",
+            json=[CreateDatasetRequest("fs", "path")],
+        )
+
+        name, args, kwargs = mock_request.mock_calls[0]
+        assert "json" not in kwargs
+        expected = b'[{"fileSystemId": "fs", "path": "path"}]'
+        assert kwargs["data"] == expected
+        assert kwargs["headers"]["Content-Length"] == str(len(expected))
+        assert kwargs["headers"]["Content-Type"] == "application/json"
+
+    @pytest.mark.parametrize(
+        "body,expected",
+        [
+            (
+                [{"path": "a"}, CreateDatasetRequest("fs", "b")],
+                b'[{"path": "a"}, {"fileSystemId": "fs", "path": "b"}]',
+            ),
+            (
+                {"a": [1], "b": [CreateDatasetRequest("fs", "c")]},
+                b'{"a": [1], "b": [{"fileSystemId": "fs", "path": "c"}]}',
+            ),
+        ],
+    )
+    @mock.patch("requests.Session.request")
+    def test_nested_conjure_values_are_written_to_bytes(
+        self, mock_request, body, expected
+    ):
+        mock_request.return_value = self._mock_response()
+        service = self._test_service()
+        service._request(
+            "POST", service._uri + "/catalog/datasets", json=body
+        )
+
+        name, args, kwargs = mock_request.mock_calls[0]
+        assert "json" not in kwargs
+        assert kwargs["data"] == expected
+
+    @mock.patch("requests.Session.request")
+    def test_conjure_bodies_use_cached_encodings(self, mock_request):
+        mock_request.return_value = self._mock_response()
+        service = self._test_service()
+        cache = EncodedCache()
+        ConjureEncoder.cache_encoded(CreateDatasetRequest, cache)
+        try:
+            body = CreateDatasetRequest("fs", "path")
+            for _ in range(2):
+                service._request(
+                    "POST", service._uri + "/catalog/datasets", json=[body]
+                )
+        finally:
+            ConjureEncoder.cache_encoded(CreateDatasetRequest, None)
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    @mock.patch("requests.Session.request")
+    def test_json_trees_are_passed_on(self, mock_request):
+        mock_request.return_value = self._mock_response()
+        service = self._test_service()
+        body = [{"fileSystemId": "fs", "path": "path"}]
+        service._request(
+            "POST", service._uri + "/catalog/datasets", json=body
+        )
+
+        name, args, kwargs = mock_request.mock_calls[0]
+        assert kwargs["json"] is body
+
+    @mock.patch("requests.Session.request")
+    def test_iterator_body_is_streamed(self, mock_request):
+        mock_request.return_value = self._mock_response()
+        service = self._test_service()
+        service._request(
+            "POST",
+            service._uri + "/catalog/datasets",
+            json=(CreateDatasetRequest("fs", str(i)) for i in range(2)),
+        )
+
+        name, args, kwargs = mock_request.mock_calls[0]
+        assert "Content-Length" not in kwargs["headers"]
+        assert b"".join(kwargs["data"]) == (
+            b'[{"fileSystemId": "fs", "path": "0"}, '
+            b'{"fileSystemId": "fs", "path": "1"}]'
+        )
+        with pytest.raises(ValueError):
+            iter(kwargs["data"])
@@ -0,0 +1,187 @@
+# (c) Copyright 2026 Palantir Technologies Inc. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from conjure_python_client import (
+    AsyncRequestsClient,
+    EwmaNodeSelector,
+    Node,
+    PowerOfTwoChoicesNodeSelector,
+    RandomNodeSelector,
+    RequestsClient,
+    RoundRobinNodeSelector,
+    ServiceConfiguration,
+)
+from conjure_python_client._http.nodes import (
+    FAILURE_LATENCY_SECONDS,
+    resolve_node_selector,
+)
+from unittest import mock
+import asyncio
+import pytest
+import requests
+import time
+from test.example_service.product import AsyncSimpleService, SimpleService
+from test.support import FirstNodeSelector, LocalServer
+
+URIS = ["http://one/api", "http://two/api", "http://three/api"]
+
+
+def _finish(node, latency, failed=False):
+    node.finished(node.started() - latency, failed)
+
+
+@pytest.mark.parametrize(
+    "strategy,selector_class",
+    [
+        ("random", RandomNodeSelector),
+        ("round_robin", RoundRobinNodeSelector),
+        ("power_of_two_choices", PowerOfTwoChoicesNodeSelector),
+        ("ewma", EwmaNodeSelector),
+        (FirstNodeSelector, FirstNodeSelector),
+    ],
+)
+def test_strategies_are_resolved(strategy, selector_class):
+    selector = resolve_node_selector(strategy, URIS)
+    assert type(selector) is selector_class
+    assert [node.uri for node in selector.nodes] == URIS
+
+
+def test_unknown_strategies_fail():
+    with pytest.raises(ValueError):
+        resolve_node_selector("fastest", URIS)
+
+
+def test_round_robin_is_even_across_threads():
+    selector = RoundRobinNodeSelector([Node(uri) for uri in URIS])
+    with ThreadPoolExecutor(8) as executor:
+        nodes = list(executor.map(lambda _: selector.select(), range(300)))
+    assert Counter(node.uri for node in nodes) == {uri: 100 for uri in URIS}
+
+
+def test_power_of_two_choices_avoids_busy_nodes():
+    busy, idle = Node("http://busy"), Node("http://idle")
+    busy.started()
+    selector = PowerOfTwoChoicesNodeSelector([busy, idle])
+    assert {selector.select() for _ in range(20)} == {idle}
+
+
+def test_ewma_prefers_fast_nodes():
+    slow, fast, new = Node("http://slow"), Node("http://fast"), Node("new")
+    selector = EwmaNodeSelector([slow, fast, new])
+    _finish(slow, 0.5)
+    _finish(fast, 0.01)
+    assert selector.select() is new
+    _finish(new, 0.1)
+    assert slow.latency >= 0.5
+    assert {selector.select() for _ in range(20)} == {fast}
+    # requests in flight add to the expected wait
+    for _ in range(20):
+        fast.started()
+    assert selector.select() is new
+
+
+def test_latency_follows_peaks_and_decays():
+    node = Node("http://node")
+    _finish(node, 0.01)
+    _finish(node, 1.0)
+    assert node.latency >= 1.0
+    with mock.patch("time.monotonic", return_value=time.monotonic() + 10):
+        _finish(node, 0.0)
+    assert 0.3 < node.latency < 0.5
+    _finish(node, 0.0, failed=True)
+    assert node.latency >= FAILURE_LATENCY_SECONDS
+
+
+def _response(status, content=b'"bar"'):
+    response = requests.Response()
+    response.status_code = status
+    response._content = content
+    return response
+
+
+@mock.patch("requests.Session.request")
+def test_services_use_the_configured_strategy(mock_request):
+    config = ServiceConfiguration(uris=URIS, node_selection="round_robin")
+    service = RequestsClient.create(SimpleService, "pytest", config)
+    nodes = service._node_selector.nodes
+
+    def request(method, url, **kwargs):
+        assert [node.in_flight for node in nodes].count(1) == 1
+        return _response(200)
+
+    mock_request.side_effect = request
+    for _ in range(6):
+        assert service.testEndpoint("foo") == "bar"
+    urls = [call[1][1] for call in mock_request.mock_calls]
+    assert Counter(url.rsplit("/api", 1)[0] for url in urls) == {
+        "http://one": 2,
+        "http://two": 2,
+        "http://three": 2,
+    }
+    assert urls[0] != urls[1]
+    assert all(node.in_flight == 0 for node in nodes)
+
+
+@mock.patch("requests.Session.request")
+def test_failures_are_recorded_against_nodes(mock_request):
+    config = ServiceConfiguration(uris=URIS[:1])
+    service = RequestsClient.create(SimpleService, "pytest", config)
+    (node,) = service._node_selector.nodes
+
+    mock_request.return_value = _response(404, b"{}")
+    with pytest.raises(requests.HTTPError):
+        service.testEndpoint("foo")
+    assert node.latency < FAILURE_LATENCY_SECONDS
+
+    mock_request.return_value = _response(500, b"{}")
+    with pytest.raises(requests.HTTPError):
+        service.testEndpoint("foo")
+    assert node.latency >= FAILURE_LATENCY_SECONDS
+    assert node.in_flight == 0
+
+    mock_request.side_effect = requests.ConnectionError()
+    with pytest.raises(requests.ConnectionError):
+        service.testEndpoint("foo")
+    assert node.in_flight == 0
+
+
+def test_async_ewma_routes_around_slow_nodes():
+    async def slow(request):
+        await asyncio.sleep(0.05)
+        return 200, {}, b'"bar"'
+
+    async def fast(request):
+        return 200, {}, b'"bar"'
+
+    async def run():
+        async with LocalServer(slow) as slow_server, LocalServer(
+            fast
+        ) as fast_server:
+            config = ServiceConfiguration(
+                uris=[
+                    "http://127.0.0.1:{}/api".format(server.port)
+                    for server in (slow_server, fast_server)
+                ],
+                node_selection="ewma",
+            )
+            service = AsyncRequestsClient.create(
+                AsyncSimpleService, "pytest", config
+            )
+            for _ in range(20):
+                assert await service.testEndpoint("foo") == "bar"
+            return len(slow_server.requests), len(fast_server.requests)
+
+    assert asyncio.run(run()) == (1, 19)